@@ -0,0 +1,75 @@
+"""
+Codec Benchmark
+Compares encode time and frame size of the available WebSocket codecs
+for a realistic superposition_anomaly message
+
+Run from the backend directory:
+    python -m benchmarks.codec_benchmark
+"""
+
+import time
+from datetime import datetime
+
+from services.optimization_model import find_optimal_solution
+from websockets.codecs import CODECS
+
+def build_anomaly_message() -> dict:
+    """Build a superposition_anomaly message shaped like a real broadcast"""
+    return {
+        "type": "superposition_anomaly",
+        "payload": {
+            "cpu_usage": 92.41837, "memory_usage": 71.80234, "disk_usage": 55.12093,
+            "network_io": 1040.2231, "database_connections": 84.01782, "cache_hit_rate": 63.53321,
+            "active_users": 10450.873, "api_latency_p99": 870.3312, "error_rate": 5.6123,
+            "request_rate": 1120.9127
+        },
+        "superposition_state": {
+            "probabilities": {
+                "database_load": 0.412, "network_issue": 0.118, "inefficient_query": 0.094,
+                "resource_exhaustion": 0.118, "high_traffic": 0.118, "application_bug": 0.071,
+                "connection_pool_exhaustion": 0.035, "ddos_attack": 0.024
+            },
+            "confidence": 0.214,
+            "recommendations": [
+                "🔍 Investigate slow queries and database performance",
+                "📈 Consider scaling resources or implementing rate limiting"
+            ],
+            "primaryAnomaly": "cpu_usage",
+            "anomalyLevel": "critical",
+            "entangledMetrics": ["active_users", "api_latency_p99", "request_rate", "cpu_usage",
+                                 "memory_usage", "database_connections"],
+            "confirmed_root_cause": "database_load",
+            "confirmed_details": "High query execution time detected. Multiple slow queries identified.",
+            "confirmed_severity": "high",
+            "all_confirmed_causes": [
+                {"cause": "database_load", "details": "High query execution time detected.",
+                 "severity": "high", "duration": 1.4231},
+                {"cause": "high_traffic", "details": "Traffic spike detected.",
+                 "severity": "medium", "duration": 0.8817}
+            ],
+            "investigation_confidence": 0.6,
+            "total_investigation_time": 1.9312,
+            "investigation_timestamp": datetime.now().isoformat(),
+            "optimal_solution": find_optimal_solution("database_load")
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+
+def main(iterations: int = 20000):
+    message = build_anomaly_message()
+    print(f"{'codec':>8} {'frame bytes':>12} {'encode us':>10}")
+    for name, codec in CODECS.items():
+        frame = codec.encode(message)
+        size = len(frame.encode("utf-8")) if isinstance(frame, str) else len(frame)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            codec.encode(message)
+        elapsed_us = (time.perf_counter() - start) / iterations * 1e6
+
+        print(f"{name:>8} {size:>12} {elapsed_us:>10.2f}")
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+    main()
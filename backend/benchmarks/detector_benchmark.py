@@ -0,0 +1,45 @@
+"""
+Streaming Detector Benchmark
+Measures the per-sample update cost of each online anomaly detector
+
+Run from the backend directory:
+    python -m benchmarks.detector_benchmark --samples 200000
+"""
+
+import argparse
+import random
+import time
+
+from services.anomaly_detectors import create_detector
+
+# Detector configurations to measure
+SPECS = [
+    {"type": "ewma", "alpha": 0.1},
+    {"type": "zscore", "window": 60},
+    {"type": "zscore", "window": 720},
+    {"type": "mad", "window": 60},
+    {"type": "mad", "window": 720},
+    {"type": "holt_winters", "season_length": 720}
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming detector benchmark")
+    parser.add_argument("--samples", type=int, default=200_000)
+    args = parser.parse_args()
+
+    random.seed(7)
+    samples = [random.gauss(50.0, 5.0) for _ in range(args.samples)]
+
+    print(f"{'detector':<40}{'ns/sample':>12}{'samples/sec':>16}")
+    for spec in SPECS:
+        detector = create_detector(spec)
+        update = detector.update
+        start = time.perf_counter()
+        for value in samples:
+            update(value)
+        elapsed = time.perf_counter() - start
+        label = ", ".join(f"{key}={value}" for key, value in spec.items())
+        print(f"{label:<40}{elapsed / args.samples * 1e9:>12.0f}{args.samples / elapsed:>16,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Entanglement Discovery Benchmark
+Measures discovery run time and recall of planted lagged edges as the metric count grows
+
+Run from the backend directory:
+    python -m benchmarks.discovery_benchmark --metrics 100 300 1000
+"""
+
+import argparse
+
+import numpy as np
+
+from services.entanglement_discovery import EntanglementDiscovery
+
+def build_series(metrics: int, samples: int, planted: int, rng: np.random.Generator):
+    """AR(1) noise series plus `planted` cause -> effect pairs with known lags"""
+    timestamps = np.arange(samples) * 5.0
+    noise = rng.standard_normal((metrics, samples))
+    for t in range(1, samples):
+        noise[:, t] += 0.8 * noise[:, t - 1]
+
+    series = {f"metric_{i}": (timestamps, noise[i]) for i in range(metrics)}
+    truth = set()
+    for pair in range(planted):
+        cause = noise[pair]
+        lag = 1 + pair % 6
+        effect = np.concatenate([np.zeros(lag), cause[:-lag]]) + 0.3 * rng.standard_normal(samples)
+        series[f"effect_{pair}"] = (timestamps, effect)
+        truth.add((f"metric_{pair}", f"effect_{pair}"))
+    return series, truth
+
+def main():
+    parser = argparse.ArgumentParser(description="Entanglement discovery benchmark")
+    parser.add_argument("--metrics", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--samples", type=int, default=720)
+    parser.add_argument("--planted", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    print(f"{'metrics':>8}{'pairs':>10}{'candidates':>12}{'edges':>8}{'recall':>8}{'ms':>10}")
+    for metrics in args.metrics:
+        series, truth = build_series(metrics, args.samples, args.planted, rng)
+        discovery = EntanglementDiscovery(window=args.samples)
+        summary = discovery.discover(series)
+        found = {(edge.source, edge.target) for edge in discovery.graph.edges}
+        recall = len(truth & found) / len(truth)
+        print(f"{summary['metrics']:>8}{summary['all_pairs']:>10}{summary['candidate_pairs']:>12}"
+              f"{summary['edges_published']:>8}{recall:>8.2f}{summary['duration_ms']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
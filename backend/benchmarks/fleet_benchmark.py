@@ -0,0 +1,53 @@
+"""
+Fleet Analysis Benchmark
+Measures per-tick analysis time for many labelled entities
+
+Run from the backend directory:
+    python -m benchmarks.fleet_benchmark --entities 1000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from services.analysis_config import analysis_config
+from services.fleet_analyzer import analyze_fleet_from_store
+from services.metric_sources import RandomMetricSource
+from services.metric_store import MetricStore, make_entity_id
+
+def populate(store: MetricStore, entities: int) -> None:
+    """Record one random snapshot for each of the given number of labelled entities"""
+    source = RandomMetricSource()
+    metrics = analysis_config.snapshot.threshold_engine.metrics
+    now = time.time()
+    for host in range(entities):
+        labels = {"region": f"region-{host % 4}", "service": f"svc-{host % 25}", "host": f"host-{host}"}
+        entity = make_entity_id(labels)
+        store.set_entity_labels(entity, labels)
+        snapshot = source.generate()
+        for metric in metrics:
+            store.append(metric, snapshot[metric], timestamp=now, entity=entity)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet analysis benchmark")
+    parser.add_argument("--entities", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(7)
+    store = MetricStore(capacity=16)
+    populate(store, args.entities)
+
+    durations = []
+    for _ in range(args.ticks):
+        start = time.perf_counter()
+        result = analyze_fleet_from_store(store)
+        durations.append((time.perf_counter() - start) * 1000)
+
+    print(f"{args.entities} entities x {len(analysis_config.snapshot.threshold_engine.metrics)} metrics, "
+          f"{result['anomalous_count']} anomalous")
+    print(f"Tick: median {statistics.median(durations):.1f} ms, max {max(durations):.1f} ms (target: 50 ms)")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ Quantum Brain - FastAPI Backend
 Main application entry point for the Axon + Quantum-Brain project
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -11,7 +12,10 @@ import os
 from dotenv import load_dotenv
 
 # Import routers
-from routers import monitoring, remediation, quantum_api
+from routers import monitoring, remediation, quantum_api, ingest, config
+from services.analysis_config import analysis_config
+from services.check_runtime import check_executor
+from services.cognition_agents import CAUSE_CHECK_MAPPING
 
 # Load environment variables
 load_dotenv()
@@ -21,13 +25,33 @@ API_KEY = os.getenv("BACKEND_API_KEY", "default-dev-key")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 DEBUG_MODE = os.getenv("DEBUG_MODE", "true").lower() == "true"
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan - starts and stops app-wide background tasks
+    """
+    analysis_config.start_watching(float(os.getenv("CONFIG_WATCH_INTERVAL", "5")))
+    monitoring.broadcast_scheduler.start()
+    if monitoring.discovery_scheduler.interval > 0:
+        monitoring.discovery_scheduler.start()
+    if monitoring.outcome_log is not None and monitoring.retrain_scheduler.interval > 0:
+        monitoring.retrain_scheduler.start()
+    await check_executor.start(spec.mode for spec in CAUSE_CHECK_MAPPING.values())
+    yield
+    await monitoring.retrain_scheduler.stop()
+    await monitoring.discovery_scheduler.stop()
+    await monitoring.broadcast_scheduler.stop()
+    await analysis_config.stop_watching()
+    check_executor.shutdown()
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Quantum Brain API",
     description="Backend API for Axon + Quantum-Brain AI Project",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS middleware
@@ -48,6 +72,8 @@ app.add_middleware(
 app.include_router(monitoring.router)
 app.include_router(remediation.router)
 app.include_router(quantum_api.router)
+app.include_router(ingest.router)
+app.include_router(config.router)
 
 # Health check endpoint
 @app.get("/")
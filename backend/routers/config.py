@@ -0,0 +1,71 @@
+"""
+Analysis Configuration Router
+Inspect, reload and replace the thresholds, entanglement map and solution blueprints
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException
+
+from services.analysis_config import ConfigError, analysis_config
+
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(prefix="/config", tags=["config"])
+
+@router.get("")
+async def get_config(document: bool = False):
+    """
+    Get the active configuration version
+    
+    Args:
+        document: Include the full configuration document
+        
+    Returns:
+        Version, source and size of the active configuration
+    """
+    return analysis_config.snapshot.to_dict(include_document=document)
+
+@router.post("/reload")
+async def reload_config():
+    """
+    Reload the configuration file (QUANTUM_CONFIG_PATH) now
+    
+    Returns:
+        The new active configuration version
+    """
+    try:
+        snapshot = analysis_config.reload()
+    except ConfigError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    return {
+        "status": "reloaded",
+        **snapshot.to_dict(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.put("")
+async def replace_config(document: Dict[str, Any]):
+    """
+    Validate and activate a configuration document
+    
+    Sections missing from the document fall back to the built-in defaults.
+    The document is not written to disk; a later file reload replaces it.
+    
+    Returns:
+        The new active configuration version
+    """
+    try:
+        snapshot = analysis_config.apply(document)
+    except ConfigError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    return {
+        "status": "applied",
+        **snapshot.to_dict(),
+        "timestamp": datetime.now().isoformat()
+    }
@@ -0,0 +1,111 @@
+"""
+Metric Ingest Router
+HTTP and WebSocket endpoints for pushing batched metrics into the monitoring pipeline
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+
+import msgpack
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+
+from services.metric_ingest import IngestError, ingest_batch
+from services.metric_store import metric_store
+
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(prefix="/ingest", tags=["ingest"])
+
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
+
+@router.post("/batch")
+async def ingest_metric_batch(request: Request):
+    """
+    Ingest a batch of columnar metric samples
+
+    The body is decoded directly (JSON, or MessagePack with an
+    application/msgpack content type) rather than through a Pydantic
+    model, so validation cost scales with the number of columns instead
+    of the number of samples. See services.metric_ingest.parse_batch for
+    the payload shape.
+
+    Samples older than their series' latest sample, or past the store's
+    series/entity caps, are dropped and reported under "rejected".
+
+    Decoding and appending run in a worker thread, so a large batch does
+    not stall the event loop (WebSocket writers, the broadcast tick).
+
+    Returns:
+        Counts of accepted samples, series and entities, and of rejected samples per reason
+    """
+    body = await request.body()
+    binary = request.headers.get("content-type", "").split(";")[0] in MSGPACK_CONTENT_TYPES
+    try:
+        payload = await asyncio.to_thread(msgpack.unpackb if binary else json.loads, body)
+    except (ValueError, msgpack.UnpackException) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
+
+    try:
+        counts = await asyncio.to_thread(ingest_batch, metric_store, payload)
+    except IngestError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return {
+        "status": "accepted",
+        **counts,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.websocket("/ws")
+async def ingest_websocket(websocket: WebSocket):
+    """
+    Streaming ingest over WebSocket
+
+    Each text frame (JSON) or binary frame (MessagePack) carries one batch
+    in the same shape as POST /ingest/batch and is acknowledged with an
+    ingest_ack or error message. Like POST /ingest/batch, frames are
+    decoded and appended in a worker thread.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+
+            try:
+                if frame.get("bytes") is not None:
+                    payload = await asyncio.to_thread(msgpack.unpackb, frame["bytes"])
+                else:
+                    payload = await asyncio.to_thread(json.loads, frame.get("text") or "")
+                counts = await asyncio.to_thread(ingest_batch, metric_store, payload)
+                await websocket.send_json({"type": "ingest_ack", **counts})
+            except (ValueError, msgpack.UnpackException) as e:
+                await websocket.send_json({"type": "error", "message": str(e)})
+
+    except WebSocketDisconnect:
+        logger.info("Ingest WebSocket disconnected")
+    except Exception as e:
+        logger.error(f"Ingest WebSocket error: {e}")
+
+@router.get("/status")
+async def get_ingest_status():
+    """
+    Get ingest and metric store status
+
+    Returns:
+        Store size information
+    """
+    return {
+        "status": "operational",
+        "entities": len(metric_store.entities()),
+        "series": metric_store.series_count,
+        "capacity_per_series": metric_store.capacity,
+        "max_series": metric_store.max_series,
+        "max_entities": metric_store.max_entities,
+        "rejected": dict(metric_store.rejected),
+        "timestamp": datetime.now().isoformat()
+    }
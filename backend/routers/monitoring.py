@@ -3,18 +3,34 @@ Monitoring Router
 WebSocket endpoints for real-time monitoring and communication
 """
 
+import asyncio
 import json
 import logging
-from typing import Dict, Any
+import os
+import time
+from typing import Dict, Any, Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 from datetime import datetime
-import random
 
-from websockets.manager import connection_manager
-from services.entanglement_map import get_entanglement_analysis, get_entangled_metrics, detect_anomaly
-from services.probabilistic_analyzer import analyze_root_cause, get_superposition_confidence, get_quantum_recommendations
-from services.cognition_engine import run_parallel_analysis, get_cognition_summary
+from websockets.manager import connection_manager, TOPIC_SUPERPOSITION, TOPIC_FLEET
+from websockets.scheduler import BroadcastScheduler
+from services.entanglement_map import get_entanglement_analysis, get_entangled_metrics, detect_anomaly, get_causal_graph, anomaly_ranker
+from services.analysis_config import ConfigSnapshot, analysis_config
+from services.entanglement_discovery import EntanglementDiscovery
+from services.probabilistic_analyzer import analyze_root_cause_summary, root_cause_cache
+from services.cognition_engine import STOP_COMPLETE, run_parallel_analysis, get_cognition_summary
+from services.cognition_agents import CAUSE_CHECK_MAPPING, check_flight
+from services.check_runtime import check_executor
 from services.optimization_model import find_optimal_solution
+from services.root_cause_model import root_cause_model
+from services.outcome_log import outcome_log
+from services.metric_sources import RandomMetricSource, create_metric_source
+from services.metric_store import DEFAULT_ENTITY, metric_store
+from services.metric_features import feature_tracker
+from services.fleet_analyzer import analyze_fleet_from_store
+from services.anomaly_detectors import detector_bank
+from services.alert_lifecycle import STATE_FIRING, alert_tracker
+from services.threshold_engine import LEVEL_NAMES
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -22,66 +38,186 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/monitoring", tags=["monitoring"])
 
+# Metric source feeding the pipeline (random, replay or push)
+metric_source = create_metric_source(
+    os.getenv("METRIC_SOURCE", "random"),
+    replay_path=os.getenv("METRIC_REPLAY_FILE")
+)
+
 def generate_system_metrics() -> Dict[str, float]:
     """
     Generate realistic system metrics for demonstration
     """
-    # Base metrics with some randomness
-    base_metrics = {
-        "cpu_usage": random.uniform(20, 95),  # Sometimes high to trigger anomalies
-        "memory_usage": random.uniform(30, 90),
-        "disk_usage": random.uniform(25, 85),
-        "network_io": random.uniform(100, 1200),
-        "database_connections": random.uniform(10, 90),
-        "cache_hit_rate": random.uniform(60, 95),
-        "active_users": random.uniform(1000, 12000),
-        "api_latency_p99": random.uniform(100, 1200),
-        "error_rate": random.uniform(0.1, 8.0),
-        "request_rate": random.uniform(200, 1500)
-    }
+    return RandomMetricSource().generate()
+
+async def broadcast_fleet_status(config: Optional[ConfigSnapshot] = None) -> Optional[Dict[str, Any]]:
+    """
+    Analyze every labelled entity in the metric store and broadcast a fleet summary.
+    
+    Args:
+        config: Configuration snapshot to analyze with (defaults to the active one)
+        
+    Returns:
+        The broadcast message, or None if there are no labelled entities or the analysis failed
+    """
+    try:
+        fleet_analysis = analyze_fleet_from_store(metric_store, config=config)
+        if not fleet_analysis["entity_count"]:
+            return None
+        
+        message = {
+            "type": "fleet_status",
+            "payload": fleet_analysis,
+            "config_version": fleet_analysis["config_version"],
+            "timestamp": datetime.now().isoformat()
+        }
+        await connection_manager.broadcast(message, topic=TOPIC_FLEET)
+        logger.info(f"Broadcasted fleet status: {fleet_analysis['anomalous_count']}/"
+                   f"{fleet_analysis['entity_count']} entities anomalous "
+                   f"({fleet_analysis['duration_ms']} ms)")
+        return message
+        
+    except Exception as e:
+        logger.error(f"Error in broadcast_fleet_status: {e}")
+        return None
+
+# Root cause, cognition and optimization results for the current set of active alerts
+# (recomputed only when an alert fires or escalates)
+alert_investigation: Dict[str, Any] = {}
+
+async def investigate_alerts(current_metrics: Dict[str, float], config: ConfigSnapshot,
+                             features: Optional[Dict[str, float]] = None,
+                             entity: str = DEFAULT_ENTITY) -> Dict[str, Any]:
+    """
+    Run the root cause, cognition and optimization pipeline for the current metrics.
+    
+    Args:
+        current_metrics: Latest value of every metric
+        config: Configuration snapshot to analyze with
+        features: Windowed trend features ("<metric>.<feature>" -> value) the root cause
+            rules can reference alongside the instantaneous values
+        entity: Entity (host/service) the metrics belong to; cognition checks for the
+            same entity share verdicts, checks for different entities never do
+        
+    Returns:
+        Entanglement analysis, root cause probabilities, cognition summary and optimal solution
+    """
+    entanglement_analysis = get_entanglement_analysis(current_metrics, config)
+    
+    # Perform probabilistic root cause analysis on the snapshot plus its trend features
+    evidence = {**current_metrics, **features} if features else current_metrics
+    root_cause_summary = analyze_root_cause_summary(evidence, config)
+    root_cause_probabilities = root_cause_summary["probabilities"]
+    
+    # Run parallel cognition analysis scoped to the investigated entity
+    cognition_analysis = await run_parallel_analysis(root_cause_probabilities, entity)
+    cognition_summary = get_cognition_summary(cognition_analysis)
+    
+    # Only a complete investigation is evidence for the root cause model: a run that
+    # stopped early never checked the causes the model ranks low, so learning from it
+    # would only reinforce the current ranking
+    learned_cause = None
+    if cognition_analysis.stop_reason == STOP_COMPLETE:
+        learned_cause = cognition_summary["confirmed_root_cause"]
+    
+    # Find optimal solution if root cause is confirmed, and learn from the confirmation
+    optimal_solution = None
+    if cognition_summary["confirmed_root_cause"]:
+        optimal_solution = find_optimal_solution(cognition_summary["confirmed_root_cause"], config)
+    if learned_cause:
+        root_cause_model.observe(evidence, learned_cause, config)
+    
+    # Keep the outcome as training data for the root cause model (the primary cause,
+    # which retraining learns from, only for complete investigations)
+    if outcome_log is not None:
+        try:
+            await asyncio.to_thread(
+                outcome_log.append,
+                evidence,
+                root_cause_probabilities,
+                [result.cause for result in cognition_analysis.results],
+                [result.cause for result in cognition_analysis.confirmed_causes],
+                learned_cause,
+                optimal_solution["action"] if optimal_solution else None
+            )
+        except OSError as e:
+            logger.error(f"Failed to record cognition outcome: {e}")
     
-    return base_metrics
+    logger.info(f"Investigated active alerts: {len(root_cause_probabilities)} potential causes, "
+               f"confirmed: {cognition_summary['confirmed_root_cause']}, "
+               f"optimal solution: {optimal_solution['action'] if optimal_solution else 'None'}")
+    
+    return {
+        "entanglement_analysis": entanglement_analysis,
+        "probabilities": root_cause_probabilities,
+        "confidence": root_cause_summary["confidence"],
+        "recommendations": root_cause_summary["recommendations"],
+        "cognition_summary": cognition_summary,
+        "optimal_solution": optimal_solution
+    }
 
-async def broadcast_superposition_analysis():
+async def broadcast_superposition_analysis() -> Optional[Dict[str, Any]]:
     """
     Generate metrics, analyze for anomalies, and broadcast superposition state.
+    
+    Returns:
+        The broadcast message, or None if the analysis failed
     """
     try:
-        # Generate current system metrics
-        current_metrics = generate_system_metrics()
+        # One configuration snapshot for the whole tick, even if it is reloaded meanwhile
+        config = analysis_config.snapshot
         
-        # Analyze for anomalies and entanglement
-        entanglement_analysis = get_entanglement_analysis(current_metrics)
+        # Collect current system metrics and record them in the metric history
+        # (samples pushed through the ingest API are already in the store)
+        snapshot = await metric_source.collect()
+        if snapshot:
+            timestamp = time.time()
+            metric_store.append_snapshot(snapshot, timestamp)
+            feature_tracker.update_snapshot(snapshot, timestamp, config)
+        current_metrics = metric_store.latest()
         
-        # Perform probabilistic root cause analysis
-        root_cause_probabilities = analyze_root_cause(current_metrics)
-        superposition_confidence = get_superposition_confidence(root_cause_probabilities)
-        quantum_recommendations = get_quantum_recommendations(root_cause_probabilities)
+        # Evaluate labelled hosts/services pushed through the ingest API
+        await broadcast_fleet_status(config)
         
-        # Run parallel cognition analysis
-        cognition_analysis = await run_parallel_analysis(root_cause_probabilities)
-        cognition_summary = get_cognition_summary(cognition_analysis)
+        # Score the new sample with the per-metric streaming detectors
+        statistical_anomalies = detector_bank.update_snapshot(snapshot) if snapshot else {}
         
-        # Find optimal solution if root cause is confirmed
-        optimal_solution = None
-        if cognition_summary["confirmed_root_cause"]:
-            optimal_solution = find_optimal_solution(cognition_summary["confirmed_root_cause"])
+        # Advance the alert lifecycle; only newly fired or escalated alerts rerun the
+        # root cause, cognition and optimization pipeline
+        transitions = alert_tracker.observe(current_metrics, config)
+        active_alerts = alert_tracker.active(DEFAULT_ENTITY)
+        if not active_alerts:
+            alert_investigation.clear()
+        elif not alert_investigation or any(t["to"] == STATE_FIRING for t in transitions):
+            alert_investigation.clear()
+            alert_investigation.update(await investigate_alerts(
+                current_metrics, config, feature_tracker.features(DEFAULT_ENTITY), DEFAULT_ENTITY
+            ))
         
-        # Determine if we have anomalies
-        has_anomalies = entanglement_analysis["has_anomalies"]
-        
-        if has_anomalies:
-            # Send superposition anomaly message
+        if active_alerts:
+            # Send superposition anomaly message, led by the most severe active alert
+            ranked_alerts = anomaly_ranker.rank(
+                {alert.metric: {"level": LEVEL_NAMES[alert.level], "value": alert.value} for alert in active_alerts},
+                config
+            )
+            primary_alert = ranked_alerts[0]
+            cognition_summary = alert_investigation["cognition_summary"]
+            entanglement_analysis = alert_investigation["entanglement_analysis"]
             message = {
                 "type": "superposition_anomaly",
                 "payload": current_metrics,
                 "superposition_state": {
-                    "probabilities": root_cause_probabilities,
-                    "confidence": superposition_confidence,
-                    "recommendations": quantum_recommendations,
-                    "primaryAnomaly": entanglement_analysis["primary_anomaly"],
-                    "anomalyLevel": entanglement_analysis["primary_anomaly_level"],
+                    "probabilities": alert_investigation["probabilities"],
+                    "confidence": alert_investigation["confidence"],
+                    "recommendations": alert_investigation["recommendations"],
+                    "primaryAnomaly": primary_alert["metric"],
+                    "anomalyLevel": primary_alert["level"],
+                    "rankedAnomalies": ranked_alerts,
                     "entangledMetrics": entanglement_analysis["entangled_metrics"],
+                    "blastRadius": entanglement_analysis["blast_radius"],
+                    "statistical_anomalies": statistical_anomalies,
+                    "alerts": [alert.to_dict() for alert in active_alerts],
+                    "alert_transitions": transitions,
                     "confirmed_root_cause": cognition_summary["confirmed_root_cause"],
                     "confirmed_details": cognition_summary["confirmed_details"],
                     "confirmed_severity": cognition_summary["confirmed_severity"],
@@ -89,8 +225,10 @@ async def broadcast_superposition_analysis():
                     "investigation_confidence": cognition_summary["investigation_confidence"],
                     "total_investigation_time": cognition_summary["total_investigation_time"],
                     "investigation_timestamp": cognition_summary["investigation_timestamp"],
-                    "optimal_solution": optimal_solution
+                    "investigation_stop_reason": cognition_summary["investigation_stop_reason"],
+                    "optimal_solution": alert_investigation["optimal_solution"]
                 },
+                "config_version": config.version,
                 "timestamp": datetime.now().isoformat()
             }
         else:
@@ -104,7 +242,12 @@ async def broadcast_superposition_analysis():
                     "recommendations": [],
                     "primaryAnomaly": None,
                     "anomalyLevel": None,
+                    "rankedAnomalies": [],
                     "entangledMetrics": [],
+                    "blastRadius": [],
+                    "statistical_anomalies": statistical_anomalies,
+                    "alerts": [],
+                    "alert_transitions": transitions,
                     "confirmed_root_cause": None,
                     "confirmed_details": None,
                     "confirmed_severity": None,
@@ -112,33 +255,88 @@ async def broadcast_superposition_analysis():
                     "investigation_confidence": 0.0,
                     "total_investigation_time": 0.0,
                     "investigation_timestamp": datetime.now().isoformat(),
+                    "investigation_stop_reason": None,
                     "optimal_solution": None
                 },
+                "config_version": config.version,
                 "timestamp": datetime.now().isoformat()
             }
         
-        # Broadcast to all connected clients
-        await connection_manager.broadcast(message)
-        logger.info(f"Broadcasted superposition analysis with cognition and optimization results: "
-                   f"{len(root_cause_probabilities)} potential causes, "
-                   f"confirmed: {cognition_summary['confirmed_root_cause']}, "
-                   f"optimal solution: {optimal_solution['action'] if optimal_solution else 'None'}")
+        # Broadcast to clients subscribed to the superposition stream; with nobody
+        # subscribed the analysis above still runs and the message is only kept
+        # as the scheduler's latest result for clients that connect later
+        if connection_manager.get_subscriber_count(TOPIC_SUPERPOSITION):
+            await connection_manager.broadcast_stream(message, topic=TOPIC_SUPERPOSITION)
+            logger.info(f"Broadcasted superposition analysis: {len(active_alerts)} active alerts, "
+                       f"{len(transitions)} transitions")
+        
+        return message
         
     except Exception as e:
         logger.error(f"Error in broadcast_superposition_analysis: {e}")
+        return None
+
+# Always-on collection and analysis tick: started by the app lifespan so the
+# metric history, alerts, fleet evaluation and features advance with no dashboard open
+broadcast_scheduler = BroadcastScheduler(broadcast_superposition_analysis, interval=5.0)
+
+# Learns entanglement edges from the local metric history
+entanglement_discovery = EntanglementDiscovery(
+    window=int(os.getenv("ENTANGLEMENT_DISCOVERY_WINDOW", "720")),
+    max_lag=int(os.getenv("ENTANGLEMENT_DISCOVERY_MAX_LAG", "12")),
+    min_correlation=float(os.getenv("ENTANGLEMENT_DISCOVERY_MIN_CORRELATION", "0.6")),
+    granger_order=int(os.getenv("ENTANGLEMENT_DISCOVERY_GRANGER_ORDER", "0"))
+)
 
-async def periodic_metric_broadcast():
+# Merge learned edges into the live causal graph (otherwise they are only published via the API)
+ENTANGLEMENT_DISCOVERY_APPLY = os.getenv("ENTANGLEMENT_DISCOVERY_APPLY", "false").lower() == "true"
+
+async def run_entanglement_discovery() -> Dict[str, Any]:
     """
-    Periodically broadcast entangled metrics to all connected clients
+    Run one entanglement discovery pass off the event loop and publish the result.
+    
+    Returns:
+        Summary of the run
     """
-    import asyncio
-    while True:
-        try:
-            await asyncio.sleep(5)  # Broadcast every 5 seconds
-            await broadcast_superposition_analysis()
-        except Exception as e:
-            logger.error(f"Error in periodic metric broadcast: {e}")
-            await asyncio.sleep(1)  # Wait before retrying
+    summary = await asyncio.to_thread(entanglement_discovery.discover_from_store, metric_store)
+    if ENTANGLEMENT_DISCOVERY_APPLY and summary["status"] == "published":
+        analysis_config.set_learned_graph(entanglement_discovery.graph)
+    return summary
+
+# Background discovery job (started in the app lifespan; interval 0 disables it)
+discovery_scheduler = BroadcastScheduler(
+    run_entanglement_discovery,
+    interval=float(os.getenv("ENTANGLEMENT_DISCOVERY_INTERVAL", "300"))
+)
+
+def _fit_root_cause_model() -> Dict[str, Any]:
+    """Refit the root cause model on every confirmed outcome in the log"""
+    start = datetime.now()
+    metrics, matrix, causes = outcome_log.training_data()
+    root_cause_model.fit(matrix, metrics, causes, analysis_config.snapshot)
+    return {
+        "status": "trained",
+        "samples": len(causes),
+        "model_version": root_cause_model.version,
+        "duration_ms": round((datetime.now() - start).total_seconds() * 1000, 2)
+    }
+
+async def retrain_root_cause_model() -> Dict[str, Any]:
+    """
+    Recompute the root cause model from the outcome log off the event loop.
+    
+    Returns:
+        Summary of the run
+    """
+    if outcome_log is None:
+        return {"status": "disabled"}
+    return await asyncio.to_thread(_fit_root_cause_model)
+
+# Background retraining job (started in the app lifespan when the outcome log is enabled)
+retrain_scheduler = BroadcastScheduler(
+    retrain_root_cause_model,
+    interval=float(os.getenv("ROOT_CAUSE_RETRAIN_INTERVAL", "3600"))
+)
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -150,6 +348,9 @@ async def websocket_endpoint(websocket: WebSocket):
     - Message broadcasting
     - Connection management
     - Real-time updates
+    
+    The frame encoding can be negotiated with the `codec` query parameter
+    (json, msgpack or cbor) or later via a subscribe message.
     """
     client_info = {
         "user_agent": websocket.headers.get("user-agent", "unknown"),
@@ -159,14 +360,19 @@ async def websocket_endpoint(websocket: WebSocket):
     
     try:
         # Accept the connection
-        await connection_manager.connect(websocket, client_info)
-        
-        # Send initial system status with entangled metrics
-        await broadcast_superposition_analysis()
+        try:
+            await connection_manager.connect(
+                websocket, client_info, codec=websocket.query_params.get("codec", "json")
+            )
+        except ValueError as e:
+            logger.warning(f"Rejected WebSocket connection: {e}")
+            await websocket.close(code=1003, reason=str(e))
+            return
         
-        # Start periodic metric broadcasting
-        import asyncio
-        broadcast_task = asyncio.create_task(periodic_metric_broadcast())
+        # The broadcast scheduler ticks regardless of clients; start the new one
+        # on the most recent analysis instead of waiting for the next tick
+        if broadcast_scheduler.latest is not None:
+            await connection_manager.send_personal_message(broadcast_scheduler.latest, websocket)
         
         # Keep the connection alive and handle messages
         while True:
@@ -202,8 +408,6 @@ async def websocket_endpoint(websocket: WebSocket):
         logger.error(f"WebSocket error: {e}")
     finally:
         # Clean up the connection
-        if 'broadcast_task' in locals():
-            broadcast_task.cancel()
         connection_manager.disconnect(websocket)
 
 async def handle_client_message(websocket: WebSocket, message: Dict[str, Any]) -> None:
@@ -224,16 +428,41 @@ async def handle_client_message(websocket: WebSocket, message: Dict[str, Any]) -
                 "timestamp": datetime.now().isoformat()
             }, websocket)
             
-        elif message_type == "subscribe":
-            # Handle subscription requests
+        elif message_type in ("subscribe", "unsubscribe"):
+            # Handle subscription requests (a single topic or a list of topics)
             subscription_type = message.get("subscription", "all")
+            topics = [subscription_type] if isinstance(subscription_type, str) else list(subscription_type)
+            try:
+                if message_type == "subscribe":
+                    # Optional codec switch; the confirmation is sent with the new codec
+                    if "codec" in message:
+                        connection_manager.set_codec(websocket, message["codec"])
+                    subscribed = connection_manager.subscribe(websocket, topics)
+                    # Optional opt-in to the delta-encoded superposition stream
+                    if "delta" in message:
+                        await connection_manager.set_delta_stream(websocket, bool(message["delta"]))
+                else:
+                    subscribed = connection_manager.unsubscribe(websocket, topics)
+            except ValueError as e:
+                await connection_manager.send_personal_message({
+                    "type": "error",
+                    "message": str(e),
+                    "timestamp": datetime.now().isoformat()
+                }, websocket)
+                return
+            
             await connection_manager.send_personal_message({
                 "type": "subscription_confirmed",
                 "subscription": subscription_type,
-                "message": f"Subscribed to {subscription_type} updates",
+                "topics": sorted(subscribed),
+                "message": f"{'Subscribed to' if message_type == 'subscribe' else 'Unsubscribed from'} {subscription_type} updates",
                 "timestamp": datetime.now().isoformat()
             }, websocket)
             
+        elif message_type == "resync":
+            # Delta stream client detected a sequence gap; resend the keyframe
+            await connection_manager.send_keyframe(websocket)
+            
         elif message_type == "request_status":
             # Send current system status
             await connection_manager.send_personal_message({
@@ -284,6 +513,11 @@ async def get_monitoring_status():
         "status": "operational",
         "active_connections": connection_manager.get_connection_count(),
         "connection_info": connection_manager.get_connection_info(),
+        "broadcast_scheduler": {
+            "running": broadcast_scheduler.running,
+            "subscribers": connection_manager.get_subscriber_count(TOPIC_SUPERPOSITION),
+            "interval": broadcast_scheduler.interval
+        },
         "timestamp": datetime.now().isoformat(),
         "features": [
             "Real-time WebSocket communication",
@@ -295,6 +529,195 @@ async def get_monitoring_status():
         ]
     }
 
+@router.get("/metrics/history")
+async def get_metric_history(metric: str, size: Optional[int] = None, since: Optional[float] = None):
+    """
+    Get a window of recorded samples for one metric
+    
+    Args:
+        metric: The metric name
+        size: Maximum number of most recent samples
+        since: Only samples with timestamp >= since (epoch seconds)
+        
+    Returns:
+        Timestamps and values, oldest first
+    """
+    timestamps, values = metric_store.window(metric, size=size, since=since)
+    if not len(values) and metric not in metric_store.metric_names():
+        raise HTTPException(status_code=404, detail=f"Unknown metric: {metric}")
+    
+    return {
+        "metric": metric,
+        "source": metric_source.name,
+        "timestamps": timestamps.tolist(),
+        "values": values.tolist(),
+        "count": len(values),
+        "capacity": metric_store.capacity
+    }
+
+@router.get("/features")
+async def get_metric_features():
+    """
+    Get the windowed trend features of every local metric
+    
+    Returns:
+        Per-metric slope, acceleration, trend, variance, z-score, percentile and time above threshold
+    """
+    return {
+        **feature_tracker.to_dict(DEFAULT_ENTITY),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/fleet")
+async def get_fleet_status():
+    """
+    Get per-entity anomalies, root causes and service/region roll-ups
+    
+    Returns:
+        Fleet analysis over the latest samples of every labelled entity
+    """
+    return {
+        **analyze_fleet_from_store(metric_store),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.post("/fleet/investigate")
+async def investigate_fleet_entity(entity: str):
+    """
+    Run the root cause, cognition and optimization pipeline for one labelled entity
+    
+    Args:
+        entity: Entity ID (as listed by /fleet)
+        
+    Returns:
+        Root cause probabilities, cognition summary and optimal solution for the entity
+    """
+    if entity not in metric_store.entities():
+        raise HTTPException(status_code=404, detail=f"Unknown entity: {entity}")
+    return {
+        **await investigate_alerts(metric_store.latest(entity), analysis_config.snapshot,
+                                   feature_tracker.features(entity), entity),
+        "entity": entity,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/alerts")
+async def get_alerts():
+    """
+    Get tracked alerts, recent lifecycle transitions and flap suppression counters
+    
+    Returns:
+        Alert tracker state
+    """
+    return {
+        **alert_tracker.to_dict(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/cognition-checks")
+async def get_cognition_checks():
+    """
+    Get per-check deadlines, hedging, circuit breaker state, latency histograms and verdict cache statistics
+    
+    Returns:
+        Runtime statistics of every cognition check, keyed by cause
+    """
+    return {
+        "checks": {cause: spec.to_dict() for cause, spec in CAUSE_CHECK_MAPPING.items()},
+        "single_flight": check_flight.to_dict(),
+        "executor": check_executor.to_dict(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/root-cause-model")
+async def get_root_cause_model():
+    """
+    Get the state of the learned root cause model
+    
+    Returns:
+        Model version, observation count, per-cause counts and result cache counters
+    """
+    return {
+        **root_cause_model.to_dict(),
+        "cache": root_cause_cache.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/causal-graph")
+async def get_causal_graph_view(metric: Optional[str] = None, limit: Optional[int] = None):
+    """
+    Get the causal graph, or the ranked downstream/upstream metrics of one metric
+    
+    Args:
+        metric: Optional metric to query
+        limit: Maximum entries per direction
+        
+    Returns:
+        Graph edges and cycles, or the metric's ranked closure and centrality
+    """
+    causal_graph = get_causal_graph()
+    if metric is None:
+        return causal_graph.to_dict()
+    if metric not in causal_graph.nodes:
+        raise HTTPException(status_code=404, detail=f"Unknown metric: {metric}")
+    
+    return {
+        "metric": metric,
+        "centrality": round(causal_graph.centrality(metric), 4),
+        "downstream": [reach.to_dict() for reach in causal_graph.downstream(metric, limit)],
+        "upstream": [reach.to_dict() for reach in causal_graph.upstream(metric, limit)]
+    }
+
+@router.get("/entanglement/learned")
+async def get_learned_entanglement():
+    """
+    Get the latest published version of the learned entanglement map
+    
+    Returns:
+        Version, learned graph, last run summary and version history
+    """
+    return {
+        **entanglement_discovery.to_dict(),
+        "applied": ENTANGLEMENT_DISCOVERY_APPLY,
+        "job_running": discovery_scheduler.running
+    }
+
+@router.post("/entanglement/learned/run")
+async def run_learned_entanglement():
+    """
+    Run entanglement discovery now
+    
+    Returns:
+        Summary of the run
+    """
+    return await run_entanglement_discovery()
+
+@router.get("/outcomes")
+async def get_outcome_log():
+    """
+    Get a summary of the cognition outcome log
+    
+    Returns:
+        Segment, record and size counts (enabled is False without OUTCOME_LOG_DIR)
+    """
+    if outcome_log is None:
+        return {"enabled": False, "timestamp": datetime.now().isoformat()}
+    return {
+        "enabled": True,
+        **outcome_log.to_dict(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.post("/root-cause-model/retrain")
+async def retrain_root_cause_model_now():
+    """
+    Retrain the root cause model from the outcome log now
+    
+    Returns:
+        Summary of the run
+    """
+    return await retrain_root_cause_model()
+
 @router.post("/broadcast")
 async def broadcast_message(message: Dict[str, Any]):
     """
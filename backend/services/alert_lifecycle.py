@@ -0,0 +1,239 @@
+"""
+Alert Lifecycle
+Stateful anomaly tracking with hysteresis, minimum durations and flap suppression
+"""
+
+import hashlib
+import os
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from services.analysis_config import ConfigSnapshot, analysis_config
+from services.metric_store import DEFAULT_ENTITY
+from services.threshold_engine import LEVEL_NAMES, LEVEL_NORMAL
+
+# Alert states
+STATE_PENDING = "pending"      # Past a threshold, not yet for long enough to fire
+STATE_FIRING = "firing"        # Confirmed anomaly; downstream analysis runs on entry
+STATE_RESOLVING = "resolving"  # Back inside the hysteresis band, not yet for long enough to resolve
+STATE_RESOLVED = "resolved"    # Cleared; the alert is dropped from the active set
+
+# Transitions kept for the status API
+RECENT_TRANSITIONS = 50
+
+def alert_fingerprint(entity: str, metric: str) -> str:
+    """
+    Stable identifier of one anomaly (the same metric on the same entity)
+
+    Args:
+        entity: Entity ID
+        metric: Metric name
+
+    Returns:
+        Short hex fingerprint
+    """
+    return hashlib.sha1(f"{entity}\x00{metric}".encode()).hexdigest()[:16]
+
+class Alert:
+    """
+    One tracked anomaly
+    """
+
+    __slots__ = ("fingerprint", "entity", "metric", "state", "level", "value",
+                 "started_at", "fired_at", "clear_since", "flaps")
+
+    def __init__(self, entity: str, metric: str, level: int, value: float, now: float):
+        self.fingerprint = alert_fingerprint(entity, metric)
+        self.entity = entity
+        self.metric = metric
+        self.state = STATE_PENDING
+        self.level = level
+        self.value = value
+        self.started_at = now
+        self.fired_at: Optional[float] = None
+        self.clear_since: Optional[float] = None
+        self.flaps = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable view of the alert"""
+        return {
+            "fingerprint": self.fingerprint,
+            "entity": self.entity,
+            "metric": self.metric,
+            "state": self.state,
+            "level": LEVEL_NAMES.get(self.level),
+            "value": self.value,
+            "started_at": self.started_at,
+            "fired_at": self.fired_at,
+            "flaps": self.flaps
+        }
+
+class AlertTracker:
+    """
+    Tracks anomalies across ticks so downstream work only happens on state transitions
+
+    Each anomaly moves through pending -> firing -> resolving -> resolved:
+
+    - A threshold crossing opens a pending alert; it fires only after the
+      metric has stayed outside the hysteresis band for pending_for seconds.
+    - A firing alert starts resolving once the value is back inside the
+      warning bounds narrowed by the hysteresis margin, and resolves after
+      staying there for resolve_for seconds.
+    - Values between the threshold and the narrowed bounds keep the current
+      state, so a metric hovering at its threshold neither fires nor clears
+      on alternate ticks.
+
+    Pending alerts that clear and resolving alerts that relapse are counted
+    as suppressed flaps rather than reported as transitions.
+    """
+
+    def __init__(self, pending_for: float = 10.0, resolve_for: float = 15.0, hysteresis: float = 0.05):
+        """
+        Initialize the tracker
+
+        Args:
+            pending_for: Seconds a metric must stay anomalous before its alert fires
+            resolve_for: Seconds a metric must stay clear before its alert resolves
+            hysteresis: Clearing margin as a fraction of the warning threshold
+        """
+        self.pending_for = pending_for
+        self.resolve_for = resolve_for
+        self.hysteresis = hysteresis
+        self._alerts: Dict[str, Alert] = {}
+        self.recent: deque = deque(maxlen=RECENT_TRANSITIONS)
+        self.stats = {"transitions": 0, "fired": 0, "escalated": 0, "resolved": 0, "suppressed_flaps": 0}
+
+    def _transition(self, alert: Alert, state: str, now: float, event: Optional[str] = None) -> Dict[str, Any]:
+        """Move an alert to a new state and record the transition"""
+        transition = {
+            "fingerprint": alert.fingerprint,
+            "entity": alert.entity,
+            "metric": alert.metric,
+            "event": event or state,
+            "from": alert.state,
+            "to": state,
+            "level": LEVEL_NAMES.get(alert.level),
+            "value": alert.value,
+            "at": now
+        }
+        alert.state = state
+        self.recent.append(transition)
+        self.stats["transitions"] += 1
+        return transition
+
+    def observe(self, metrics: Dict[str, float], config: Optional[ConfigSnapshot] = None,
+                entity: str = DEFAULT_ENTITY, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Evaluate one entity's latest samples and advance its alerts
+
+        Args:
+            metrics: metric -> latest value
+            config: Configuration snapshot providing the thresholds (defaults to the active one)
+            entity: Entity the samples belong to
+            now: Sample time (defaults to the current time)
+
+        Returns:
+            Transitions that happened on this tick (fired, escalated, resolved)
+        """
+        config = config or analysis_config.snapshot
+        engine = config.threshold_engine
+        now = time.time() if now is None else now
+        transitions: List[Dict[str, Any]] = []
+
+        for metric, value in metrics.items():
+            fingerprint = alert_fingerprint(entity, metric)
+            alert = self._alerts.get(fingerprint)
+            level = engine.level(metric, value)
+
+            if alert is None:
+                if level != LEVEL_NORMAL:
+                    alert = Alert(entity, metric, level, value, now)
+                    self._alerts[fingerprint] = alert
+                    if self.pending_for <= 0:
+                        alert.fired_at = now
+                        transitions.append(self._transition(alert, STATE_FIRING, now))
+                        self.stats["fired"] += 1
+                continue
+
+            alert.value = value
+            clear = engine.is_clear(metric, value, self.hysteresis)
+
+            if alert.state == STATE_PENDING:
+                if clear:
+                    # Never fired: a flap, not a resolution
+                    del self._alerts[fingerprint]
+                    self.stats["suppressed_flaps"] += 1
+                elif level != LEVEL_NORMAL:
+                    alert.level = max(alert.level, level)
+                    if now - alert.started_at >= self.pending_for:
+                        alert.fired_at = now
+                        transitions.append(self._transition(alert, STATE_FIRING, now))
+                        self.stats["fired"] += 1
+
+            elif alert.state == STATE_FIRING:
+                if clear:
+                    alert.clear_since = now
+                    alert.state = STATE_RESOLVING
+                    if now - alert.clear_since >= self.resolve_for:
+                        transitions.append(self._resolve(alert, now))
+                elif level > alert.level:
+                    alert.level = level
+                    transitions.append(self._transition(alert, STATE_FIRING, now, event="escalated"))
+                    self.stats["escalated"] += 1
+
+            elif alert.state == STATE_RESOLVING:
+                if not clear:
+                    # Relapsed before resolving: keep the original firing alert
+                    alert.state = STATE_FIRING
+                    alert.clear_since = None
+                    alert.flaps += 1
+                    self.stats["suppressed_flaps"] += 1
+                    if level > alert.level:
+                        alert.level = level
+                        transitions.append(self._transition(alert, STATE_FIRING, now, event="escalated"))
+                        self.stats["escalated"] += 1
+                elif now - alert.clear_since >= self.resolve_for:
+                    transitions.append(self._resolve(alert, now))
+
+        return transitions
+
+    def _resolve(self, alert: Alert, now: float) -> Dict[str, Any]:
+        """Resolve an alert and drop it from the active set"""
+        transition = self._transition(alert, STATE_RESOLVED, now)
+        del self._alerts[alert.fingerprint]
+        self.stats["resolved"] += 1
+        return transition
+
+    def active(self, entity: Optional[str] = None) -> List[Alert]:
+        """
+        Alerts that are firing or resolving (pending alerts are not yet confirmed)
+
+        Args:
+            entity: Only return alerts of this entity
+
+        Returns:
+            Active alerts, most severe first
+        """
+        alerts = [alert for alert in self._alerts.values()
+                  if alert.state in (STATE_FIRING, STATE_RESOLVING)
+                  and (entity is None or alert.entity == entity)]
+        return sorted(alerts, key=lambda alert: (-alert.level, alert.fired_at or 0.0, alert.metric))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable tracker state"""
+        return {
+            "pending_for": self.pending_for,
+            "resolve_for": self.resolve_for,
+            "hysteresis": self.hysteresis,
+            "alerts": [alert.to_dict() for alert in self._alerts.values()],
+            "recent_transitions": list(self.recent),
+            "stats": dict(self.stats)
+        }
+
+# Global alert tracker instance
+alert_tracker = AlertTracker(
+    pending_for=float(os.getenv("ALERT_PENDING_SECONDS", "10")),
+    resolve_for=float(os.getenv("ALERT_RESOLVE_SECONDS", "15")),
+    hysteresis=float(os.getenv("ALERT_HYSTERESIS", "0.05"))
+)
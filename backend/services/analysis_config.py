@@ -0,0 +1,366 @@
+"""
+Analysis Configuration Service
+Versioned, hot-reloadable thresholds, entanglement map, root cause rules and solution blueprints
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from services.causal_graph import DEFAULT_MAX_HOPS, CausalGraph
+from services.rule_engine import RuleEngine
+from services.threshold_engine import (DIRECTION_ABOVE, DIRECTION_BAND, DIRECTION_BELOW, DIRECTIONS,
+                                       ThresholdEngine)
+
+logger = logging.getLogger(__name__)
+
+# Fields every solution blueprint action must define
+BLUEPRINT_NUMERIC_FIELDS = ("cost", "performance_gain", "risk", "implementation_time")
+BLUEPRINT_REVERSIBILITY = {"high", "medium", "low"}
+
+class ConfigError(ValueError):
+    """Raised when a configuration document is invalid"""
+
+def _number(value: Any, path: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ConfigError(f"{path} must be a number")
+    return float(value)
+
+def _validate_thresholds(thresholds: Any, directions: Any) -> None:
+    if not isinstance(thresholds, dict):
+        raise ConfigError("thresholds must be an object")
+    if not isinstance(directions, dict):
+        raise ConfigError("directions must be an object")
+
+    for metric, direction in directions.items():
+        if direction not in DIRECTIONS:
+            raise ConfigError(f"directions.{metric} must be one of {sorted(DIRECTIONS)}")
+
+    for metric, levels in thresholds.items():
+        path = f"thresholds.{metric}"
+        if not isinstance(levels, dict) or "warning" not in levels or "critical" not in levels:
+            raise ConfigError(f"{path} must define warning and critical")
+        direction = directions.get(metric, DIRECTION_ABOVE)
+
+        if direction == DIRECTION_BAND:
+            bounds = {}
+            for level in ("warning", "critical"):
+                pair = levels[level]
+                if not isinstance(pair, list) or len(pair) != 2:
+                    raise ConfigError(f"{path}.{level} must be a [low, high] pair for a band metric")
+                bounds[level] = [_number(value, f"{path}.{level}") for value in pair]
+            if not (bounds["critical"][0] <= bounds["warning"][0] < bounds["warning"][1] <= bounds["critical"][1]):
+                raise ConfigError(f"{path}: the warning band must lie inside the critical band")
+            continue
+
+        warning = _number(levels["warning"], f"{path}.warning")
+        critical = _number(levels["critical"], f"{path}.critical")
+        if direction == DIRECTION_ABOVE and warning > critical:
+            raise ConfigError(f"{path}: warning must not exceed critical for an 'above' metric")
+        if direction == DIRECTION_BELOW and warning < critical:
+            raise ConfigError(f"{path}: warning must not be below critical for a 'below' metric")
+
+def _compile_entanglement(entanglement: Any, max_hops: int) -> CausalGraph:
+    if not isinstance(entanglement, dict):
+        raise ConfigError("entanglement must be an object")
+    for metric, partners in entanglement.items():
+        if not isinstance(partners, list):
+            raise ConfigError(f"entanglement.{metric} must be an array")
+        for index, partner in enumerate(partners):
+            path = f"entanglement.{metric}[{index}]"
+            if isinstance(partner, dict):
+                if not isinstance(partner.get("metric"), str):
+                    raise ConfigError(f"{path}.metric must be a string")
+                if "weight" in partner:
+                    _number(partner["weight"], f"{path}.weight")
+                if "lag" in partner and _number(partner["lag"], f"{path}.lag") < 0:
+                    raise ConfigError(f"{path}.lag must not be negative")
+            elif not isinstance(partner, str):
+                raise ConfigError(f"{path} must be a metric name or an object")
+    try:
+        return CausalGraph.from_config(entanglement, max_hops=max_hops)
+    except ValueError as e:
+        raise ConfigError(str(e))
+
+def _validate_blueprints(blueprints: Any) -> None:
+    if not isinstance(blueprints, dict):
+        raise ConfigError("blueprints must be an object")
+    for cause, actions in blueprints.items():
+        if not isinstance(actions, list):
+            raise ConfigError(f"blueprints.{cause} must be an array")
+        for index, action in enumerate(actions):
+            path = f"blueprints.{cause}[{index}]"
+            if not isinstance(action, dict) or not isinstance(action.get("action"), str):
+                raise ConfigError(f"{path} must be an object with an 'action' name")
+            for field in BLUEPRINT_NUMERIC_FIELDS:
+                _number(action.get(field), f"{path}.{field}")
+            if action.get("reversibility") not in BLUEPRINT_REVERSIBILITY:
+                raise ConfigError(f"{path}.reversibility must be one of {sorted(BLUEPRINT_REVERSIBILITY)}")
+            if not isinstance(action.get("dependencies"), list):
+                raise ConfigError(f"{path}.dependencies must be an array")
+
+class ConfigSnapshot:
+    """
+    One validated, compiled configuration version
+
+    Snapshots are never modified after construction; a reload or API
+    update builds a new snapshot and swaps the manager's reference, so an
+    analysis that grabbed a snapshot keeps using it consistently until it
+    finishes. Treat the document dictionaries as read-only.
+    """
+
+    def __init__(self, document: Dict[str, Any], source: str, generation: int,
+                 learned_graph: Optional[CausalGraph] = None):
+        """
+        Validate and compile a configuration document
+
+        Args:
+            document: {"thresholds", "directions", "entanglement", "root_cause_rules", "blueprints", "max_hops"}
+            source: Where the document came from (file path, "builtin" or "api")
+            generation: Local load counter
+            learned_graph: Learned entanglement edges merged on top of the configured ones
+
+        Raises:
+            ConfigError: If the document is invalid
+        """
+        document = copy.deepcopy(document)
+        self.thresholds: Dict[str, Dict[str, Any]] = document["thresholds"]
+        self.directions: Dict[str, str] = document["directions"]
+        self.entanglement: Dict[str, List[Any]] = document["entanglement"]
+        self.root_cause_rules: List[Dict[str, Any]] = document["root_cause_rules"]
+        self.blueprints: Dict[str, List[Dict[str, Any]]] = document["blueprints"]
+        self.max_hops = document.get("max_hops", DEFAULT_MAX_HOPS)
+        if isinstance(self.max_hops, bool) or not isinstance(self.max_hops, int) or self.max_hops < 1:
+            raise ConfigError("max_hops must be a positive integer")
+
+        _validate_thresholds(self.thresholds, self.directions)
+        _validate_blueprints(self.blueprints)
+        try:
+            self.threshold_engine = ThresholdEngine(self.thresholds, self.directions)
+        except (TypeError, ValueError) as e:
+            raise ConfigError(str(e))
+        if not isinstance(self.root_cause_rules, list):
+            raise ConfigError("root_cause_rules must be an array")
+        try:
+            self.rule_engine = RuleEngine(self.root_cause_rules)
+        except ValueError as e:
+            raise ConfigError(str(e))
+        self.configured_graph = _compile_entanglement(self.entanglement, self.max_hops)
+        self.learned_graph = learned_graph
+        self.causal_graph = self.configured_graph
+        if learned_graph is not None:
+            self.causal_graph = CausalGraph(self.configured_graph.edges + learned_graph.edges, max_hops=self.max_hops)
+
+        canonical = json.dumps(document, sort_keys=True, separators=(",", ":"))
+        self.version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+        self.generation = generation
+        self.source = source
+        self.loaded_at = time.time()
+        self._document = document
+
+    def with_learned_graph(self, learned_graph: Optional[CausalGraph]) -> "ConfigSnapshot":
+        """Copy of this snapshot with a different learned-edge overlay (same config version)"""
+        snapshot = copy.copy(self)
+        snapshot.learned_graph = learned_graph
+        snapshot.causal_graph = self.configured_graph
+        if learned_graph is not None:
+            snapshot.causal_graph = CausalGraph(self.configured_graph.edges + learned_graph.edges,
+                                                max_hops=self.max_hops)
+        return snapshot
+
+    def to_dict(self, include_document: bool = False) -> Dict[str, Any]:
+        """Serializable description of the snapshot"""
+        info = {
+            "version": self.version,
+            "generation": self.generation,
+            "source": self.source,
+            "loaded_at": self.loaded_at,
+            "metrics": len(self.thresholds),
+            "entanglement_edges": len(self.configured_graph.edges),
+            "learned_edges": len(self.learned_graph.edges) if self.learned_graph else 0,
+            "root_cause_rules": len(self.root_cause_rules),
+            "root_causes_with_blueprints": len(self.blueprints)
+        }
+        if include_document:
+            info["document"] = self._document
+        return info
+
+class ConfigManager:
+    """
+    Holds the active configuration snapshot and swaps it on reload
+
+    Readers take `manager.snapshot` once per analysis; swapping is a single
+    reference assignment, so readers never block and never see a partially
+    applied configuration. Loads are serialized with a lock.
+    """
+
+    def __init__(self, defaults: Callable[[], Dict[str, Any]], path: Optional[str] = None):
+        """
+        Initialize the manager
+
+        Args:
+            defaults: Returns the built-in document (sections missing from the file fall back to it)
+            path: Optional JSON config file
+        """
+        self.path = path
+        self._defaults = defaults
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._mtime: Optional[float] = None
+        self._watch_task: Optional[asyncio.Task] = None
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """The active snapshot (loaded on first access)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._initial_snapshot()
+                snapshot = self._snapshot
+        return snapshot
+
+    def _initial_snapshot(self) -> ConfigSnapshot:
+        """Load the config file, falling back to the built-in config if it is invalid"""
+        if self.path:
+            try:
+                return self._build(self._read_file(), self.path)
+            except ConfigError as e:
+                logger.error(f"Invalid analysis config, using built-in defaults: {e}")
+        return self._build({}, "builtin")
+
+    def _build(self, overrides: Dict[str, Any], source: str) -> ConfigSnapshot:
+        if not isinstance(overrides, dict):
+            raise ConfigError("configuration must be a JSON object")
+        unknown = set(overrides) - {"thresholds", "directions", "entanglement", "root_cause_rules",
+                                   "blueprints", "max_hops"}
+        if unknown:
+            raise ConfigError(f"unknown configuration sections: {sorted(unknown)}")
+        document = {**self._defaults(), **overrides}
+        learned = self._snapshot.learned_graph if self._snapshot else None
+        snapshot = ConfigSnapshot(document, source, self._generation + 1, learned_graph=learned)
+        self._generation += 1
+        return snapshot
+
+    def _read_file(self) -> Dict[str, Any]:
+        try:
+            self._mtime = os.path.getmtime(self.path)
+            with open(self.path, "r", encoding="utf-8") as config_file:
+                return json.load(config_file)
+        except (OSError, ValueError) as e:
+            raise ConfigError(f"cannot read {self.path}: {e}")
+
+    def reload(self) -> ConfigSnapshot:
+        """
+        Reload the config file (or the built-in defaults if no file is set)
+
+        Returns:
+            The new active snapshot
+
+        Raises:
+            ConfigError: If the file is invalid; the active snapshot is kept
+        """
+        with self._lock:
+            snapshot = self._build(self._read_file() if self.path else {}, self.path or "builtin")
+            self._snapshot = snapshot
+        logger.info(f"Loaded analysis config {snapshot.version} from {snapshot.source}")
+        return snapshot
+
+    def apply(self, document: Dict[str, Any]) -> ConfigSnapshot:
+        """
+        Activate a configuration document (e.g. from the API); not written to disk
+
+        Args:
+            document: Sections to override; missing sections use the built-in defaults
+
+        Returns:
+            The new active snapshot
+
+        Raises:
+            ConfigError: If the document is invalid; the active snapshot is kept
+        """
+        with self._lock:
+            snapshot = self._build(document, "api")
+            self._snapshot = snapshot
+        logger.info(f"Applied analysis config {snapshot.version} from the API")
+        return snapshot
+
+    def set_learned_graph(self, learned_graph: Optional[CausalGraph]) -> ConfigSnapshot:
+        """
+        Merge learned entanglement edges into the active causal graph
+
+        The overlay is kept across config reloads.
+
+        Args:
+            learned_graph: Learned edges, or None to remove the overlay
+        """
+        with self._lock:
+            snapshot = self.snapshot.with_learned_graph(learned_graph)
+            self._snapshot = snapshot
+        return snapshot
+
+    def _changed_on_disk(self) -> bool:
+        try:
+            return os.path.getmtime(self.path) != self._mtime
+        except OSError:
+            return False
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            if not self._changed_on_disk():
+                continue
+            try:
+                await asyncio.to_thread(self.reload)
+            except ConfigError as e:
+                logger.error(f"Rejected analysis config change: {e}")
+
+    def start_watching(self, interval: float = 5.0) -> None:
+        """Poll the config file for changes and reload it (called from the application lifespan)"""
+        if not self.path or (self._watch_task and not self._watch_task.done()):
+            return
+        if self._snapshot is None:
+            self._snapshot = self._initial_snapshot()
+        self._watch_task = asyncio.create_task(self._watch(interval))
+        logger.info(f"Watching analysis config {self.path} (interval: {interval}s)")
+
+    async def stop_watching(self) -> None:
+        """Stop the file watcher"""
+        if not self._watch_task:
+            return
+        self._watch_task.cancel()
+        try:
+            await self._watch_task
+        except asyncio.CancelledError:
+            pass
+        self._watch_task = None
+
+def builtin_document() -> Dict[str, Any]:
+    """
+    The configuration compiled into the code
+
+    Imported lazily: entanglement_map, probabilistic_analyzer and
+    optimization_model read the active snapshot from this module, so
+    importing them at the top would be circular.
+    """
+    from services.entanglement_map import ANOMALY_THRESHOLDS, ENTANGLEMENT_CONFIG, THRESHOLD_DIRECTIONS
+    from services.optimization_model import SOLUTION_BLUEPRINTS
+    from services.probabilistic_analyzer import ROOT_CAUSE_RULES
+    return {
+        "thresholds": ANOMALY_THRESHOLDS,
+        "directions": THRESHOLD_DIRECTIONS,
+        "entanglement": ENTANGLEMENT_CONFIG,
+        "root_cause_rules": ROOT_CAUSE_RULES,
+        "blueprints": SOLUTION_BLUEPRINTS,
+        "max_hops": DEFAULT_MAX_HOPS
+    }
+
+# Global configuration manager (QUANTUM_CONFIG_PATH overrides the built-in config)
+analysis_config = ConfigManager(builtin_document, path=os.getenv("QUANTUM_CONFIG_PATH") or None)
@@ -0,0 +1,387 @@
+"""
+Streaming Anomaly Detectors
+Online statistical detectors (EWMA, rolling z-score, MAD, Holt-Winters) selectable per metric
+"""
+
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.metric_store import DEFAULT_ENTITY
+from services.threshold_engine import LEVEL_CRITICAL, LEVEL_NAMES, LEVEL_NORMAL, LEVEL_WARNING
+
+class Detector:
+    """
+    Interface for online anomaly detectors
+
+    update() consumes one sample in O(1) (or O(log window)) time with
+    constant memory per series and returns a level code. The score of the
+    last sample is kept in `score`, expressed in standard-deviation-like
+    units so one pair of warning/critical limits fits every detector.
+    The sample is scored against the state *before* it is absorbed, so a
+    spike cannot mask itself.
+    """
+
+    name = "base"
+
+    def __init__(self, warning: float = 3.0, critical: float = 5.0, warmup: int = 10):
+        """
+        Initialize the detector
+
+        Args:
+            warning: Score at or above which a sample is a warning
+            critical: Score at or above which a sample is critical
+            warmup: Samples to absorb before any level is reported (the first sample
+                is never scored, since there is no state to score it against)
+        """
+        self.warning = warning
+        self.critical = critical
+        self.warmup = warmup
+        self.count = 0
+        self.score = 0.0
+
+    def _score(self, value: float) -> float:
+        """Score a sample against the current state"""
+        raise NotImplementedError
+
+    def _absorb(self, value: float) -> None:
+        """Update the state with a sample"""
+        raise NotImplementedError
+
+    def update(self, value: float) -> int:
+        """
+        Score and absorb one sample
+
+        Args:
+            value: The sample value
+
+        Returns:
+            Level code (LEVEL_NORMAL, LEVEL_WARNING or LEVEL_CRITICAL)
+        """
+        self.score = self._score(value) if self.count and self.count >= self.warmup else 0.0
+        self._absorb(value)
+        self.count += 1
+        if self.score >= self.critical:
+            return LEVEL_CRITICAL
+        if self.score >= self.warning:
+            return LEVEL_WARNING
+        return LEVEL_NORMAL
+
+class EWMADetector(Detector):
+    """Exponentially weighted mean and variance; tracks slow drift, forgets old noise"""
+
+    name = "ewma"
+
+    def __init__(self, alpha: float = 0.1, **kwargs):
+        """
+        Args:
+            alpha: Smoothing factor in (0, 1]; higher adapts faster
+        """
+        super().__init__(**kwargs)
+        self.alpha = alpha
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def _score(self, value: float) -> float:
+        deviation = abs(value - self.mean)
+        if self.variance <= 0.0:
+            return math.inf if deviation > 0.0 else 0.0
+        return deviation / math.sqrt(self.variance)
+
+    def _absorb(self, value: float) -> None:
+        if not self.count:
+            self.mean = value
+            return
+        delta = value - self.mean
+        increment = self.alpha * delta
+        self.mean += increment
+        self.variance = (1.0 - self.alpha) * (self.variance + delta * increment)
+
+class RollingZScoreDetector(Detector):
+    """Z-score against the mean and standard deviation of the last `window` samples"""
+
+    name = "zscore"
+
+    def __init__(self, window: int = 60, **kwargs):
+        """
+        Args:
+            window: Number of recent samples in the baseline
+        """
+        super().__init__(**kwargs)
+        self.window = window
+        self._values: deque = deque(maxlen=window)
+        self._sum = 0.0
+        self._sum_squares = 0.0
+        self._since_resum = 0
+
+    def _score(self, value: float) -> float:
+        n = len(self._values)
+        mean = self._sum / n
+        variance = max(self._sum_squares / n - mean * mean, 0.0)
+        deviation = abs(value - mean)
+        if variance <= 0.0:
+            return math.inf if deviation > 0.0 else 0.0
+        return deviation / math.sqrt(variance)
+
+    def _absorb(self, value: float) -> None:
+        if len(self._values) == self.window:
+            evicted = self._values[0]
+            self._sum -= evicted
+            self._sum_squares -= evicted * evicted
+        self._values.append(value)
+        self._sum += value
+        self._sum_squares += value * value
+
+        # Re-sum once per window to stop floating-point drift in the running sums
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            self._sum = math.fsum(self._values)
+            self._sum_squares = math.fsum(v * v for v in self._values)
+            self._since_resum = 0
+
+def _kth_of_two_sorted(a: Callable[[int], float], a_len: int,
+                       b: Callable[[int], float], b_len: int, k: int) -> float:
+    """k-th smallest (0-based) element of the union of two ascending sequences, in O(log k)"""
+    a_offset = b_offset = 0
+    while True:
+        if a_offset == a_len:
+            return b(b_offset + k)
+        if b_offset == b_len:
+            return a(a_offset + k)
+        if k == 0:
+            return min(a(a_offset), b(b_offset))
+        step = (k + 1) // 2
+        i = min(a_offset + step, a_len) - 1
+        j = min(b_offset + step, b_len) - 1
+        if a(i) <= b(j):
+            k -= i - a_offset + 1
+            a_offset = i + 1
+        else:
+            k -= j - b_offset + 1
+            b_offset = j + 1
+
+class MADDetector(Detector):
+    """
+    Modified z-score using the median absolute deviation of the last `window` samples
+
+    Robust to outliers already in the window. The window is kept sorted
+    (bisect insert/remove), the median is read directly, and the MAD is
+    found as the middle element of the two ascending deviation runs on
+    either side of the median, so no per-sample sort is needed.
+    """
+
+    name = "mad"
+
+    # Scales the MAD to the standard deviation of a normal distribution
+    CONSISTENCY = 0.6745
+
+    def __init__(self, window: int = 60, **kwargs):
+        """
+        Args:
+            window: Number of recent samples in the baseline
+        """
+        super().__init__(**kwargs)
+        self.window = window
+        self._values: deque = deque(maxlen=window)
+        self._sorted: List[float] = []
+
+    def _median_and_mad(self) -> Tuple[float, float]:
+        ordered = self._sorted
+        n = len(ordered)
+        middle = n // 2
+        median = ordered[middle] if n % 2 else (ordered[middle - 1] + ordered[middle]) / 2.0
+
+        split = bisect_left(ordered, median)
+        below = lambda i: median - ordered[split - 1 - i]
+        above = lambda j: ordered[split + j] - median
+        upper = _kth_of_two_sorted(below, split, above, n - split, middle)
+        if n % 2:
+            return median, upper
+        lower = _kth_of_two_sorted(below, split, above, n - split, middle - 1)
+        return median, (lower + upper) / 2.0
+
+    def _score(self, value: float) -> float:
+        median, mad = self._median_and_mad()
+        deviation = abs(value - median)
+        if mad <= 0.0:
+            return math.inf if deviation > 0.0 else 0.0
+        return self.CONSISTENCY * deviation / mad
+
+    def _absorb(self, value: float) -> None:
+        if len(self._values) == self.window:
+            del self._sorted[bisect_left(self._sorted, self._values[0])]
+        self._values.append(value)
+        insort(self._sorted, value)
+
+class HoltWintersDetector(Detector):
+    """
+    Additive Holt-Winters (level, trend, season) forecast error
+
+    The score is the absolute forecast error divided by a smoothed mean
+    absolute error, scaled to standard-deviation units. The first season
+    of samples initializes the seasonal components.
+    """
+
+    name = "holt_winters"
+
+    # Mean absolute error to standard deviation for normally distributed errors
+    MAE_TO_SIGMA = 1.25
+
+    def __init__(self, season_length: int = 12, alpha: float = 0.3, beta: float = 0.05,
+                 gamma: float = 0.1, error_alpha: float = 0.1, **kwargs):
+        """
+        Args:
+            season_length: Samples per season (e.g. 720 for daily at 2-minute resolution)
+            alpha: Level smoothing factor
+            beta: Trend smoothing factor
+            gamma: Seasonal smoothing factor
+            error_alpha: Smoothing factor of the mean absolute forecast error
+        """
+        kwargs.setdefault("warmup", 2 * season_length)
+        super().__init__(**kwargs)
+        self.season_length = season_length
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.error_alpha = error_alpha
+        self.level = 0.0
+        self.trend = 0.0
+        self.seasonal = [0.0] * season_length
+        self.mean_abs_error = 0.0
+
+    def _forecast(self) -> float:
+        return self.level + self.trend + self.seasonal[self.count % self.season_length]
+
+    def _score(self, value: float) -> float:
+        error = abs(value - self._forecast())
+        if self.mean_abs_error <= 0.0:
+            return math.inf if error > 0.0 else 0.0
+        return error / (self.MAE_TO_SIGMA * self.mean_abs_error)
+
+    def _absorb(self, value: float) -> None:
+        position = self.count % self.season_length
+        if self.count < self.season_length:
+            # First season: running mean as the level, offsets as the seasonal profile
+            self.level += (value - self.level) / (self.count + 1)
+            self.seasonal[position] = value
+            if self.count == self.season_length - 1:
+                self.seasonal = [sample - self.level for sample in self.seasonal]
+            return
+
+        error = abs(value - self._forecast())
+        self.mean_abs_error += self.error_alpha * (error - self.mean_abs_error)
+
+        seasonal = self.seasonal[position]
+        previous_level = self.level
+        self.level = self.alpha * (value - seasonal) + (1.0 - self.alpha) * (self.level + self.trend)
+        self.trend = self.beta * (self.level - previous_level) + (1.0 - self.beta) * self.trend
+        self.seasonal[position] = self.gamma * (value - self.level) + (1.0 - self.gamma) * seasonal
+
+# Registry of detector types by name
+DETECTOR_TYPES: Dict[str, type] = {
+    detector.name: detector
+    for detector in (EWMADetector, RollingZScoreDetector, MADDetector, HoltWintersDetector)
+}
+
+# Detector used for metrics without an entry in DETECTOR_CONFIG
+DEFAULT_DETECTOR: Dict[str, Any] = {"type": "ewma", "alpha": 0.1}
+
+# Per-metric detector selection; None disables statistical detection for a metric
+DETECTOR_CONFIG: Dict[str, Optional[Dict[str, Any]]] = {
+    "cpu_usage": {"type": "ewma", "alpha": 0.1},
+    "memory_usage": {"type": "ewma", "alpha": 0.05},  # Leaks show up as slow drift
+    "disk_usage": {"type": "ewma", "alpha": 0.02},
+    "network_io": {"type": "mad", "window": 60},  # Bursty; robust baseline
+    "database_connections": {"type": "zscore", "window": 60},
+    "cache_hit_rate": {"type": "zscore", "window": 60},
+    "active_users": {"type": "holt_winters", "season_length": 720},  # Hourly cycle at 5 s ticks
+    "api_latency_p99": {"type": "mad", "window": 120},
+    "error_rate": {"type": "mad", "window": 60},
+    "request_rate": {"type": "holt_winters", "season_length": 720}
+}
+
+def create_detector(spec: Dict[str, Any]) -> Detector:
+    """
+    Create a detector from a config entry
+
+    Args:
+        spec: {"type": name, **constructor arguments}
+
+    Returns:
+        The detector
+    """
+    options = dict(spec)
+    kind = options.pop("type", DEFAULT_DETECTOR["type"])
+    detector_type = DETECTOR_TYPES.get(kind)
+    if detector_type is None:
+        raise ValueError(f"Unknown detector type: {kind}")
+    return detector_type(**options)
+
+class DetectorBank:
+    """
+    One detector per (entity, metric) series, created lazily from the config
+    """
+
+    def __init__(self, config: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+                 default: Optional[Dict[str, Any]] = DEFAULT_DETECTOR):
+        """
+        Initialize the bank
+
+        Args:
+            config: metric -> detector spec (None disables the metric)
+            default: Spec for metrics missing from config (None disables them)
+        """
+        self.config = DETECTOR_CONFIG if config is None else config
+        self.default = default
+        self._detectors: Dict[Tuple[str, str], Optional[Detector]] = {}
+
+    def detector(self, metric: str, entity: str = DEFAULT_ENTITY) -> Optional[Detector]:
+        """Get (creating if needed) the detector for a series, or None if disabled"""
+        key = (entity, metric)
+        if key not in self._detectors:
+            spec = self.config.get(metric, self.default)
+            self._detectors[key] = create_detector(spec) if spec is not None else None
+        return self._detectors[key]
+
+    def update(self, metric: str, value: float, entity: str = DEFAULT_ENTITY) -> int:
+        """
+        Feed one sample to its series detector
+
+        Returns:
+            Level code (LEVEL_NORMAL if detection is disabled for the metric)
+        """
+        detector = self.detector(metric, entity)
+        return detector.update(value) if detector is not None else LEVEL_NORMAL
+
+    def update_snapshot(self, snapshot: Dict[str, float], entity: str = DEFAULT_ENTITY) -> Dict[str, Dict[str, Any]]:
+        """
+        Feed a snapshot to the detectors of an entity
+
+        Args:
+            snapshot: Dictionary of metric names to values
+            entity: The entity the snapshot belongs to
+
+        Returns:
+            Dictionary of anomalous metrics to {"level", "score", "detector"}
+        """
+        anomalies = {}
+        for metric, value in snapshot.items():
+            detector = self.detector(metric, entity)
+            if detector is None:
+                continue
+            level = detector.update(value)
+            if level:
+                anomalies[metric] = {
+                    "level": LEVEL_NAMES[level],
+                    "score": round(detector.score, 2) if math.isfinite(detector.score) else None,
+                    "detector": detector.name
+                }
+        return anomalies
+
+    @property
+    def series_count(self) -> int:
+        return len(self._detectors)
+
+# Global detector bank for the monitoring pipeline
+detector_bank = DetectorBank()
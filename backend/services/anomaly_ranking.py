@@ -0,0 +1,92 @@
+"""
+Anomaly Ranking
+Deterministic severity ranking of concurrent anomalies
+"""
+
+import heapq
+from typing import Any, Callable, Dict, List, Optional
+
+from services.analysis_config import ConfigSnapshot, analysis_config
+from services.threshold_engine import LEVEL_NAMES
+
+# Level name -> level code (the inverse of LEVEL_NAMES)
+LEVEL_CODES = {name: code for code, name in LEVEL_NAMES.items()}
+
+# Importance class -> score in [0, 1]
+IMPORTANCE_SCORES = {"primary": 1.0, "secondary": 0.6, "tertiary": 0.3}
+
+# Weights of the tie-breaking components within one level (sum to 1)
+EXCEEDANCE_WEIGHT = 0.5
+IMPORTANCE_WEIGHT = 0.3
+CENTRALITY_WEIGHT = 0.2
+
+class AnomalyRanker:
+    """
+    Ranks anomalies by level, then by a weighted severity score
+
+    The level always dominates: any critical anomaly outranks every
+    warning. Within a level, anomalies are ordered by a score combining
+    how far past its threshold the value is (relative exceedance, squashed
+    to [0, 1)), the metric's importance class and its downstream
+    centrality in the causal graph. Remaining ties are broken by metric
+    name, so the ranking is deterministic.
+    """
+
+    def __init__(self, importance: Callable[[str], str]):
+        """
+        Initialize the ranker
+
+        Args:
+            importance: metric -> 'primary', 'secondary' or 'tertiary'
+        """
+        self.importance = importance
+
+    def score(self, metric: str, value: float, config: ConfigSnapshot) -> Dict[str, float]:
+        """
+        Severity score components of one anomaly
+
+        Args:
+            metric: The metric name
+            value: The anomalous value
+            config: Configuration snapshot providing thresholds and the causal graph
+
+        Returns:
+            exceedance, importance, centrality and the combined score
+        """
+        exceedance = config.threshold_engine.exceedance_of(metric, value)
+        importance = IMPORTANCE_SCORES.get(self.importance(metric), 0.0)
+        centrality = config.causal_graph.centrality(metric)
+        score = (EXCEEDANCE_WEIGHT * exceedance / (1.0 + exceedance)
+                 + IMPORTANCE_WEIGHT * importance
+                 + CENTRALITY_WEIGHT * centrality)
+        return {
+            "exceedance": round(exceedance, 4),
+            "importance": importance,
+            "centrality": round(centrality, 4),
+            "score": round(score, 4)
+        }
+
+    def rank(self, anomalies: Dict[str, Dict[str, Any]], config: Optional[ConfigSnapshot] = None,
+             limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rank anomalies, most severe first
+
+        Args:
+            anomalies: metric -> {"level": 'warning' | 'critical', "value": v, ...}
+            config: Configuration snapshot to score with (defaults to the active one)
+            limit: Return only the top-k anomalies
+
+        Returns:
+            Ranked anomalies with their level, value and score components
+        """
+        config = config or analysis_config.snapshot
+        ranked = []
+        for metric, anomaly in anomalies.items():
+            entry = {"metric": metric, "level": anomaly["level"], "value": anomaly["value"]}
+            entry.update(self.score(metric, anomaly["value"], config))
+            ranked.append(entry)
+
+        key = lambda entry: (-LEVEL_CODES.get(entry["level"], 0), -entry["score"], entry["metric"])
+        if limit is not None and limit < len(ranked):
+            return heapq.nsmallest(limit, ranked, key=key)
+        return sorted(ranked, key=key)
@@ -0,0 +1,278 @@
+"""
+Causal Graph
+Weighted, lagged metric dependency graph with precomputed k-hop reachability
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Default number of hops an anomaly is propagated through
+DEFAULT_MAX_HOPS = 3
+
+# Weight of config edges given without one; below 1 so strength decays with distance
+DEFAULT_EDGE_WEIGHT = 0.8
+
+class CausalEdge:
+    """A directed cause -> effect link between two metrics"""
+    def __init__(self, source: str, target: str, weight: float = 1.0, lag: float = 0.0):
+        """
+        Args:
+            source: The cause metric
+            target: The affected metric
+            weight: Strength of the link in (0, 1]
+            lag: Typical delay in seconds before the effect shows up
+        """
+        if not 0.0 < weight <= 1.0:
+            raise ValueError(f"Edge weight for {source} -> {target} must be in (0, 1], got {weight}")
+        self.source = source
+        self.target = target
+        self.weight = weight
+        self.lag = lag
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"source": self.source, "target": self.target, "weight": self.weight, "lag": self.lag}
+
+class Reach:
+    """Strongest path from one metric to another within the hop limit"""
+    __slots__ = ("metric", "strength", "hops", "lag")
+
+    def __init__(self, metric: str, strength: float, hops: int, lag: float):
+        self.metric = metric
+        self.strength = strength  # Product of edge weights along the path
+        self.hops = hops
+        self.lag = lag  # Sum of edge lags along the path
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"metric": self.metric, "strength": round(self.strength, 4), "hops": self.hops, "lag": self.lag}
+
+def _rank(reach: Dict[str, Reach]) -> Tuple[Reach, ...]:
+    """Order reachable metrics by strength, then distance, then name"""
+    return tuple(sorted(reach.values(), key=lambda r: (-r.strength, r.hops, r.metric)))
+
+class CausalGraph:
+    """
+    Immutable causal graph over metrics
+
+    Everything a query needs is computed in the constructor: direct
+    neighbours, strongly connected components (cycles), and the ranked
+    k-hop downstream/upstream closure of every metric. Lookups are then a
+    single dict access. Build a new graph to change the edges.
+    """
+
+    def __init__(self, edges: Iterable[CausalEdge], max_hops: int = DEFAULT_MAX_HOPS):
+        """
+        Build the graph and its closures
+
+        Args:
+            edges: Directed edges; a repeated source/target pair keeps the last edge
+            max_hops: Maximum path length included in the closures
+        """
+        self.max_hops = max_hops
+        self._edges: Dict[Tuple[str, str], CausalEdge] = {}
+        for edge in edges:
+            self._edges[(edge.source, edge.target)] = edge
+
+        self._successors: Dict[str, List[CausalEdge]] = {}
+        self._predecessors: Dict[str, List[CausalEdge]] = {}
+        for edge in self._edges.values():
+            self._successors.setdefault(edge.source, []).append(edge)
+            self._predecessors.setdefault(edge.target, []).append(edge)
+        self.nodes: Tuple[str, ...] = tuple(sorted(set(self._successors) | set(self._predecessors)))
+
+        self._neighbours: Dict[str, List[str]] = {
+            node: [edge.target for edge in self._successors.get(node, [])] for node in self.nodes
+        }
+        self.components: List[List[str]] = self._strongly_connected_components()
+        self._downstream: Dict[str, Tuple[Reach, ...]] = {}
+        self._upstream: Dict[str, Tuple[Reach, ...]] = {}
+        self._downstream_index: Dict[str, Dict[str, Reach]] = {}
+        for node in self.nodes:
+            downstream = self._closure(node, self._successors, "target")
+            self._downstream_index[node] = downstream
+            self._downstream[node] = _rank(downstream)
+            self._upstream[node] = _rank(self._closure(node, self._predecessors, "source"))
+
+        # Centrality: total downstream path strength, normalized to the most central metric
+        totals = {node: sum(r.strength for r in self._downstream[node]) for node in self.nodes}
+        peak = max(totals.values(), default=0.0) or 1.0
+        self._centrality: Dict[str, float] = {node: total / peak for node, total in totals.items()}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, List[Any]], max_hops: int = DEFAULT_MAX_HOPS) -> "CausalGraph":
+        """
+        Build a graph from an ENTANGLEMENT_CONFIG-style mapping
+
+        Args:
+            config: source metric -> partners, each either a metric name
+                (DEFAULT_EDGE_WEIGHT, no lag) or {"metric", "weight", "lag"}
+            max_hops: Maximum path length included in the closures
+
+        Returns:
+            The causal graph
+        """
+        edges = []
+        for source, partners in config.items():
+            for partner in partners:
+                if isinstance(partner, dict):
+                    edges.append(CausalEdge(source, partner["metric"], partner.get("weight", DEFAULT_EDGE_WEIGHT),
+                                            partner.get("lag", 0.0)))
+                else:
+                    edges.append(CausalEdge(source, partner, DEFAULT_EDGE_WEIGHT))
+        return cls(edges, max_hops=max_hops)
+
+    def _closure(self, start: str, adjacency: Dict[str, List[CausalEdge]], direction: str) -> Dict[str, Reach]:
+        """
+        Strongest path to every metric reachable within max_hops
+
+        A hop-limited relaxation (Bellman-Ford style, one round per hop);
+        since weights are at most 1, revisiting a cycle never strengthens a
+        path, so cycles terminate naturally.
+        """
+        best: Dict[str, Reach] = {}
+        frontier = {start: Reach(start, 1.0, 0, 0.0)}
+        for hop in range(1, self.max_hops + 1):
+            next_frontier: Dict[str, Reach] = {}
+            for node, reach in frontier.items():
+                for edge in adjacency.get(node, []):
+                    other = getattr(edge, direction)
+                    if other == start:
+                        continue
+                    strength = reach.strength * edge.weight
+                    known = best.get(other) or next_frontier.get(other)
+                    if known is None or strength > known.strength:
+                        candidate = Reach(other, strength, hop, reach.lag + edge.lag)
+                        best[other] = candidate
+                        next_frontier[other] = candidate
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return best
+
+    def _strongly_connected_components(self) -> List[List[str]]:
+        """Tarjan's algorithm (iterative); returns components with a cycle"""
+        index_of: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        for root in self.nodes:
+            if root in index_of:
+                continue
+            work = [(root, iter(self._neighbours[root]))]
+            index_of[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index_of:
+                        index_of[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self._neighbours[child])))
+                    elif child in on_stack:
+                        low[node] = min(low[node], index_of[child])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or (node, node) in self._edges:
+                        components.append(sorted(component))
+
+        return components
+
+    @property
+    def has_cycles(self) -> bool:
+        return bool(self.components)
+
+    @property
+    def edges(self) -> List[CausalEdge]:
+        return list(self._edges.values())
+
+    def neighbours(self, metric: str) -> List[str]:
+        """Direct effects of a metric, in config order"""
+        return self._neighbours.get(metric, [])
+
+    def downstream(self, metric: str, limit: Optional[int] = None) -> Tuple[Reach, ...]:
+        """
+        Metrics affected by a metric within max_hops, strongest first
+
+        Args:
+            metric: The cause metric
+            limit: Return at most this many entries
+
+        Returns:
+            Ranked Reach entries
+        """
+        ranked = self._downstream.get(metric, ())
+        return ranked if limit is None else ranked[:limit]
+
+    def upstream(self, metric: str, limit: Optional[int] = None) -> Tuple[Reach, ...]:
+        """
+        Metrics that can cause a metric within max_hops, strongest first
+
+        Args:
+            metric: The affected metric
+            limit: Return at most this many entries
+
+        Returns:
+            Ranked Reach entries
+        """
+        ranked = self._upstream.get(metric, ())
+        return ranked if limit is None else ranked[:limit]
+
+    def reach(self, source: str, target: str) -> Optional[Reach]:
+        """Strongest path from source to target within max_hops, or None"""
+        return self._downstream_index.get(source, {}).get(target)
+
+    def centrality(self, metric: str) -> float:
+        """Relative downstream influence of a metric in [0, 1]"""
+        return self._centrality.get(metric, 0.0)
+
+    def blast_radius(self, metrics: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Merge the downstream closures of several anomalous metrics
+
+        Args:
+            metrics: The anomalous metrics
+
+        Returns:
+            Affected metrics (excluding the anomalies themselves), strongest first,
+            each with the anomaly it is most strongly reached from
+        """
+        sources = set(metrics)
+        merged: Dict[str, Tuple[Reach, str]] = {}
+        for source in sorted(sources):
+            for reach in self._downstream.get(source, ()):
+                if reach.metric in sources:
+                    continue
+                known = merged.get(reach.metric)
+                if known is None or reach.strength > known[0].strength:
+                    merged[reach.metric] = (reach, source)
+
+        ranked = sorted(merged.values(), key=lambda item: (-item[0].strength, item[0].hops, item[0].metric))
+        return [{**reach.to_dict(), "source": source} for reach, source in ranked]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable summary of the graph"""
+        return {
+            "nodes": list(self.nodes),
+            "edges": [edge.to_dict() for edge in self._edges.values()],
+            "cycles": self.components,
+            "max_hops": self.max_hops
+        }
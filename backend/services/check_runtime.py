@@ -0,0 +1,493 @@
+"""
+Cognition Check Runtime
+Deadlines, hedged attempts, circuit breakers and latency histograms for diagnostic checks
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Union
+
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Severity reported when a check gives no answer (deadline, error or open circuit)
+SEVERITY_UNKNOWN = "unknown"
+
+# Defaults for specs that do not set their own
+DEFAULT_CHECK_TIMEOUT = float(os.getenv("COGNITION_CHECK_TIMEOUT", "2.5"))
+DEFAULT_FAILURE_THRESHOLD = int(os.getenv("COGNITION_CHECK_FAILURE_THRESHOLD", "5"))
+DEFAULT_RESET_TIMEOUT = float(os.getenv("COGNITION_CHECK_RESET_SECONDS", "30"))
+DEFAULT_CACHE_TTL = float(os.getenv("COGNITION_CHECK_CACHE_TTL", "5"))
+
+# Where a check runs: on the event loop (async function), in the thread pool
+# (blocking I/O) or in the process pool (CPU-bound work; module-level function)
+MODE_ASYNC = "async"
+MODE_THREAD = "thread"
+MODE_PROCESS = "process"
+MODES = (MODE_ASYNC, MODE_THREAD, MODE_PROCESS)
+
+# Circuit breaker states
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+def unknown_result(details: str) -> Dict[str, Any]:
+    """Check result for an investigation that could not reach a verdict"""
+    return {"confirmed": False, "details": details, "severity": SEVERITY_UNKNOWN}
+
+class LatencyHistogram:
+    """
+    Latency histogram with geometrically spaced buckets
+
+    Bucket i counts latencies in (bound[i-1], bound[i]] with
+    bound[i] = start * factor^i; the last bucket is unbounded. Quantiles
+    interpolate linearly inside a bucket, so they are accurate to about
+    one bucket width (25% with the default factor).
+    """
+
+    def __init__(self, start: float = 0.001, factor: float = 1.25, buckets: int = 60):
+        """
+        Initialize the histogram
+
+        Args:
+            start: Upper bound of the first bucket (seconds)
+            factor: Ratio between consecutive bucket bounds
+            buckets: Number of bounded buckets (one unbounded bucket is added)
+        """
+        self.bounds = [start * factor ** index for index in range(buckets)]
+        self.counts = [0] * (buckets + 1)
+        self._log_start = math.log(start)
+        self._log_factor = math.log(factor)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency"""
+        if seconds <= self.bounds[0]:
+            index = 0
+        else:
+            index = min(math.ceil((math.log(seconds) - self._log_start) / self._log_factor), len(self.bounds))
+            # Guard against rounding at exact bucket bounds
+            if index < len(self.bounds) and seconds > self.bounds[index]:
+                index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a latency quantile
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Latency in seconds, or None if nothing was recorded
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * max(rank - seen, 0.0) / count
+            seen += count
+        return self.bounds[-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable summary: count, mean, quantiles and the non-empty buckets"""
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 4) if value is not None else None
+
+        return {
+            "count": self.count,
+            "mean": rounded(self.total / self.count) if self.count else None,
+            "p50": rounded(self.quantile(0.5)),
+            "p95": rounded(self.quantile(0.95)),
+            "p99": rounded(self.quantile(0.99)),
+            "buckets": [
+                {"le": round(self.bounds[index], 4) if index < len(self.bounds) else None, "count": count}
+                for index, count in enumerate(self.counts) if count
+            ]
+        }
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After failure_threshold consecutive failures the circuit opens and
+    calls are refused for reset_timeout seconds. It then half-opens: one
+    trial call is let through, and its outcome closes or reopens the
+    circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the breaker
+
+        Args:
+            name: What the breaker protects (for logging)
+            failure_threshold: Consecutive failures that open the circuit (0 disables the breaker)
+            reset_timeout: Seconds the circuit stays open before a trial call
+            clock: Time source (monotonic by default)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    def allow(self) -> bool:
+        """Whether a call may proceed (claims the trial slot when half-open)"""
+        if self.state == CIRCUIT_OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+            self.state = CIRCUIT_HALF_OPEN
+            self._trial_running = False
+        if self.state == CIRCUIT_CLOSED:
+            return True
+        if self.state == CIRCUIT_HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """Give back a claimed trial slot without an outcome (the call was cancelled)"""
+        self._trial_running = False
+
+    def record_success(self) -> None:
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_running = False
+        if self.state == CIRCUIT_HALF_OPEN or (self.failure_threshold and self.failures >= self.failure_threshold):
+            if self.state != CIRCUIT_OPEN:
+                logger.warning(f"Circuit of {self.name} opened after {self.failures} consecutive failures")
+            self.state = CIRCUIT_OPEN
+            self.opened_at = self._clock()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout
+        }
+
+class CheckSpec:
+    """
+    A cognition check and how it is run
+
+    Every call gets a deadline. With hedging enabled, a second attempt
+    is started once the first has run longer than the check's recorded
+    latency quantile (hedge_quantile, once hedge_min_samples latencies
+    are known); whichever attempt answers first wins and the other is
+    cancelled. Timeouts and errors count as failures for the circuit
+    breaker; while it is open the check short-circuits to an "unknown"
+    result without running. Answer latencies (and the elapsed time of
+    timed-out calls) go into a histogram for tuning the deadlines.
+    """
+
+    def __init__(self, function: Callable[[], Union[Dict[str, Any], Awaitable[Dict[str, Any]]]],
+                 mode: str = MODE_ASYNC, timeout: Optional[float] = None,
+                 hedge: bool = False, hedge_quantile: float = 0.95, hedge_min_samples: int = 20,
+                 failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None,
+                 cache_ttl: Optional[float] = None):
+        """
+        Initialize the spec
+
+        Args:
+            function: Check returning {"confirmed", "details", "severity"}; async for
+                MODE_ASYNC, a plain function (picklable for MODE_PROCESS) otherwise
+            mode: MODE_ASYNC, MODE_THREAD or MODE_PROCESS
+            timeout: Seconds before the call is abandoned (defaults to COGNITION_CHECK_TIMEOUT)
+            hedge: Start a second attempt when the first is slower than usual; only for
+                checks that are safe to run twice
+            hedge_quantile: Latency quantile after which the hedge starts
+            hedge_min_samples: Latencies needed before hedging starts
+            failure_threshold: Consecutive failures that open the circuit
+                (defaults to COGNITION_CHECK_FAILURE_THRESHOLD)
+            reset_timeout: Seconds the circuit stays open (defaults to COGNITION_CHECK_RESET_SECONDS)
+            cache_ttl: Seconds a verdict is reused for the same scope (defaults to
+                COGNITION_CHECK_CACHE_TTL; 0 only coalesces concurrent calls)
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown check mode {mode!r} for {function.__name__}; expected one of {list(MODES)}")
+        self.function = function
+        self.name = function.__name__
+        self.mode = mode
+        self.timeout = DEFAULT_CHECK_TIMEOUT if timeout is None else timeout
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = CircuitBreaker(
+            self.name,
+            DEFAULT_FAILURE_THRESHOLD if failure_threshold is None else failure_threshold,
+            DEFAULT_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        )
+        self.cache_ttl = DEFAULT_CACHE_TTL if cache_ttl is None else cache_ttl
+        self.latency = LatencyHistogram()
+        self.stats = {"calls": 0, "answered": 0, "timeouts": 0, "errors": 0,
+                      "short_circuited": 0, "hedges": 0, "hedge_wins": 0}
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a hedged attempt starts, or None if hedging is off or not yet calibrated"""
+        if not self.hedge or self.latency.count < self.hedge_min_samples:
+            return None
+        delay = self.latency.quantile(self.hedge_quantile)
+        return delay if delay < self.timeout else None
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run the check under its deadline, hedging and circuit breaker
+
+        Returns:
+            The check result, or an "unknown" result if it timed out, failed or was short-circuited
+        """
+        self.stats["calls"] += 1
+        if not self.breaker.allow():
+            self.stats["short_circuited"] += 1
+            return unknown_result(f"Check skipped: circuit open after {self.breaker.failures} consecutive failures")
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + self.timeout
+        delay = self.hedge_delay()
+        hedge_at = None if delay is None else start + delay
+        primary = asyncio.create_task(check_executor.run(self))
+        attempts: Dict[asyncio.Task, float] = {primary: start}
+        error: Optional[BaseException] = None
+        try:
+            while attempts:
+                now = loop.time()
+                if now >= deadline:
+                    break
+                wake_at = deadline if hedge_at is None else min(deadline, hedge_at)
+                done, _ = await asyncio.wait(set(attempts), timeout=wake_at - now,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    started = attempts.pop(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    self.latency.observe(loop.time() - started)
+                    self.breaker.record_success()
+                    self.stats["answered"] += 1
+                    if task is not primary:
+                        self.stats["hedge_wins"] += 1
+                    return task.result()
+
+                if hedge_at is not None and loop.time() >= hedge_at and attempts:
+                    attempts[asyncio.create_task(check_executor.run(self))] = loop.time()
+                    self.stats["hedges"] += 1
+                    hedge_at = None
+        except asyncio.CancelledError:
+            # The investigation was called off; this is not a verdict on the check
+            self.breaker.release()
+            raise
+        finally:
+            for task in attempts:
+                task.cancel()
+            if attempts:
+                await asyncio.gather(*attempts, return_exceptions=True)
+
+        self.breaker.record_failure()
+        if error is not None:
+            self.stats["errors"] += 1
+            logger.error(f"Check {self.name} failed: {error}")
+            return unknown_result(f"Check failed: {error}")
+        self.stats["timeouts"] += 1
+        self.latency.observe(loop.time() - start)
+        logger.warning(f"Check {self.name} timed out after {self.timeout}s")
+        return unknown_result(f"Check timed out after {self.timeout}s")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable configuration, counters, circuit state and latency histogram"""
+        delay = self.hedge_delay()
+        return {
+            "check": self.name,
+            "mode": self.mode,
+            "timeout": self.timeout,
+            "hedge": self.hedge,
+            "hedge_delay": round(delay, 4) if delay is not None else None,
+            "cache_ttl": self.cache_ttl,
+            **self.stats,
+            "circuit": self.breaker.to_dict(),
+            "latency": self.latency.to_dict()
+        }
+
+def _warm_up() -> int:
+    """Trivial task that makes a pool start a worker"""
+    time.sleep(0.05)
+    return os.getpid()
+
+class CheckExecutor:
+    """
+    Thread and process pools for checks that must not run on the event loop
+
+    Async checks are awaited directly. Thread-mode checks run in a
+    bounded thread pool, process-mode checks in a bounded process pool
+    (spawned workers, so they share no locks or sockets with the server).
+    A deadline abandons a pooled call but cannot stop it; the pool size
+    caps how many abandoned calls can pile up, and the check's circuit
+    breaker stops new submissions once they keep timing out.
+    """
+
+    def __init__(self, thread_workers: int = 4, process_workers: int = 2, start_method: str = "spawn"):
+        """
+        Initialize the executor (pools are created on first use or by start())
+
+        Args:
+            thread_workers: Maximum threads for MODE_THREAD checks
+            process_workers: Maximum processes for MODE_PROCESS checks
+            start_method: multiprocessing start method of the process pool
+        """
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.start_method = start_method
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    def pool(self, mode: str) -> Executor:
+        """Get (creating if needed) the pool for a pooled mode"""
+        if mode == MODE_THREAD:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="cognition-check")
+            return self._threads
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self.process_workers,
+                                                  mp_context=multiprocessing.get_context(self.start_method))
+        return self._processes
+
+    async def run(self, spec: CheckSpec) -> Dict[str, Any]:
+        """
+        Run one attempt of a check in its execution mode
+
+        Args:
+            spec: The check
+
+        Returns:
+            The check result
+        """
+        if spec.mode == MODE_ASYNC:
+            return await spec.function()
+        return await asyncio.get_running_loop().run_in_executor(self.pool(spec.mode), spec.function)
+
+    async def start(self, modes: Iterable[str]) -> Dict[str, int]:
+        """
+        Create and warm the pools the given modes need, so the first check pays no startup cost
+
+        Args:
+            modes: Execution modes in use
+
+        Returns:
+            Workers started per pooled mode
+        """
+        loop = asyncio.get_running_loop()
+        started = {}
+        for mode in sorted(set(modes) - {MODE_ASYNC}):
+            pool = self.pool(mode)
+            workers = self.thread_workers if mode == MODE_THREAD else self.process_workers
+            # Concurrent no-op tasks make the pool bring up every worker
+            identities = await asyncio.gather(*(loop.run_in_executor(pool, _warm_up) for _ in range(workers)))
+            started[mode] = len(set(identities)) if mode == MODE_PROCESS else workers
+            logger.info(f"Warmed {mode} pool for cognition checks ({started[mode]} workers)")
+        return started
+
+    def shutdown(self) -> None:
+        """Stop the pools (abandoned calls are not waited for)"""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "thread_workers": self.thread_workers,
+            "process_workers": self.process_workers,
+            "thread_pool_started": self._threads is not None,
+            "process_pool_started": self._processes is not None
+        }
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical checks and caches their verdicts
+
+    Calls are keyed by (check, scope). A call finds either a cached
+    verdict, a run already in flight for the key (which it joins), or
+    starts the run itself. A caller that gives up (its investigation was
+    cancelled) does not cancel the shared run: the run finishes under
+    the check's own deadline and its verdict serves the next caller.
+    Only real verdicts are cached; "unknown" results are not.
+    """
+
+    def __init__(self, cache: TTLCache):
+        """
+        Initialize the layer
+
+        Args:
+            cache: Verdict cache (entries carry their check's TTL)
+        """
+        self.cache = cache
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {"runs": 0, "coalesced": 0}
+
+    async def run(self, key: Hashable, spec: CheckSpec) -> Dict[str, Any]:
+        """
+        Get the verdict of a check for a key
+
+        Args:
+            key: (cause, scope) identifying whose diagnostics are wanted
+            spec: The check to run on a miss
+
+        Returns:
+            A copy of the check result
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(spec.run())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done, spec.cache_ttl))
+            self.stats["runs"] += 1
+        else:
+            self.stats["coalesced"] += 1
+        return dict(await asyncio.shield(task))
+
+    def _finish(self, key: Hashable, task: asyncio.Task, ttl: float) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if ttl > 0 and result.get("severity") != SEVERITY_UNKNOWN:
+            self.cache.set(key, result, ttl)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable coalescing counters and cache statistics"""
+        return {**self.stats, "in_flight": len(self._in_flight), "cache": self.cache.stats()}
+
+# Global pools for thread- and process-mode checks
+check_executor = CheckExecutor(
+    thread_workers=int(os.getenv("COGNITION_THREAD_WORKERS", "4")),
+    process_workers=int(os.getenv("COGNITION_PROCESS_WORKERS", "2"))
+)
@@ -4,9 +4,16 @@ Parallel diagnostic functions for root cause investigation
 """
 
 import asyncio
+import functools
+import os
 import random
 import logging
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
+
+from services.check_runtime import MODE_PROCESS, CheckSpec, SingleFlight
+from services.metric_store import DEFAULT_ENTITY
+from services.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -216,11 +223,12 @@ async def check_disk_space() -> Dict[str, Any]:
         "severity": "low"
     }
 
-async def check_log_overflow() -> Dict[str, Any]:
+def check_log_overflow() -> Dict[str, Any]:
     """
     Investigate log file overflow issues
+    Runs in the process pool: scanning logs for repeated patterns is CPU-bound
     """
-    await asyncio.sleep(random.uniform(0.5, 2.0))
+    time.sleep(random.uniform(0.5, 2.0))  # Simulate log scanning
     
     if random.random() > 0.5:  # 50% chance of log issues
         return {
@@ -234,30 +242,53 @@ async def check_log_overflow() -> Dict[str, Any]:
         "severity": "low"
     }
 
-# Mapping of cause names to check functions
+# How each cause is checked. Database-backed checks are not hedged: a duplicate
+# diagnostic query adds load to the database under investigation. CPU-bound checks
+# run in the process pool so they cannot stall the event loop.
 CAUSE_CHECK_MAPPING = {
-    "database_load": check_database_load,
-    "inefficient_query": check_inefficient_query,
-    "connection_pool_exhaustion": check_connection_pool_exhaustion,
-    "network_issue": check_network_issue,
-    "ddos_attack": check_ddos_attack,
-    "high_traffic": check_high_traffic,
-    "memory_leak": check_memory_leak,
-    "resource_exhaustion": check_resource_exhaustion,
-    "cache_miss": check_cache_miss,
-    "application_bug": check_application_bug,
-    "disk_space": check_disk_space,
-    "log_overflow": check_log_overflow,
+    "database_load": CheckSpec(check_database_load),
+    "inefficient_query": CheckSpec(check_inefficient_query),
+    "connection_pool_exhaustion": CheckSpec(check_connection_pool_exhaustion),
+    "network_issue": CheckSpec(check_network_issue, hedge=True),
+    "ddos_attack": CheckSpec(check_ddos_attack, hedge=True),
+    "high_traffic": CheckSpec(check_high_traffic, hedge=True),
+    "memory_leak": CheckSpec(check_memory_leak, hedge=True),
+    "resource_exhaustion": CheckSpec(check_resource_exhaustion, hedge=True),
+    "cache_miss": CheckSpec(check_cache_miss, hedge=True),
+    "application_bug": CheckSpec(check_application_bug, hedge=True),
+    "disk_space": CheckSpec(check_disk_space, hedge=True),
+    "log_overflow": CheckSpec(check_log_overflow, mode=MODE_PROCESS),
 }
 
-def get_check_function(cause_name: str):
+def get_check_spec(cause_name: str) -> Optional[CheckSpec]:
     """
-    Get the appropriate check function for a given cause name
+    Get the check spec for a given cause name
     
     Args:
         cause_name: The name of the potential root cause
         
     Returns:
-        The async check function or None if not found
+        The CheckSpec or None if not found
     """
     return CAUSE_CHECK_MAPPING.get(cause_name)
+
+# Verdicts shared by concurrent and closely repeated investigations of the same scope
+check_flight = SingleFlight(TTLCache(maxsize=int(os.getenv("COGNITION_CHECK_CACHE_SIZE", "1024"))))
+
+def get_check_function(cause_name: str, scope: str = DEFAULT_ENTITY):
+    """
+    Get the appropriate check function for a given cause name
+    
+    Args:
+        cause_name: The name of the potential root cause
+        scope: Entity (host/service) the investigation is about; calls for the same
+            cause and scope share one run and its cached verdict
+        
+    Returns:
+        An async function running the check under its deadline, hedging and circuit
+        breaker, or None if not found
+    """
+    spec = get_check_spec(cause_name)
+    if spec is None:
+        return None
+    return functools.partial(check_flight.run, (cause_name, scope), spec)
@@ -5,13 +5,20 @@ Parallel analysis engine for definitive root cause investigation
 
 import asyncio
 import logging
+import os
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 from services.cognition_agents import get_check_function
+from services.metric_store import DEFAULT_ENTITY
 
 logger = logging.getLogger(__name__)
 
+# Why an investigation stopped
+STOP_COMPLETE = "complete"
+STOP_CONFIRMED = "confirmed"
+STOP_BUDGET = "budget"
+
 class CognitionResult:
     """Result of a single cognition agent investigation"""
     def __init__(self, cause: str, confirmed: bool, details: str, severity: str, duration: float):
@@ -31,6 +38,9 @@ class CognitionAnalysis:
         self.confidence: float = 0.0
         self.total_duration: float = 0.0
         self.timestamp = datetime.now()
+        self.stop_reason: Optional[str] = None
+        self.cancelled_causes: List[str] = []  # Running when the investigation stopped
+        self.skipped_causes: List[str] = []    # Never launched
 
     def add_result(self, result: CognitionResult):
         """Add a cognition result"""
@@ -38,13 +48,20 @@ class CognitionAnalysis:
         if result.confirmed:
             self.confirmed_causes.append(result)
 
-    def finalize(self):
-        """Finalize the analysis and determine primary cause"""
+    def finalize(self, elapsed: Optional[float] = None):
+        """
+        Finalize the analysis and determine primary cause
+
+        Args:
+            elapsed: Wall-clock duration of the investigation (defaults to the slowest check)
+        """
         if not self.results:
+            if elapsed is not None:
+                self.total_duration = elapsed
             return
 
         # Calculate total duration
-        self.total_duration = max(result.duration for result in self.results)
+        self.total_duration = max(result.duration for result in self.results) if elapsed is None else elapsed
 
         # Determine primary cause (highest severity among confirmed causes)
         if self.confirmed_causes:
@@ -63,81 +80,155 @@ class CognitionAnalysis:
             self.confidence = 1.0 - (confirmed_count / total_causes) * 0.5
             self.confidence = max(0.0, min(1.0, self.confidence))
 
-async def run_parallel_analysis(probabilities: Dict[str, float]) -> CognitionAnalysis:
+class InvestigationScheduler:
+    """
+    Runs cognition checks in probability order under a concurrency limit and a latency budget
+
+    The most probable causes are launched first, at most max_concurrency at
+    a time; a freed slot goes to the next most probable cause. The run
+    stops as soon as one of these holds, cancelling whatever is still
+    running:
+
+        complete   every candidate cause was checked
+        confirmed  a confirmed cause is more probable than every unchecked
+                   or still running cause by at least stop_margin
+        budget     the latency budget is spent
+
+    Checks that were cancelled or never launched are listed on the
+    analysis, which is finalized from the completed checks only, so a
+    partial analysis has the same shape as a complete one.
+    """
+
+    def __init__(self, max_concurrency: int = 4, budget: float = 3.0, stop_margin: float = 0.15,
+                 min_probability: float = 0.1):
+        """
+        Initialize the scheduler
+
+        Args:
+            max_concurrency: Checks running at the same time
+            budget: Seconds after which running checks are cancelled
+            stop_margin: Probability lead a confirmed cause needs over every unresolved cause
+                to stop early (above 1 disables early stopping)
+            min_probability: Causes at or below this probability are not investigated
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.budget = budget
+        self.stop_margin = stop_margin
+        self.min_probability = min_probability
+
+    def _candidates(self, probabilities: Dict[str, float], scope: str) -> List[Tuple[str, float, Any]]:
+        """(cause, probability, check function) worth investigating, most probable first"""
+        candidates = []
+        for cause_name, probability in sorted(probabilities.items(), key=lambda item: item[1], reverse=True):
+            check_function = get_check_function(cause_name, scope)
+            if not check_function:
+                logger.warning(f"No check function found for cause: {cause_name}")
+            elif probability > self.min_probability:
+                candidates.append((cause_name, probability, check_function))
+        return candidates
+
+    def _settled(self, analysis: CognitionAnalysis, probabilities: Dict[str, float],
+                 unresolved: List[float]) -> bool:
+        """Whether a confirmed cause leads every unresolved cause by the stop margin"""
+        if not analysis.confirmed_causes:
+            return False
+        best = max(probabilities[result.cause] for result in analysis.confirmed_causes)
+        return best - max(unresolved, default=0.0) >= self.stop_margin
+
+    async def run(self, probabilities: Dict[str, float], scope: str = DEFAULT_ENTITY) -> CognitionAnalysis:
+        """
+        Investigate root causes until the evidence is settled or the budget is spent
+
+        Args:
+            probabilities: Dictionary of cause names and their probabilities
+            scope: Entity (host/service) under investigation
+
+        Returns:
+            CognitionAnalysis with the completed investigations
+        """
+        analysis = CognitionAnalysis()
+        if not probabilities:
+            logger.warning("No probabilities provided for cognition analysis")
+            return analysis
+
+        candidates = self._candidates(probabilities, scope)
+        if not candidates:
+            logger.warning("No valid tasks created for cognition analysis")
+            return analysis
+
+        logger.info(f"Starting cognition analysis for {len(candidates)} potential causes "
+                   f"(concurrency {self.max_concurrency}, budget {self.budget}s)")
+
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        deadline = start_time + self.budget
+        running: Dict[asyncio.Task, Tuple[str, float]] = {}
+        launched = 0
+        stop_reason = STOP_COMPLETE
+
+        try:
+            while True:
+                # Fill free slots with the most probable causes not yet launched
+                while launched < len(candidates) and len(running) < self.max_concurrency:
+                    cause_name, probability, check_function = candidates[launched]
+                    running[asyncio.create_task(investigate_cause(cause_name, check_function))] = (cause_name, probability)
+                    launched += 1
+                if not running:
+                    break
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    stop_reason = STOP_BUDGET
+                    break
+                done, _ = await asyncio.wait(set(running), timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+
+                # Record completed checks, most probable first
+                for task in sorted(done, key=lambda task: running[task][1], reverse=True):
+                    running.pop(task)
+                    analysis.add_result(task.result())
+
+                unresolved = [probability for _, probability in running.values()]
+                unresolved += [probability for _, probability, _ in candidates[launched:]]
+                if unresolved and self._settled(analysis, probabilities, unresolved):
+                    stop_reason = STOP_CONFIRMED
+                    break
+        finally:
+            # Cancel whatever is still running and wait for the cancellations to land
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        analysis.stop_reason = stop_reason
+        analysis.cancelled_causes = [cause_name for cause_name, _ in running.values()]
+        analysis.skipped_causes = [cause_name for cause_name, _, _ in candidates[launched:]]
+        analysis.finalize(elapsed=loop.time() - start_time)
+
+        logger.info(f"Cognition analysis {stop_reason} in {analysis.total_duration:.2f}s: "
+                   f"{len(analysis.results)} checked, {len(analysis.cancelled_causes)} cancelled, "
+                   f"{len(analysis.skipped_causes)} skipped. Confirmed {len(analysis.confirmed_causes)} causes. "
+                   f"Primary cause: {analysis.primary_cause.cause if analysis.primary_cause else 'None'}")
+        return analysis
+
+async def run_parallel_analysis(probabilities: Dict[str, float], scope: str = DEFAULT_ENTITY) -> CognitionAnalysis:
     """
-    Run parallel analysis on all potential root causes
+    Investigate potential root causes with the global investigation scheduler
     
     Args:
         probabilities: Dictionary of cause names and their probabilities
+        scope: Entity (host/service) under investigation; checks for the same scope
+            share in-flight runs and recent verdicts
         
     Returns:
-        CognitionAnalysis object with investigation results
+        CognitionAnalysis object with investigation results (partial if stopped early)
     """
-    if not probabilities:
-        logger.warning("No probabilities provided for cognition analysis")
-        return CognitionAnalysis()
-
-    logger.info(f"Starting parallel cognition analysis for {len(probabilities)} potential causes")
-    
-    analysis = CognitionAnalysis()
-    
-    # Create tasks for each potential cause
-    tasks = []
-    cause_names = []
-    
-    for cause_name, probability in probabilities.items():
-        check_function = get_check_function(cause_name)
-        if check_function:
-            # Only investigate causes with probability > 0.1 (10%)
-            if probability > 0.1:
-                task = asyncio.create_task(
-                    investigate_cause(cause_name, check_function)
-                )
-                tasks.append(task)
-                cause_names.append(cause_name)
-        else:
-            logger.warning(f"No check function found for cause: {cause_name}")
-
-    if not tasks:
-        logger.warning("No valid tasks created for cognition analysis")
-        return analysis
-
-    # Run all investigations concurrently
     try:
-        start_time = asyncio.get_event_loop().time()
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        end_time = asyncio.get_event_loop().time()
-        
-        # Process results
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Error in cognition analysis for {cause_names[i]}: {result}")
-                # Create a failed result
-                failed_result = CognitionResult(
-                    cause=cause_names[i],
-                    confirmed=False,
-                    details=f"Investigation failed: {str(result)}",
-                    severity="low",
-                    duration=end_time - start_time
-                )
-                analysis.add_result(failed_result)
-            else:
-                analysis.add_result(result)
-
-        # Finalize analysis
-        analysis.finalize()
-        
-        logger.info(f"Cognition analysis completed in {analysis.total_duration:.2f}s. "
-                   f"Confirmed {len(analysis.confirmed_causes)} causes. "
-                   f"Primary cause: {analysis.primary_cause.cause if analysis.primary_cause else 'None'}")
-        
+        return await investigation_scheduler.run(probabilities, scope)
     except Exception as e:
         logger.error(f"Error in parallel cognition analysis: {e}")
         # Return empty analysis on error
         return CognitionAnalysis()
 
-    return analysis
-
 async def investigate_cause(cause_name: str, check_function) -> CognitionResult:
     """
     Investigate a single potential cause
@@ -211,5 +302,17 @@ def get_cognition_summary(analysis: CognitionAnalysis) -> Dict[str, Any]:
         ],
         "investigation_confidence": analysis.confidence,
         "total_investigation_time": analysis.total_duration,
-        "investigation_timestamp": analysis.timestamp.isoformat()
+        "investigation_timestamp": analysis.timestamp.isoformat(),
+        "investigation_stop_reason": analysis.stop_reason,
+        "investigated_causes": [result.cause for result in analysis.results],
+        "cancelled_causes": analysis.cancelled_causes,
+        "skipped_causes": analysis.skipped_causes
     }
+
+# Global investigation scheduler
+investigation_scheduler = InvestigationScheduler(
+    max_concurrency=int(os.getenv("COGNITION_MAX_CONCURRENCY", "4")),
+    budget=float(os.getenv("COGNITION_BUDGET_SECONDS", "3.0")),
+    stop_margin=float(os.getenv("COGNITION_STOP_MARGIN", "0.15")),
+    min_probability=float(os.getenv("COGNITION_MIN_PROBABILITY", "0.1"))
+)
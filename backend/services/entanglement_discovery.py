@@ -0,0 +1,280 @@
+"""
+Entanglement Discovery Service
+Learns causal graph edges from metric history with FFT lagged cross-correlation
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.causal_graph import CausalEdge, CausalGraph
+from services.metric_store import DEFAULT_ENTITY, MetricStore
+
+logger = logging.getLogger(__name__)
+
+# Published versions kept for the status API
+HISTORY_SIZE = 10
+
+EdgeKey = Tuple[str, str]
+
+def _align(series: Dict[str, Tuple[np.ndarray, np.ndarray]], window: int) -> Tuple[List[str], np.ndarray, float]:
+    """
+    Resample series onto one uniform time grid covering their common span
+
+    Args:
+        series: metric -> (timestamps, values), oldest first
+        window: Maximum number of grid points
+
+    Returns:
+        (metric names, metrics x samples matrix, grid step in seconds)
+    """
+    names = [name for name, (timestamps, _) in series.items() if len(timestamps) >= 2]
+    if len(names) < 2:
+        return [], np.empty((0, 0)), 0.0
+
+    start = max(series[name][0][0] for name in names)
+    end = min(series[name][0][-1] for name in names)
+    points = min(window, min(len(series[name][0]) for name in names))
+    if end <= start or points < 2:
+        return [], np.empty((0, 0)), 0.0
+
+    grid = np.linspace(start, end, points)
+    matrix = np.vstack([np.interp(grid, *series[name]) for name in names])
+    return names, matrix, float(end - start) / (points - 1)
+
+def _granger_f(cause: np.ndarray, effect: np.ndarray, lag: int, order: int) -> float:
+    """
+    Granger-style F statistic: does cause (shifted by lag) improve an AR(order) model of effect?
+
+    Returns:
+        F statistic of the restricted vs unrestricted least-squares fits (0 if too few samples)
+    """
+    start = max(order, lag + order - 1)
+    rows = len(effect) - start
+    if rows <= 2 * order + 1:
+        return 0.0
+
+    target = effect[start:]
+    own = np.column_stack([effect[start - k:len(effect) - k] for k in range(1, order + 1)])
+    other = np.column_stack([cause[start - lag - k:len(cause) - lag - k] for k in range(order)])
+    ones = np.ones((rows, 1))
+
+    restricted = np.hstack([ones, own])
+    unrestricted = np.hstack([restricted, other])
+    rss_restricted = np.sum((target - restricted @ np.linalg.lstsq(restricted, target, rcond=None)[0]) ** 2)
+    rss_unrestricted = np.sum((target - unrestricted @ np.linalg.lstsq(unrestricted, target, rcond=None)[0]) ** 2)
+
+    degrees = rows - unrestricted.shape[1]
+    if rss_unrestricted <= 0.0 or degrees <= 0:
+        return 0.0
+    return float(((rss_restricted - rss_unrestricted) / order) / (rss_unrestricted / degrees))
+
+class EntanglementDiscovery:
+    """
+    Learns entanglement edges from stored metric history
+
+    Each run takes the latest sliding window of every metric, computes
+    lagged cross-correlations for a pruned set of candidate pairs with one
+    FFT per metric, optionally confirms the lead/lag direction with a
+    Granger-style test, blends the result into the previously learned
+    weights and publishes a new CausalGraph version.
+
+    Pruning keeps the cost sub-quadratic: amplitude spectra do not depend
+    on lag, so each metric's centered amplitude spectrum is compressed with
+    a random projection and only the top-k most similar metrics per metric
+    are cross-correlated in full.
+    """
+
+    def __init__(self, window: int = 720, max_lag: int = 12, min_correlation: float = 0.6,
+                 candidates_per_metric: int = 8, sketch_dims: int = 64, smoothing: float = 0.3,
+                 max_edges_per_metric: int = 5, granger_order: int = 0, granger_min_f: float = 4.0,
+                 min_samples: int = 60, seed: int = 7):
+        """
+        Initialize discovery
+
+        Args:
+            window: Samples per metric used for each run
+            max_lag: Largest lead/lag considered, in samples
+            min_correlation: Minimum absolute peak correlation for an edge
+            candidates_per_metric: Top-k candidate partners kept per metric after sketching
+            sketch_dims: Random projection size for candidate pruning
+            smoothing: Weight of the newest run when blending into learned weights
+            max_edges_per_metric: Strongest outgoing edges kept per metric
+            granger_order: AR order of the Granger test (0 disables it)
+            granger_min_f: Minimum Granger F statistic for a directed edge
+            min_samples: Minimum aligned samples required to run
+            seed: Seed for the random projection
+        """
+        self.window = window
+        self.max_lag = max_lag
+        self.min_correlation = min_correlation
+        self.candidates_per_metric = candidates_per_metric
+        self.sketch_dims = sketch_dims
+        self.smoothing = smoothing
+        self.max_edges_per_metric = max_edges_per_metric
+        self.granger_order = granger_order
+        self.granger_min_f = granger_min_f
+        self.min_samples = min_samples
+        self._rng = np.random.default_rng(seed)
+
+        self.version = 0
+        self.graph: Optional[CausalGraph] = None
+        self.published_at: Optional[float] = None
+        self.last_run: Dict[str, Any] = {}
+        self.history: deque = deque(maxlen=HISTORY_SIZE)
+        self._weights: Dict[EdgeKey, Tuple[float, float]] = {}  # (source, target) -> (weight, lag seconds)
+
+    def _candidate_pairs(self, spectra: np.ndarray) -> np.ndarray:
+        """
+        Select candidate (i, j) pairs with i < j by sketched amplitude-spectrum similarity
+
+        Returns:
+            Array of shape (pairs, 2)
+        """
+        count = len(spectra)
+        if count <= self.candidates_per_metric + 1:
+            return np.array([(i, j) for i in range(count) for j in range(i + 1, count)], dtype=np.intp).reshape(-1, 2)
+
+        amplitudes = np.abs(spectra)
+        amplitudes -= amplitudes.mean(axis=1, keepdims=True)
+        projection = self._rng.standard_normal((amplitudes.shape[1], self.sketch_dims))
+        sketch = amplitudes @ projection
+        sketch /= np.linalg.norm(sketch, axis=1, keepdims=True) + 1e-12
+        similarity = sketch @ sketch.T
+        np.fill_diagonal(similarity, -np.inf)
+
+        top = np.argpartition(-similarity, self.candidates_per_metric, axis=1)[:, :self.candidates_per_metric]
+        rows = np.repeat(np.arange(count), self.candidates_per_metric)
+        pairs = np.sort(np.column_stack([rows, top.ravel()]), axis=1)
+        return np.unique(pairs, axis=0)
+
+    def discover(self, series: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Dict[str, Any]:
+        """
+        Run one discovery pass and publish a new graph version
+
+        Args:
+            series: metric -> (timestamps, values), oldest first
+
+        Returns:
+            Summary of the run
+        """
+        start = time.perf_counter()
+        names, matrix, step = _align(series, self.window)
+        if matrix.shape[1] < self.min_samples:
+            self.last_run = {"status": "insufficient_data", "samples": int(matrix.shape[1]), "metrics": len(names)}
+            return self.last_run
+
+        # Standardize; constant series carry no correlation signal
+        deviation = matrix.std(axis=1)
+        keep = deviation > 0
+        names = [name for name, kept in zip(names, keep) if kept]
+        matrix = (matrix[keep] - matrix[keep].mean(axis=1, keepdims=True)) / deviation[keep][:, None]
+        samples = matrix.shape[1]
+
+        # One FFT per metric, zero-padded so the correlation is linear rather than circular
+        size = 1 << int(np.ceil(np.log2(2 * samples)))
+        spectra = np.fft.rfft(matrix, size, axis=1)
+        pairs = self._candidate_pairs(spectra)
+
+        learned: Dict[EdgeKey, Tuple[float, float]] = {}
+        if len(pairs):
+            # correlation[p, k] = sum_t x_i[t + k] * x_j[t] / samples
+            correlation = np.fft.irfft(spectra[pairs[:, 0]] * np.conj(spectra[pairs[:, 1]]), size, axis=1) / samples
+            max_lag = min(self.max_lag, samples - 1)
+            lagged = np.concatenate([correlation[:, size - max_lag:], correlation[:, :max_lag + 1]], axis=1)
+            peaks = np.abs(lagged).argmax(axis=1)
+            strengths = np.abs(lagged[np.arange(len(pairs)), peaks])
+            shifts = peaks - max_lag  # Negative: i leads j
+
+            for (i, j), strength, shift in zip(pairs.tolist(), strengths.tolist(), shifts.tolist()):
+                if strength < self.min_correlation:
+                    continue
+                if shift == 0:
+                    # No lead/lag to orient the edge; without a Granger test keep both directions
+                    if not self.granger_order:
+                        learned[(names[i], names[j])] = (strength, 0.0)
+                        learned[(names[j], names[i])] = (strength, 0.0)
+                    continue
+                source, target, lag = (i, j, -shift) if shift < 0 else (j, i, shift)
+                if self.granger_order and _granger_f(matrix[source], matrix[target], lag, self.granger_order) < self.granger_min_f:
+                    continue
+                learned[(names[source], names[target])] = (strength, float(lag * step))
+
+        candidate_count = len(pairs)
+        self._blend(learned)
+        self._publish()
+
+        self.last_run = {
+            "status": "published",
+            "version": self.version,
+            "metrics": len(names),
+            "samples": samples,
+            "candidate_pairs": candidate_count,
+            "all_pairs": len(names) * (len(names) - 1) // 2,
+            "edges_found": len(learned),
+            "edges_published": len(self._weights),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+        return self.last_run
+
+    def _blend(self, learned: Dict[EdgeKey, Tuple[float, float]]) -> None:
+        """Blend this run's edges into the learned weights (sliding-window smoothing)"""
+        blended: Dict[EdgeKey, Tuple[float, float]] = {}
+        for key in set(self._weights) | set(learned):
+            old = self._weights.get(key)
+            new = learned.get(key)
+            if old is None:
+                blended[key] = new
+            elif new is None:
+                blended[key] = ((1.0 - self.smoothing) * old[0], old[1])
+            else:
+                blended[key] = ((1.0 - self.smoothing) * old[0] + self.smoothing * new[0], new[1])
+
+        # Drop faded edges and keep the strongest few per source
+        by_source: Dict[str, List[Tuple[float, EdgeKey]]] = {}
+        for key, (weight, _) in blended.items():
+            if weight >= self.min_correlation / 2:
+                by_source.setdefault(key[0], []).append((weight, key))
+        self._weights = {
+            key: blended[key]
+            for edges in by_source.values()
+            for _, key in sorted(edges, key=lambda item: (-item[0], item[1]))[:self.max_edges_per_metric]
+        }
+
+    def _publish(self) -> None:
+        """Publish the learned weights as a new graph version"""
+        edges = [CausalEdge(source, target, min(weight, 1.0), lag)
+                 for (source, target), (weight, lag) in sorted(self._weights.items())]
+        self.graph = CausalGraph(edges)
+        self.version += 1
+        self.published_at = time.time()
+        self.history.append({"version": self.version, "published_at": self.published_at, "edges": len(edges)})
+        logger.info(f"Published learned entanglement map v{self.version} ({len(edges)} edges)")
+
+    def discover_from_store(self, store: MetricStore, entity: str = DEFAULT_ENTITY) -> Dict[str, Any]:
+        """
+        Run discovery over the latest window of every metric of an entity
+
+        Args:
+            store: The metric store
+            entity: The entity whose history is analyzed
+
+        Returns:
+            Summary of the run
+        """
+        series = {metric: store.window(metric, size=self.window, entity=entity)
+                  for metric in store.metric_names(entity)}
+        return self.discover(series)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable state of the latest published version"""
+        return {
+            "version": self.version,
+            "published_at": self.published_at,
+            "graph": self.graph.to_dict() if self.graph else None,
+            "last_run": self.last_run,
+            "history": list(self.history)
+        }
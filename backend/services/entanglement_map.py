@@ -5,7 +5,13 @@ Defines causal relationships between system metrics for anomaly detection
 
 from typing import List, Dict, Optional
 
-# Entanglement configuration mapping primary metrics to their causally-linked partners
+from services.anomaly_ranking import AnomalyRanker
+from services.causal_graph import CausalGraph
+from services.threshold_engine import LEVEL_NAMES
+from services.analysis_config import ConfigSnapshot, analysis_config
+
+# Entanglement configuration mapping primary metrics to their causally-linked partners.
+# A partner is a metric name (default weight, no lag) or {"metric", "weight", "lag"}.
 ENTANGLEMENT_CONFIG: Dict[str, List[str]] = {
     # CPU usage anomalies are linked to user activity and API performance
     "cpu_usage": ["active_users", "api_latency_p99", "request_rate"],
@@ -38,6 +44,9 @@ ENTANGLEMENT_CONFIG: Dict[str, List[str]] = {
     "request_rate": ["cpu_usage", "memory_usage", "database_connections"]
 }
 
+# Built-in configuration below; the active (possibly reloaded) version is compiled by
+# services.analysis_config into a ThresholdEngine and a CausalGraph with k-hop closures.
+
 # Thresholds for anomaly detection
 ANOMALY_THRESHOLDS: Dict[str, Dict[str, float]] = {
     "cpu_usage": {"critical": 90.0, "warning": 75.0},
@@ -52,6 +61,21 @@ ANOMALY_THRESHOLDS: Dict[str, Dict[str, float]] = {
     "request_rate": {"critical": 1000.0, "warning": 800.0}  # requests/second
 }
 
+# Direction in which each metric becomes anomalous (above unless listed here);
+# band metrics take [low, high] pairs as their warning/critical thresholds
+THRESHOLD_DIRECTIONS: Dict[str, str] = {
+    "cache_hit_rate": "below"
+}
+
+def get_causal_graph() -> CausalGraph:
+    """
+    Get the causal graph currently used for analysis
+    
+    Returns:
+        The active causal graph (configured edges plus any applied learned edges)
+    """
+    return analysis_config.snapshot.causal_graph
+
 def get_entangled_metrics(primary_metric: str) -> List[str]:
     """
     Get the list of metrics that are causally linked to the primary metric.
@@ -62,62 +86,70 @@ def get_entangled_metrics(primary_metric: str) -> List[str]:
     Returns:
         List of metric keys that are entangled with the primary metric
     """
-    return ENTANGLEMENT_CONFIG.get(primary_metric, [])
+    return analysis_config.snapshot.causal_graph.neighbours(primary_metric)
 
-def detect_anomaly(metric_name: str, metric_value: float) -> Optional[str]:
+def detect_anomaly(metric_name: str, metric_value: float, config: Optional[ConfigSnapshot] = None) -> Optional[str]:
     """
     Detect if a metric value indicates an anomaly.
     
     Args:
         metric_name: The name of the metric
         metric_value: The current value of the metric
+        config: Configuration snapshot to evaluate against (defaults to the active one)
         
     Returns:
         'critical' if critical threshold exceeded, 'warning' if warning threshold exceeded, None if normal
+        (exceeded in the metric's direction, e.g. below the threshold for cache_hit_rate)
     """
-    thresholds = ANOMALY_THRESHOLDS.get(metric_name)
-    if not thresholds:
-        return None
-    
-    if metric_value >= thresholds["critical"]:
-        return "critical"
-    elif metric_value >= thresholds["warning"]:
-        return "warning"
-    
-    return None
+    config = config or analysis_config.snapshot
+    return LEVEL_NAMES.get(config.threshold_engine.level(metric_name, metric_value))
 
-def get_entanglement_analysis(metrics: Dict[str, float]) -> Dict[str, any]:
+def get_entanglement_analysis(metrics: Dict[str, float], config: Optional[ConfigSnapshot] = None,
+                              top_k: int = 5) -> Dict[str, any]:
     """
     Analyze metrics for anomalies and return entanglement information.
     
     Args:
         metrics: Dictionary of metric names to their current values
+        config: Configuration snapshot to analyze with (defaults to the active one)
+        top_k: Number of anomalies returned in the severity ranking
         
     Returns:
-        Dictionary containing anomaly detection results and entangled metrics
+        Dictionary containing anomaly detection results, the top-k anomalies by
+        severity (the first being the primary anomaly), directly entangled metrics
+        and the ranked multi-hop blast radius of the anomalies
     """
+    config = config or analysis_config.snapshot
+    causal_graph = config.causal_graph
     anomalies = {}
     entangled_metrics = set()
     
     # Check each metric for anomalies
     for metric_name, metric_value in metrics.items():
-        anomaly_level = detect_anomaly(metric_name, metric_value)
+        anomaly_level = detect_anomaly(metric_name, metric_value, config)
         if anomaly_level:
             anomalies[metric_name] = {
                 "level": anomaly_level,
                 "value": metric_value,
-                "threshold": ANOMALY_THRESHOLDS[metric_name][anomaly_level]
+                "threshold": config.thresholds[metric_name][anomaly_level]
             }
             
             # Get entangled metrics for this anomaly
-            entangled = get_entangled_metrics(metric_name)
+            entangled = causal_graph.neighbours(metric_name)
             entangled_metrics.update(entangled)
     
+    ranked_anomalies = anomaly_ranker.rank(anomalies, config, limit=top_k)
+    primary = ranked_anomalies[0] if ranked_anomalies else None
+    
     return {
         "anomalies": anomalies,
+        "ranked_anomalies": ranked_anomalies,
         "entangled_metrics": list(entangled_metrics),
+        "blast_radius": causal_graph.blast_radius(anomalies),
         "has_anomalies": len(anomalies) > 0,
-        "primary_anomaly": max(anomalies.keys()) if anomalies else None
+        "primary_anomaly": primary["metric"] if primary else None,
+        "primary_anomaly_level": primary["level"] if primary else None,
+        "config_version": config.version
     }
 
 def get_metric_importance(metric_name: str) -> str:
@@ -139,3 +171,6 @@ def get_metric_importance(metric_name: str) -> str:
         return "secondary"
     else:
         return "tertiary"
+
+# Global anomaly ranker instance
+anomaly_ranker = AnomalyRanker(get_metric_importance)
@@ -0,0 +1,154 @@
+"""
+Fleet Analyzer Service
+Evaluates anomalies and root causes for many labelled entities in one pass
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from services.analysis_config import ConfigSnapshot, analysis_config
+from services.metric_store import DEFAULT_ENTITY, MetricStore
+from services.optimization_model import find_optimal_solution
+from services.probabilistic_analyzer import analyze_root_cause_matrix
+from services.threshold_engine import LEVEL_CRITICAL, LEVEL_NAMES
+
+logger = logging.getLogger(__name__)
+
+# Label dimensions the fleet roll-up groups by
+ROLLUP_LABELS = ("service", "region")
+
+def analyze_fleet(entity_ids: List[str], matrix: np.ndarray, metrics: List[str],
+                  labels: Optional[Dict[str, Dict[str, str]]] = None,
+                  config: Optional[ConfigSnapshot] = None) -> Dict[str, Any]:
+    """
+    Analyze a whole fleet of entities for one tick
+
+    Threshold checks and primary anomaly selection run as vectorized
+    operations over the full matrix; root cause inference runs as one batch
+    over the entities that have anomalies, and optimal solutions are
+    computed once per distinct root cause.
+
+    Args:
+        entity_ids: Entity ids for the matrix rows
+        matrix: entities x metrics matrix of latest values (NaN for missing)
+        metrics: Metric names for the matrix columns
+        labels: Optional entity id -> labels mapping used for the roll-up
+        config: Configuration snapshot to analyze with (defaults to the active one)
+
+    Returns:
+        Dictionary with per-entity results and service/region roll-ups
+    """
+    start = time.perf_counter()
+    config = config or analysis_config.snapshot
+    threshold_engine = config.threshold_engine
+    causal_graph = config.causal_graph
+    labels = labels or {}
+    levels = threshold_engine.evaluate(matrix, metrics)
+
+    # Primary anomaly per entity: highest level, then largest exceedance past warning
+    score = levels * 1e6 + np.where(levels > 0, threshold_engine.exceedance(matrix, metrics), 0.0)
+    primary_columns = score.argmax(axis=1).tolist()
+    worst = levels.max(axis=1, initial=0).tolist()
+
+    # Root causes for all anomalous entities in one batched rule evaluation
+    anomalous_rows = [row for row, level in enumerate(worst) if level]
+    root_cause_rows = iter(analyze_root_cause_matrix(matrix[anomalous_rows], metrics, config))
+    
+    # Per-entity work below uses plain lists; indexing NumPy scalars row by row is far slower
+    rows = matrix.tolist()
+    level_rows = levels.tolist()
+
+    entities: Dict[str, Any] = {}
+    solutions: Dict[str, Optional[Dict]] = {}
+    cause_totals: Dict[str, float] = {}
+    anomalous_count = 0
+
+    for row, entity in enumerate(entity_ids):
+        if not worst[row]:
+            continue
+        anomalous_count += 1
+        values = rows[row]
+        row_levels = level_rows[row]
+        primary = metrics[primary_columns[row]]
+
+        root_causes = next(root_cause_rows)
+        top_cause = next(iter(root_causes), None)
+        if top_cause is not None and top_cause not in solutions:
+            solutions[top_cause] = find_optimal_solution(top_cause, config)
+        for cause, probability in root_causes.items():
+            cause_totals[cause] = cause_totals.get(cause, 0.0) + probability
+
+        entities[entity] = {
+            "labels": labels.get(entity, {}),
+            "anomalies": {
+                metric: {"level": LEVEL_NAMES[level], "value": value}
+                for metric, level, value in zip(metrics, row_levels, values) if level
+            },
+            "primary_anomaly": primary,
+            "primary_anomaly_level": LEVEL_NAMES[row_levels[primary_columns[row]]],
+            "entangled_metrics": causal_graph.neighbours(primary),
+            "root_causes": root_causes,
+            "top_cause": top_cause,
+            "optimal_action": solutions[top_cause]["action"] if top_cause and solutions[top_cause] else None
+        }
+
+    rollup = {dimension: _rollup(entity_ids, worst, labels, dimension) for dimension in ROLLUP_LABELS}
+
+    return {
+        "entity_count": len(entity_ids),
+        "anomalous_count": anomalous_count,
+        "critical_count": worst.count(LEVEL_CRITICAL),
+        "entities": entities,
+        "rollup": rollup,
+        "fleet_root_causes": {
+            cause: round(total / anomalous_count, 3)
+            for cause, total in sorted(cause_totals.items(), key=lambda item: item[1], reverse=True)
+        },
+        "config_version": config.version,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+
+def _rollup(entity_ids: List[str], worst: List[int], labels: Dict[str, Dict[str, str]],
+            dimension: str) -> Dict[str, Dict[str, int]]:
+    """
+    Count entities and anomalies per value of one label dimension
+
+    Args:
+        entity_ids: Entity ids
+        worst: Highest level code per entity
+        labels: Entity id -> labels mapping
+        dimension: Label to group by
+
+    Returns:
+        label value -> {"entities", "anomalous", "critical"}
+    """
+    groups: Dict[str, Dict[str, int]] = {}
+    for row, entity in enumerate(entity_ids):
+        key = labels.get(entity, {}).get(dimension, "-")
+        group = groups.setdefault(key, {"entities": 0, "anomalous": 0, "critical": 0})
+        group["entities"] += 1
+        group["anomalous"] += worst[row] > 0
+        group["critical"] += worst[row] == LEVEL_CRITICAL
+    return groups
+
+def analyze_fleet_from_store(store: MetricStore, include_default: bool = False,
+                             config: Optional[ConfigSnapshot] = None) -> Dict[str, Any]:
+    """
+    Analyze the latest samples of every labelled entity in a metric store
+
+    Args:
+        store: The metric store
+        include_default: Also analyze the unlabelled local entity
+        config: Configuration snapshot to analyze with (defaults to the active one)
+
+    Returns:
+        Fleet analysis (see analyze_fleet)
+    """
+    config = config or analysis_config.snapshot
+    metrics = config.threshold_engine.metrics
+    entities = [entity for entity in store.entities() if include_default or entity != DEFAULT_ENTITY]
+    entity_ids, matrix = store.latest_matrix(metrics, entities)
+    return analyze_fleet(entity_ids, matrix, metrics, store.entity_labels, config)
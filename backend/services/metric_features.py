@@ -0,0 +1,308 @@
+"""
+Windowed Metric Features
+Incrementally maintained trend features over the last N samples of each metric
+"""
+
+import math
+import os
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from services.analysis_config import ConfigSnapshot, analysis_config
+from services.metric_store import DEFAULT_ENTITY
+from services.threshold_engine import LEVEL_NORMAL
+
+# Feature values are published as "<metric>.<feature>", so rules can reference them like metrics
+FEATURE_SEPARATOR = "."
+FEATURES = ("slope", "acceleration", "trend", "variance", "zscore", "percentile", "time_above")
+
+def feature_name(metric: str, feature: str) -> str:
+    """
+    Name under which a feature of a metric is published
+
+    Args:
+        metric: The metric name
+        feature: One of FEATURES
+
+    Returns:
+        "<metric>.<feature>", e.g. "memory_usage.slope"
+    """
+    return f"{metric}{FEATURE_SEPARATOR}{feature}"
+
+class WindowFeatures:
+    """
+    Trend features of the last `window` samples of one series
+
+    Every sample updates running sums of t^k (k <= 4), v, t*v, t^2*v and
+    v^2 in O(1), and the evicted sample's terms are subtracted, so the
+    features below are closed-form reads of those sums:
+
+        slope         least-squares slope, units per minute
+        acceleration  second derivative of a least-squares parabola, units per minute^2
+        trend         correlation of value with time (-1..1); near 1 for steady growth,
+                      near 0 for noise or a single spike
+        variance      population variance of the window
+        zscore        deviation of the latest sample from the window mean, in standard deviations
+        percentile    the configured percentile (bisect-maintained sorted window, exact)
+        time_above    seconds of the window spent past the metric's warning threshold
+
+    The running sums cost O(1) per sample; keeping the sorted window for
+    the exact percentile costs O(window) per sample (list insert and
+    delete), which is cheap at the window sizes used here.
+
+    Times are minutes since an origin and values are shifted by a
+    reference value; both are rebased, and the sums recomputed exactly,
+    once per window of samples so rounding drift and the magnitude of t
+    stay bounded.
+    """
+
+    def __init__(self, window: int = 60, percentile: float = 95.0):
+        """
+        Initialize the series
+
+        Args:
+            window: Number of recent samples the features cover
+            percentile: Percentile reported as the "percentile" feature (0-100)
+        """
+        self.window = window
+        self.percentile = percentile
+        self._samples: deque = deque()  # (timestamp, value, above threshold, seconds since previous sample)
+        self._sorted: List[float] = []
+        self._origin = 0.0
+        self._shift = 0.0
+        self._since_rebase = 0
+        self._clear_sums()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def _clear_sums(self) -> None:
+        self._t = self._tt = self._ttt = self._tttt = 0.0
+        self._v = self._tv = self._ttv = self._vv = 0.0
+        self.time_above = 0.0
+
+    def _accumulate(self, timestamp: float, value: float, sign: float) -> None:
+        t = (timestamp - self._origin) / 60.0
+        v = value - self._shift
+        tt = t * t
+        self._t += sign * t
+        self._tt += sign * tt
+        self._ttt += sign * tt * t
+        self._tttt += sign * tt * tt
+        self._v += sign * v
+        self._tv += sign * t * v
+        self._ttv += sign * tt * v
+        self._vv += sign * v * v
+
+    def _rebase(self) -> None:
+        """Move the origin to the oldest sample and recompute the sums from the window"""
+        oldest_timestamp, oldest_value, _, _ = self._samples[0]
+        self._origin, self._shift = oldest_timestamp, oldest_value
+        self._clear_sums()
+        for timestamp, value, above, interval in self._samples:
+            self._accumulate(timestamp, value, 1.0)
+            if above:
+                self.time_above += interval
+        self._since_rebase = 0
+
+    def update(self, timestamp: float, value: float, above: bool) -> None:
+        """
+        Absorb one sample, evicting the oldest when the window is full
+
+        Args:
+            timestamp: Sample time (epoch seconds)
+            value: Sample value
+            above: Whether the sample is past the metric's warning threshold
+        """
+        if not self._samples:
+            self._origin, self._shift = timestamp, value
+        interval = timestamp - self._samples[-1][0] if self._samples else 0.0
+
+        if len(self._samples) == self.window:
+            old_timestamp, old_value, old_above, old_interval = self._samples.popleft()
+            self._accumulate(old_timestamp, old_value, -1.0)
+            del self._sorted[bisect_left(self._sorted, old_value)]
+            if old_above:
+                self.time_above -= old_interval
+
+        self._samples.append((timestamp, value, above, interval))
+        self._accumulate(timestamp, value, 1.0)
+        insort(self._sorted, value)
+        if above:
+            self.time_above += interval
+
+        self._since_rebase += 1
+        if self._since_rebase >= self.window:
+            self._rebase()
+
+    def reclassify(self, is_above) -> None:
+        """
+        Re-evaluate the threshold flag of every sample (after a threshold change)
+
+        Args:
+            is_above: value -> whether it is past the warning threshold
+        """
+        self._samples = deque((timestamp, value, bool(is_above(value)), interval)
+                              for timestamp, value, _, interval in self._samples)
+        self._rebase()
+
+    def _percentile(self) -> float:
+        """Linearly interpolated percentile of the window (same definition as np.percentile)"""
+        ordered = self._sorted
+        position = self.percentile / 100.0 * (len(ordered) - 1)
+        lower = int(position)
+        fraction = position - lower
+        if fraction == 0.0:
+            return ordered[lower]
+        return ordered[lower] + (ordered[lower + 1] - ordered[lower]) * fraction
+
+    def features(self) -> Dict[str, float]:
+        """
+        Current feature values
+
+        Returns:
+            {feature: value} for every name in FEATURES (empty if the window is empty)
+        """
+        n = len(self._samples)
+        if not n:
+            return {}
+
+        mean_t = self._t / n
+        mean_v = self._v / n
+        variance = max(self._vv / n - mean_v * mean_v, 0.0)
+
+        # Central moments of time and time-weighted values, from the raw sums
+        d2 = max(self._tt - n * mean_t * mean_t, 0.0)
+        d3 = self._ttt - 3.0 * mean_t * self._tt + 2.0 * n * mean_t ** 3
+        d4 = self._tttt - 4.0 * mean_t * self._ttt + 6.0 * mean_t ** 2 * self._tt - 3.0 * n * mean_t ** 4
+        y1 = self._tv - mean_t * self._v
+        y2 = self._ttv - 2.0 * mean_t * self._tv + mean_t * mean_t * self._v
+
+        slope = y1 / d2 if d2 > 0.0 else 0.0
+        trend = y1 / math.sqrt(d2 * n * variance) if d2 > 0.0 and variance > 0.0 else 0.0
+
+        # Parabola v = a + b*d + c*d^2 in centered time d; acceleration = 2c
+        determinant = d2 * (d4 - d2 * d2 / n) - d3 * d3
+        acceleration = 0.0
+        if n >= 3 and determinant > 1e-12 * max(d2 * d4, 1e-300):
+            acceleration = 2.0 * (d2 * (y2 - d2 * self._v / n) - d3 * y1) / determinant
+
+        latest = self._samples[-1][1]
+        deviation = latest - self._shift - mean_v
+        return {
+            "slope": slope,
+            "acceleration": acceleration,
+            "trend": max(-1.0, min(1.0, trend)),
+            "variance": variance,
+            "zscore": deviation / math.sqrt(variance) if variance > 0.0 else 0.0,
+            "percentile": self._percentile(),
+            "time_above": self.time_above
+        }
+
+class FeatureTracker:
+    """
+    One WindowFeatures per (entity, metric) series
+
+    Samples are classified against the warning threshold of the
+    configuration they arrive with; when the configuration changes, the
+    retained window is reclassified once.
+    """
+
+    def __init__(self, window: int = 60, percentile: float = 95.0, min_samples: int = 12):
+        """
+        Initialize the tracker
+
+        Args:
+            window: Samples per feature window (60 = five minutes at a 5 s tick)
+            percentile: Percentile reported as the "percentile" feature
+            min_samples: Samples a series needs before its features are published
+        """
+        self.window = window
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self._series: Dict[str, Dict[str, WindowFeatures]] = {}  # entity -> metric -> window
+        self._config_version: Optional[str] = None
+
+    def series(self, metric: str, entity: str = DEFAULT_ENTITY) -> WindowFeatures:
+        """Get (creating if needed) the feature window of a series"""
+        metrics = self._series.setdefault(entity, {})
+        series = metrics.get(metric)
+        if series is None:
+            series = metrics[metric] = WindowFeatures(self.window, self.percentile)
+        return series
+
+    def _sync_config(self, config: ConfigSnapshot) -> None:
+        """Reclassify every retained sample if the thresholds may have changed"""
+        if config.version == self._config_version:
+            return
+        if self._config_version is not None:
+            engine = config.threshold_engine
+            for metrics in self._series.values():
+                for metric, series in metrics.items():
+                    series.reclassify(lambda value, metric=metric: engine.level(metric, value) > LEVEL_NORMAL)
+        self._config_version = config.version
+
+    def update_snapshot(self, snapshot: Dict[str, float], timestamp: Optional[float] = None,
+                        config: Optional[ConfigSnapshot] = None,
+                        entity: str = DEFAULT_ENTITY) -> Dict[str, float]:
+        """
+        Feed a snapshot to the feature windows of an entity
+
+        Args:
+            snapshot: Dictionary of metric names to values
+            timestamp: Sample time (defaults to now)
+            config: Configuration snapshot providing the thresholds (defaults to the active one)
+            entity: The entity the snapshot belongs to
+
+        Returns:
+            The entity's features after the update (see features())
+        """
+        config = config or analysis_config.snapshot
+        self._sync_config(config)
+        timestamp = time.time() if timestamp is None else timestamp
+        engine = config.threshold_engine
+        for metric, value in snapshot.items():
+            self.series(metric, entity).update(timestamp, value, engine.level(metric, value) > LEVEL_NORMAL)
+        return self.features(entity)
+
+    def features(self, entity: str = DEFAULT_ENTITY) -> Dict[str, float]:
+        """
+        Published features of an entity
+
+        Args:
+            entity: Entity id
+
+        Returns:
+            Flat {"<metric>.<feature>": value} for every series with at least min_samples samples
+        """
+        result = {}
+        for metric, series in self._series.get(entity, {}).items():
+            if len(series) < self.min_samples:
+                continue
+            for feature, value in series.features().items():
+                result[feature_name(metric, feature)] = value
+        return result
+
+    def to_dict(self, entity: str = DEFAULT_ENTITY) -> Dict[str, Any]:
+        """Serializable per-metric features of an entity"""
+        return {
+            "window": self.window,
+            "percentile": self.percentile,
+            "min_samples": self.min_samples,
+            "metrics": {
+                metric: {
+                    "samples": len(series),
+                    **{feature: round(value, 6) for feature, value in series.features().items()}
+                }
+                for metric, series in self._series.get(entity, {}).items()
+            }
+        }
+
+# Global feature tracker for the monitoring pipeline
+feature_tracker = FeatureTracker(
+    window=int(os.getenv("FEATURE_WINDOW", "60")),
+    percentile=float(os.getenv("FEATURE_PERCENTILE", "95")),
+    min_samples=int(os.getenv("FEATURE_MIN_SAMPLES", "12"))
+)
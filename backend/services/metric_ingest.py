@@ -0,0 +1,145 @@
+"""
+Metric Ingest Service
+Validates batched, columnar metric payloads and appends them to the metric store
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from services.metric_store import MetricStore, make_entity_id
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on samples accepted in a single batch
+MAX_SAMPLES_PER_BATCH = 1_000_000
+
+class IngestError(ValueError):
+    """Raised when an ingest payload is malformed"""
+
+Column = Tuple[str, Dict[str, str], str, np.ndarray, np.ndarray]
+
+def _to_column(name: str, data: Any) -> np.ndarray:
+    """Convert a JSON array to a 1-D float64 column, rejecting non-finite values"""
+    try:
+        column = np.asarray(data, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise IngestError(f"{name} must be an array of numbers")
+    if column.ndim != 1:
+        raise IngestError(f"{name} must be a flat array")
+    if not np.isfinite(column).all():
+        raise IngestError(f"{name} contains NaN or infinite values")
+    return column
+
+def parse_batch(payload: Dict[str, Any]) -> List[Column]:
+    """
+    Validate a columnar ingest payload
+
+    Payload shape::
+
+        {"series": [
+            {"labels": {"region": "eu", "service": "api", "host": "web-1"},
+             "timestamps": [1700000000.0, 1700000005.0],
+             "metrics": {
+                 "cpu_usage": [41.2, 43.8],
+                 "memory_usage": {"timestamps": [1700000000.0], "values": [63.1]}
+             }}
+        ]}
+
+    A metric is either a value array sharing the series "timestamps", or
+    an object with its own "timestamps" and "values" arrays. Validation is
+    done per column with NumPy, never per sample.
+
+    Args:
+        payload: Decoded request body
+
+    Returns:
+        List of (entity, labels, metric, timestamps, values) columns
+
+    Raises:
+        IngestError: If the payload is malformed
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("series"), list):
+        raise IngestError("payload must be an object with a 'series' array")
+
+    columns: List[Column] = []
+    total = 0
+    for index, series in enumerate(payload["series"]):
+        if not isinstance(series, dict) or not isinstance(series.get("metrics"), dict):
+            raise IngestError(f"series[{index}] must be an object with a 'metrics' object")
+        labels = series.get("labels") or {}
+        if not isinstance(labels, dict):
+            raise IngestError(f"series[{index}].labels must be an object")
+        entity = make_entity_id(labels)
+
+        shared_timestamps = None
+        if "timestamps" in series:
+            shared_timestamps = _to_column(f"series[{index}].timestamps", series["timestamps"])
+
+        for metric, data in series["metrics"].items():
+            name = f"series[{index}].metrics.{metric}"
+            if isinstance(data, dict):
+                timestamps = _to_column(f"{name}.timestamps", data.get("timestamps"))
+                values = _to_column(f"{name}.values", data.get("values"))
+            else:
+                if shared_timestamps is None:
+                    raise IngestError(f"{name} has no timestamps (set series timestamps or use an object)")
+                timestamps = shared_timestamps
+                values = _to_column(name, data)
+
+            if len(timestamps) != len(values):
+                raise IngestError(f"{name}: {len(values)} values for {len(timestamps)} timestamps")
+
+            total += len(values)
+            if total > MAX_SAMPLES_PER_BATCH:
+                raise IngestError(f"batch exceeds {MAX_SAMPLES_PER_BATCH} samples")
+            columns.append((entity, labels, metric, timestamps, values))
+
+    return columns
+
+def ingest_batch(store: MetricStore, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a columnar payload and append it to the store in bulk
+
+    The whole batch is validated before anything is written, so a
+    malformed batch is rejected atomically, and it is appended under the
+    store lock, so readers never see half a batch. Safe to call from a
+    worker thread. Well-formed samples can still
+    be rejected one by one: the store sorts each column by timestamp,
+    drops samples older than their series' latest sample, and drops
+    samples of new series once its series or entity cap is reached.
+
+    Args:
+        store: The metric store to append to
+        payload: Decoded request body
+
+    Returns:
+        Counts of accepted samples, series and entities, and of rejected
+        samples per reason ("out_of_order", "over_limit")
+
+    Raises:
+        IngestError: If the payload is malformed
+    """
+    columns = parse_batch(payload)
+
+    entities = set()
+    series = samples = 0
+    rejected = {"out_of_order": 0, "over_limit": 0}
+    with store.lock:
+        for entity, labels, metric, timestamps, values in columns:
+            if not store.admits(metric, entity):
+                store.rejected["over_limit"] += len(values)
+                rejected["over_limit"] += len(values)
+                continue
+            stored = store.extend(metric, timestamps, values, entity=entity)
+            rejected["out_of_order"] += len(values) - stored
+            if entity not in entities:
+                store.set_entity_labels(entity, labels)
+                entities.add(entity)
+            series += 1
+            samples += stored
+
+    if any(rejected.values()):
+        logger.debug(f"Ingest rejected samples: {rejected}")
+    return {"samples": samples, "series": series, "entities": len(entities), "rejected": rejected}
@@ -0,0 +1,148 @@
+"""
+Metric Sources
+Pluggable producers of system metric snapshots for the monitoring pipeline
+"""
+
+import json
+import logging
+import random
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+class MetricSource:
+    """
+    Interface for anything that produces metric snapshots
+
+    Implementations return one {metric_name: value} snapshot per call to
+    collect(); the monitoring tick appends it to the metric store.
+    """
+
+    name = "base"
+
+    async def collect(self) -> Dict[str, float]:
+        """
+        Produce the next metric snapshot
+
+        Returns:
+            Dictionary of metric names to values (empty if nothing is available)
+        """
+        raise NotImplementedError
+
+class RandomMetricSource(MetricSource):
+    """Generates realistic random metrics for demonstration"""
+
+    name = "random"
+
+    def generate(self) -> Dict[str, float]:
+        """
+        Generate realistic system metrics for demonstration
+        """
+        # Base metrics with some randomness
+        return {
+            "cpu_usage": random.uniform(20, 95),  # Sometimes high to trigger anomalies
+            "memory_usage": random.uniform(30, 90),
+            "disk_usage": random.uniform(25, 85),
+            "network_io": random.uniform(100, 1200),
+            "database_connections": random.uniform(10, 90),
+            "cache_hit_rate": random.uniform(60, 95),
+            "active_users": random.uniform(1000, 12000),
+            "api_latency_p99": random.uniform(100, 1200),
+            "error_rate": random.uniform(0.1, 8.0),
+            "request_rate": random.uniform(200, 1500)
+        }
+
+    async def collect(self) -> Dict[str, float]:
+        return self.generate()
+
+class FileReplayMetricSource(MetricSource):
+    """
+    Replays recorded snapshots from a JSON Lines file
+
+    Each line is either a flat {metric: value} object or an object with a
+    "metrics" key holding one.
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str, loop: bool = True):
+        """
+        Initialize the replay source
+
+        Args:
+            path: Path to the JSON Lines recording
+            loop: Restart from the beginning when the file is exhausted
+        """
+        self.path = path
+        self.loop = loop
+        self._lines: Optional[Iterator[str]] = None
+
+    def _open(self) -> Iterator[str]:
+        with open(self.path, "r", encoding="utf-8") as recording:
+            for line in recording:
+                if line.strip():
+                    yield line
+
+    async def collect(self) -> Dict[str, float]:
+        for _ in range(2):
+            if self._lines is None:
+                self._lines = self._open()
+            line = next(self._lines, None)
+            if line is not None:
+                record = json.loads(line)
+                metrics = record.get("metrics", record)
+                return {name: float(value) for name, value in metrics.items()}
+            if not self.loop:
+                return {}
+            self._lines = None
+
+        logger.warning(f"Metric replay file is empty: {self.path}")
+        return {}
+
+class PushMetricSource(MetricSource):
+    """
+    Collects values pushed by in-process producers
+
+    Pushes are merged until the next collect(), which drains them, so a
+    value is recorded once. Batched external samples go through the ingest
+    API straight into the metric store instead.
+    """
+
+    name = "push"
+
+    def __init__(self):
+        self._pending: Dict[str, float] = {}
+
+    def push(self, metrics: Dict[str, float]) -> None:
+        """
+        Record pushed metric values
+
+        Args:
+            metrics: Dictionary of metric names to values
+        """
+        self._pending.update(metrics)
+
+    async def collect(self) -> Dict[str, float]:
+        pending, self._pending = self._pending, {}
+        return pending
+
+def create_metric_source(kind: str = "random", replay_path: Optional[str] = None) -> MetricSource:
+    """
+    Create a metric source by name
+
+    Args:
+        kind: random, replay or push
+        replay_path: Recording to replay (required for the replay source)
+
+    Returns:
+        The metric source
+    """
+    if kind == "random":
+        return RandomMetricSource()
+    if kind == "replay":
+        if not replay_path:
+            raise ValueError("METRIC_REPLAY_FILE must be set for the replay metric source")
+        return FileReplayMetricSource(replay_path)
+    if kind == "push":
+        return PushMetricSource()
+    raise ValueError(f"Unknown metric source: {kind}")
@@ -0,0 +1,403 @@
+"""
+Metric Store Service
+In-process time-series store built from fixed-capacity ring buffers
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Entity used when metrics are not labelled with a host/service
+DEFAULT_ENTITY = "local"
+
+# Labels that identify an entity, most significant first
+ENTITY_LABELS = ("region", "service", "host")
+
+def make_entity_id(labels: Dict[str, str]) -> str:
+    """
+    Build the entity id for a set of labels
+
+    Args:
+        labels: Entity labels (region, service, host); other keys are ignored
+
+    Returns:
+        "region/service/host" with "-" for missing labels, or DEFAULT_ENTITY if none are set
+    """
+    parts = [str(labels.get(label) or "-") for label in ENTITY_LABELS]
+    if all(part == "-" for part in parts):
+        return DEFAULT_ENTITY
+    return "/".join(parts)
+
+# Reducers available for window aggregation
+WINDOW_REDUCERS = {
+    "last": lambda values: values[-1],
+    "mean": np.mean,
+    "min": np.min,
+    "max": np.max,
+    "p95": lambda values: np.percentile(values, 95)
+}
+
+class RingBuffer:
+    """
+    Fixed-capacity float64 ring buffer with a timestamp column
+
+    Appends are O(1); window queries return ordered NumPy copies built
+    from at most two contiguous slices.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the ring buffer
+
+        Args:
+            capacity: Maximum number of samples retained
+        """
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self._head = 0  # Next write position
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, value: float) -> None:
+        """
+        Append one sample, overwriting the oldest when full
+
+        Args:
+            timestamp: Sample time (epoch seconds)
+            value: Sample value
+        """
+        self.timestamps[self._head] = timestamp
+        self.values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def extend(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """
+        Append a batch of samples with at most two slice assignments
+
+        Args:
+            timestamps: Sample times (epoch seconds)
+            values: Sample values, same length as timestamps
+        """
+        count = len(values)
+        if count == 0:
+            return
+        if count >= self.capacity:
+            timestamps = timestamps[-self.capacity:]
+            values = values[-self.capacity:]
+            self.timestamps[:] = timestamps
+            self.values[:] = values
+            self._head = 0
+            self._count = self.capacity
+            return
+
+        first = min(count, self.capacity - self._head)
+        self.timestamps[self._head:self._head + first] = timestamps[:first]
+        self.values[self._head:self._head + first] = values[:first]
+        if first < count:
+            self.timestamps[:count - first] = timestamps[first:]
+            self.values[:count - first] = values[first:]
+        self._head = (self._head + count) % self.capacity
+        self._count = min(self._count + count, self.capacity)
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        """
+        Get the most recent sample
+
+        Returns:
+            (timestamp, value) or None if empty
+        """
+        if not self._count:
+            return None
+        index = (self._head - 1) % self.capacity
+        return float(self.timestamps[index]), float(self.values[index])
+
+    def window(self, size: Optional[int] = None, since: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the most recent samples in chronological order
+
+        Args:
+            size: Maximum number of samples (defaults to everything retained)
+            since: Only include samples with timestamp >= since
+
+        Returns:
+            (timestamps, values) arrays, oldest first
+        """
+        size = self._count if size is None else min(size, self._count)
+        start = (self._head - size) % self.capacity
+        if start + size <= self.capacity:
+            timestamps = self.timestamps[start:start + size].copy()
+            values = self.values[start:start + size].copy()
+        else:
+            timestamps = np.concatenate((self.timestamps[start:], self.timestamps[:self._head]))
+            values = np.concatenate((self.values[start:], self.values[:self._head]))
+
+        if since is not None:
+            offset = int(np.searchsorted(timestamps, since, side="left"))
+            timestamps, values = timestamps[offset:], values[offset:]
+        return timestamps, values
+
+class MetricStore:
+    """
+    Ring buffers keyed by (entity, metric)
+
+    Every series is kept in ascending timestamp order (window queries
+    bisect it and alignment interpolates over it): batches are sorted
+    before they are appended, and samples older than the latest stored
+    sample of their series are dropped. The number of series and
+    entities is capped; samples for a new series past either cap are
+    dropped too. Dropped samples are counted in `rejected`.
+
+    Ingest batches are appended from worker threads while the monitoring
+    tick reads and appends on the event loop, so every public method holds
+    `lock` (reentrant; hold it to make several calls atomic).
+    """
+
+    def __init__(self, capacity: int = 720, max_series: int = 0, max_entities: int = 0):
+        """
+        Initialize the store
+
+        Args:
+            capacity: Samples retained per series (720 = one hour at a 5 s tick)
+            max_series: Maximum number of series (0 = unlimited)
+            max_entities: Maximum number of entities (0 = unlimited)
+        """
+        self.capacity = capacity
+        self.max_series = max_series
+        self.max_entities = max_entities
+        self._series: Dict[Tuple[str, str], RingBuffer] = {}
+        self._entity_metrics: Dict[str, List[str]] = {}
+        self.entity_labels: Dict[str, Dict[str, str]] = {}
+        self.rejected = {"out_of_order": 0, "over_limit": 0}
+        self.lock = threading.RLock()
+
+    def admits(self, metric: str, entity: str = DEFAULT_ENTITY) -> bool:
+        """
+        Whether samples of a series can be stored: it exists, or the caps leave room for it
+
+        Args:
+            metric: Metric name
+            entity: Entity the metric belongs to
+        """
+        if (entity, metric) in self._series:
+            return True
+        if self.max_series and len(self._series) >= self.max_series:
+            return False
+        if entity not in self._entity_metrics and self.max_entities and len(self._entity_metrics) >= self.max_entities:
+            return False
+        return True
+
+    def _buffer(self, entity: str, metric: str) -> Optional[RingBuffer]:
+        """Get or create the ring buffer for a series (None if the caps leave no room for it)"""
+        key = (entity, metric)
+        buffer = self._series.get(key)
+        if buffer is None:
+            if not self.admits(metric, entity):
+                return None
+            buffer = self._series[key] = RingBuffer(self.capacity)
+            self._entity_metrics.setdefault(entity, []).append(metric)
+        return buffer
+
+    def append(self, metric: str, value: float, timestamp: Optional[float] = None,
+               entity: str = DEFAULT_ENTITY) -> bool:
+        """
+        Append one sample to a series
+
+        Args:
+            metric: Metric name
+            value: Sample value
+            timestamp: Sample time (defaults to now)
+            entity: Entity the metric belongs to
+
+        Returns:
+            Whether the sample was stored (see the class docstring for when it is dropped)
+        """
+        with self.lock:
+            timestamp = time.time() if timestamp is None else timestamp
+            buffer = self._buffer(entity, metric)
+            if buffer is None:
+                self.rejected["over_limit"] += 1
+                return False
+            latest = buffer.latest()
+            if latest is not None and timestamp < latest[0]:
+                self.rejected["out_of_order"] += 1
+                return False
+            buffer.append(timestamp, value)
+            return True
+
+    def append_snapshot(self, metrics: Dict[str, float], timestamp: Optional[float] = None,
+                        entity: str = DEFAULT_ENTITY) -> int:
+        """
+        Append one sample per metric, all with the same timestamp
+
+        Args:
+            metrics: Dictionary of metric names to values
+            timestamp: Sample time (defaults to now)
+            entity: Entity the metrics belong to
+
+        Returns:
+            Number of samples stored
+        """
+        with self.lock:
+            timestamp = time.time() if timestamp is None else timestamp
+            return sum(self.append(metric, value, timestamp, entity) for metric, value in metrics.items())
+
+    def extend(self, metric: str, timestamps: np.ndarray, values: np.ndarray,
+               entity: str = DEFAULT_ENTITY) -> int:
+        """
+        Append a batch of samples to a series
+
+        The batch is sorted by timestamp if needed, and samples older than
+        the series' latest sample are dropped.
+
+        Args:
+            metric: Metric name
+            timestamps: Sample times (epoch seconds)
+            values: Sample values
+            entity: Entity the metric belongs to
+
+        Returns:
+            Number of samples stored
+        """
+        with self.lock:
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+            values = np.asarray(values, dtype=np.float64)
+            if not len(values):
+                return 0
+            buffer = self._buffer(entity, metric)
+            if buffer is None:
+                self.rejected["over_limit"] += len(values)
+                return 0
+
+            if len(timestamps) > 1 and (timestamps[1:] < timestamps[:-1]).any():
+                order = np.argsort(timestamps, kind="stable")
+                timestamps, values = timestamps[order], values[order]
+            latest = buffer.latest()
+            if latest is not None and timestamps[0] < latest[0]:
+                offset = int(np.searchsorted(timestamps, latest[0], side="left"))
+                self.rejected["out_of_order"] += offset
+                timestamps, values = timestamps[offset:], values[offset:]
+
+            buffer.extend(timestamps, values)
+            return len(values)
+
+    def set_entity_labels(self, entity: str, labels: Dict[str, str]) -> None:
+        """
+        Record the labels of an entity (first write wins)
+
+        Args:
+            entity: Entity id
+            labels: Entity labels
+        """
+        with self.lock:
+            if entity not in self.entity_labels:
+                self.entity_labels[entity] = {label: labels[label] for label in ENTITY_LABELS if labels.get(label)}
+
+    @property
+    def series_count(self) -> int:
+        """Number of stored series"""
+        return len(self._series)
+
+    def series(self, metric: str, entity: str = DEFAULT_ENTITY) -> Optional[RingBuffer]:
+        """Get the ring buffer for a series, or None if it has no samples"""
+        return self._series.get((entity, metric))
+
+    def entities(self) -> List[str]:
+        """Get all entities with stored samples"""
+        with self.lock:
+            return list(self._entity_metrics.keys())
+
+    def metric_names(self, entity: str = DEFAULT_ENTITY) -> List[str]:
+        """Get the metric names stored for an entity"""
+        with self.lock:
+            return list(self._entity_metrics.get(entity, []))
+
+    def window(self, metric: str, size: Optional[int] = None, since: Optional[float] = None,
+               entity: str = DEFAULT_ENTITY) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a window of one series
+
+        Returns:
+            (timestamps, values) arrays, oldest first (empty if the series is unknown)
+        """
+        with self.lock:
+            buffer = self._series.get((entity, metric))
+            if buffer is None:
+                return np.empty(0), np.empty(0)
+            return buffer.window(size, since)
+
+    def latest(self, entity: str = DEFAULT_ENTITY) -> Dict[str, float]:
+        """
+        Get the latest value of every metric of an entity
+
+        Returns:
+            Dictionary of metric names to their most recent values
+        """
+        with self.lock:
+            snapshot = {}
+            for metric in self._entity_metrics.get(entity, []):
+                sample = self._series[(entity, metric)].latest()
+                if sample is not None:
+                    snapshot[metric] = sample[1]
+            return snapshot
+
+    def latest_matrix(self, metrics: List[str], entities: Optional[List[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Get the latest value of each metric for many entities as one matrix
+
+        Args:
+            metrics: Metric names, in column order
+            entities: Entity ids, in row order (defaults to every stored entity)
+
+        Returns:
+            (entity ids, entities x metrics float64 matrix with NaN for missing series)
+        """
+        with self.lock:
+            entities = self.entities() if entities is None else entities
+            nan = float("nan")
+            rows = []
+            for entity in entities:
+                row = []
+                for metric in metrics:
+                    buffer = self._series.get((entity, metric))
+                    row.append(buffer.values[buffer._head - 1] if buffer is not None and buffer._count else nan)
+                rows.append(row)
+            return entities, np.array(rows, dtype=np.float64).reshape(len(entities), len(metrics))
+
+    def aggregate(self, size: Optional[int] = None, reducer: str = "mean",
+                  entity: str = DEFAULT_ENTITY) -> Dict[str, float]:
+        """
+        Reduce a window of every metric of an entity to one value per metric
+
+        The result has the same shape as a single snapshot, so it can be fed
+        to get_entanglement_analysis or analyze_root_cause directly.
+
+        Args:
+            size: Window size in samples (defaults to everything retained)
+            reducer: One of last, mean, min, max or p95
+            entity: Entity to aggregate
+
+        Returns:
+            Dictionary of metric names to reduced values
+        """
+        with self.lock:
+            reduce = WINDOW_REDUCERS[reducer]
+            result = {}
+            for metric in self._entity_metrics.get(entity, []):
+                _, values = self._series[(entity, metric)].window(size)
+                if len(values):
+                    result[metric] = float(reduce(values))
+            return result
+
+# Global metric store shared by the monitoring tick and the ingest API
+metric_store = MetricStore(
+    capacity=int(os.getenv("METRIC_STORE_CAPACITY", "720")),
+    max_series=int(os.getenv("METRIC_STORE_MAX_SERIES", "20000")),
+    max_entities=int(os.getenv("METRIC_STORE_MAX_ENTITIES", "2000"))
+)
@@ -7,9 +7,12 @@ Inspired by Quantum Annealing principles
 from typing import Dict, List, Optional, Tuple
 import logging
 
+from services.analysis_config import ConfigSnapshot, analysis_config
+
 logger = logging.getLogger(__name__)
 
-# Solution blueprints with cost-benefit analysis
+# Solution blueprints with cost-benefit analysis (built-in defaults; the active
+# version comes from services.analysis_config and may be reloaded from a file)
 SOLUTION_BLUEPRINTS = {
     "database_load": [
         {
@@ -429,21 +432,23 @@ def calculate_utility_score(action: Dict) -> float:
     
     return round(utility_score, 2)
 
-def find_optimal_solution(root_cause: str) -> Optional[Dict]:
+def find_optimal_solution(root_cause: str, config: Optional[ConfigSnapshot] = None) -> Optional[Dict]:
     """
     Find the optimal solution for a given root cause using quantum optimization
     
     Args:
         root_cause: The confirmed root cause
+        config: Configuration snapshot holding the blueprints (defaults to the active one)
         
     Returns:
         Dictionary containing the optimal solution details or None
     """
-    if not root_cause or root_cause not in SOLUTION_BLUEPRINTS:
+    blueprints = (config or analysis_config.snapshot).blueprints
+    if not root_cause or root_cause not in blueprints:
         logger.warning(f"No solution blueprint found for root cause: {root_cause}")
         return None
     
-    possible_actions = SOLUTION_BLUEPRINTS[root_cause]
+    possible_actions = blueprints[root_cause]
     
     if not possible_actions:
         logger.warning(f"No possible actions found for root cause: {root_cause}")
@@ -489,21 +494,23 @@ def find_optimal_solution(root_cause: str) -> Optional[Dict]:
     
     return optimal_solution
 
-def get_solution_alternatives(root_cause: str, limit: int = 3) -> List[Dict]:
+def get_solution_alternatives(root_cause: str, limit: int = 3, config: Optional[ConfigSnapshot] = None) -> List[Dict]:
     """
     Get alternative solutions for a root cause
     
     Args:
         root_cause: The confirmed root cause
         limit: Maximum number of alternatives to return
+        config: Configuration snapshot holding the blueprints (defaults to the active one)
         
     Returns:
         List of alternative solutions sorted by utility score
     """
-    if not root_cause or root_cause not in SOLUTION_BLUEPRINTS:
+    blueprints = (config or analysis_config.snapshot).blueprints
+    if not root_cause or root_cause not in blueprints:
         return []
     
-    possible_actions = SOLUTION_BLUEPRINTS[root_cause]
+    possible_actions = blueprints[root_cause]
     
     # Calculate utility scores for all actions
     scored_actions = []
@@ -0,0 +1,274 @@
+"""
+Outcome Log
+Append-only binary log of cognition outcomes, memory-mapped for training reads
+"""
+
+import glob
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.analysis_config import analysis_config
+from services.metric_features import FEATURES, feature_name
+
+logger = logging.getLogger(__name__)
+
+# Segment file layout: MAGIC, uint32 header length, JSON header (padded to 8 bytes), fixed-size records
+MAGIC = b"QOUTLOG1"
+SEGMENT_PATTERN = "outcomes-*.bin"
+NO_INDEX = -1
+
+def _record_dtype(metric_count: int, cause_count: int) -> np.dtype:
+    """Structured record type for one segment schema"""
+    return np.dtype([
+        ("timestamp", "<f8"),
+        ("metrics", "<f8", (metric_count,)),         # NaN where a metric was missing
+        ("probabilities", "<f4", (cause_count,)),    # Root cause probabilities at investigation time
+        ("investigated", "u1", (cause_count,)),
+        ("confirmed", "u1", (cause_count,)),
+        ("primary_cause", "<i2"),                    # Index into causes, or -1
+        ("remediation", "<i2")                       # Index into actions, or -1
+    ])
+
+class OutcomeSegment:
+    """
+    One segment file: a JSON schema header followed by fixed-size records
+
+    The schema (metric, cause and remediation action names) is fixed per
+    segment; an outcome that needs a name the schema does not have starts
+    a new segment, so records stay fixed-size and the file stays
+    append-only.
+    """
+
+    def __init__(self, path: str, metrics: List[str], causes: List[str], actions: List[str], offset: int):
+        self.path = path
+        self.metrics = metrics
+        self.causes = causes
+        self.actions = actions
+        self.offset = offset
+        self.dtype = _record_dtype(len(metrics), len(causes))
+
+    @classmethod
+    def create(cls, path: str, metrics: List[str], causes: List[str], actions: List[str]) -> "OutcomeSegment":
+        """Write the header of a new segment file"""
+        header = json.dumps({"metrics": metrics, "causes": causes, "actions": actions}).encode("utf-8")
+        header += b" " * (-(len(MAGIC) + 4 + len(header)) % 8)
+        with open(path, "xb") as segment_file:
+            segment_file.write(MAGIC + struct.pack("<I", len(header)) + header)
+        return cls(path, metrics, causes, actions, len(MAGIC) + 4 + len(header))
+
+    @classmethod
+    def open(cls, path: str) -> "OutcomeSegment":
+        """Read the header of an existing segment file"""
+        with open(path, "rb") as segment_file:
+            if segment_file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an outcome log segment")
+            (length,) = struct.unpack("<I", segment_file.read(4))
+            header = json.loads(segment_file.read(length).decode("utf-8"))
+        return cls(path, header["metrics"], header["causes"], header["actions"], len(MAGIC) + 4 + length)
+
+    def covers(self, metrics: Iterable[str], causes: Iterable[str], action: Optional[str]) -> bool:
+        """Whether an outcome fits this segment's schema"""
+        return (set(metrics) <= set(self.metrics) and set(causes) <= set(self.causes)
+                and (action is None or action in self.actions))
+
+    def truncate_torn_record(self) -> None:
+        """Drop a partially written trailing record so appends stay aligned"""
+        excess = (os.path.getsize(self.path) - self.offset) % self.dtype.itemsize
+        if excess:
+            logger.warning(f"Truncating {excess} bytes of a torn record in {self.path}")
+            os.truncate(self.path, os.path.getsize(self.path) - excess)
+
+    def record_count(self) -> int:
+        """Number of complete records, from the file size alone (a torn trailing record is ignored)"""
+        return max((os.path.getsize(self.path) - self.offset) // self.dtype.itemsize, 0)
+
+    def records(self) -> np.ndarray:
+        """
+        Memory-map the complete records (a torn trailing record is ignored)
+
+        Returns:
+            Read-only structured array (empty if the segment has no records)
+        """
+        count = self.record_count()
+        if not count:
+            return np.zeros(0, dtype=self.dtype)
+        return np.memmap(self.path, dtype=self.dtype, mode="r", offset=self.offset, shape=(count,))
+
+class OutcomeLog:
+    """
+    Append-only log of cognition outcomes
+
+    Each record holds the metric snapshot, the root cause probability
+    vector, which causes were investigated and confirmed, the primary
+    confirmed cause and the remediation chosen. Records are appended as
+    fixed-size binary rows and read back through memory maps, so training
+    over the full history needs no parsing.
+    """
+
+    def __init__(self, directory: str, max_segment_records: int = 100000,
+                 vocabulary: Optional[Callable[[], Tuple[List[str], List[str], List[str]]]] = None):
+        """
+        Initialize the log
+
+        Args:
+            directory: Directory holding the segment files (created on first write)
+            max_segment_records: Records per segment before a new one is started
+            vocabulary: Returns the (metrics, causes, actions) names known up front; new
+                segments include them so the first outcomes do not each widen the schema
+        """
+        self.directory = directory
+        self.max_segment_records = max_segment_records
+        self.vocabulary = vocabulary
+        self._lock = threading.Lock()
+        self._segments: Optional[List[OutcomeSegment]] = None
+
+    def segments(self) -> List[OutcomeSegment]:
+        """Existing segments, oldest first"""
+        with self._lock:
+            return list(self._load_segments())
+
+    def _load_segments(self) -> List[OutcomeSegment]:
+        if self._segments is None:
+            segments = []
+            for path in sorted(glob.glob(os.path.join(self.directory, SEGMENT_PATTERN))):
+                try:
+                    segments.append(OutcomeSegment.open(path))
+                except (OSError, ValueError) as e:
+                    logger.error(f"Skipping unreadable outcome log segment {path}: {e}")
+            if segments:
+                segments[-1].truncate_torn_record()
+            self._segments = segments
+        return self._segments
+
+    def _writable_segment(self, metrics: Sequence[str], causes: Sequence[str], action: Optional[str]) -> OutcomeSegment:
+        """The last segment if the outcome fits it, otherwise a new segment with a widened schema"""
+        segments = self._load_segments()
+        last = segments[-1] if segments else None
+        if last is not None and last.covers(metrics, causes, action) and last.record_count() < self.max_segment_records:
+            return last
+
+        def merged(known: List[str], new: Iterable[str]) -> List[str]:
+            return known + sorted(set(new) - set(known))
+
+        known = last or OutcomeSegment("", [], [], [], 0)
+        known_metrics, known_causes, known_actions = self.vocabulary() if self.vocabulary else ([], [], [])
+        os.makedirs(self.directory, exist_ok=True)
+        number = int(os.path.basename(last.path)[len("outcomes-"):-len(".bin")]) + 1 if last else 1
+        segment = OutcomeSegment.create(
+            os.path.join(self.directory, f"outcomes-{number:06d}.bin"),
+            merged(known.metrics, list(metrics) + known_metrics),
+            merged(known.causes, list(causes) + known_causes),
+            merged(known.actions, ([action] if action else []) + known_actions)
+        )
+        segments.append(segment)
+        return segment
+
+    def append(self, metrics: Dict[str, float], probabilities: Dict[str, float], investigated: Sequence[str],
+               confirmed: Sequence[str], primary_cause: Optional[str] = None, remediation: Optional[str] = None,
+               timestamp: Optional[float] = None) -> None:
+        """
+        Append one outcome
+
+        Args:
+            metrics: The analyzed metric snapshot
+            probabilities: Root cause probabilities the investigation started from
+            investigated: Causes the cognition agents checked
+            confirmed: Causes the agents confirmed
+            primary_cause: The cause chosen as the root cause, if it is training data (see training_data)
+            remediation: The remediation action chosen for it
+            timestamp: Outcome time (defaults to now)
+        """
+        causes = set(probabilities) | set(investigated) | set(confirmed) | ({primary_cause} if primary_cause else set())
+        with self._lock:
+            segment = self._writable_segment(list(metrics), causes, remediation)
+            cause_index = {cause: index for index, cause in enumerate(segment.causes)}
+
+            record = np.zeros(1, dtype=segment.dtype)
+            record["timestamp"] = time.time() if timestamp is None else timestamp
+            record["metrics"][0] = [metrics.get(metric, np.nan) for metric in segment.metrics]
+            for cause, probability in probabilities.items():
+                record["probabilities"][0, cause_index[cause]] = probability
+            record["investigated"][0, [cause_index[cause] for cause in investigated]] = 1
+            record["confirmed"][0, [cause_index[cause] for cause in confirmed]] = 1
+            record["primary_cause"] = cause_index[primary_cause] if primary_cause else NO_INDEX
+            record["remediation"] = segment.actions.index(remediation) if remediation else NO_INDEX
+
+            with open(segment.path, "ab") as segment_file:
+                segment_file.write(record.tobytes())
+
+    def training_data(self, metrics: Optional[Sequence[str]] = None) -> Tuple[List[str], np.ndarray, List[str]]:
+        """
+        Snapshots with a confirmed primary cause, across all segments
+
+        The monitoring pipeline only records a primary cause for complete
+        investigations, so runs that stopped early are not learned from.
+
+        Args:
+            metrics: Column layout of the returned matrix (defaults to every logged metric)
+
+        Returns:
+            (metric names, samples x metrics matrix with NaN for missing, primary cause per sample)
+        """
+        segments = self.segments()
+        if metrics is None:
+            metrics = []
+            for segment in segments:
+                metrics += [metric for metric in segment.metrics if metric not in metrics]
+        metrics = list(metrics)
+
+        blocks, causes = [], []
+        for segment in segments:
+            records = segment.records()
+            records = records[records["primary_cause"] != NO_INDEX]
+            if not len(records):
+                continue
+            # Map this segment's metric columns onto the requested layout
+            block = np.full((len(records), len(metrics)), np.nan)
+            column = {metric: index for index, metric in enumerate(segment.metrics)}
+            for target, metric in enumerate(metrics):
+                if metric in column:
+                    block[:, target] = records["metrics"][:, column[metric]]
+            blocks.append(block)
+            causes += [segment.causes[index] for index in records["primary_cause"].tolist()]
+
+        matrix = np.vstack(blocks) if blocks else np.zeros((0, len(metrics)))
+        return metrics, matrix, causes
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable summary of the log"""
+        segments = self.segments()
+        counts = [segment.record_count() for segment in segments]
+        return {
+            "directory": self.directory,
+            "segments": len(segments),
+            "records": sum(counts),
+            "bytes": sum(os.path.getsize(segment.path) for segment in segments),
+            "latest_schema": {
+                "metrics": len(segments[-1].metrics),
+                "causes": len(segments[-1].causes),
+                "actions": len(segments[-1].actions)
+            } if segments else None
+        }
+
+def config_vocabulary() -> Tuple[List[str], List[str], List[str]]:
+    """Metric, cause and remediation action names of the active analysis configuration"""
+    config = analysis_config.snapshot
+    causes = list(config.rule_engine.causes) + [cause for cause in config.blueprints
+                                                if cause not in config.rule_engine.causes]
+    actions = sorted({action["action"] for actions in config.blueprints.values() for action in actions})
+    # Windowed features ("<metric>.<feature>") are logged alongside the metrics they describe
+    metrics = list(config.threshold_engine.metrics)
+    metrics += [feature_name(metric, feature) for metric in config.threshold_engine.metrics for feature in FEATURES]
+    metrics += [metric for metric in dict.fromkeys(config.rule_engine.metrics) if metric not in metrics]
+    return metrics, causes, actions
+
+# Global outcome log (OUTCOME_LOG_DIR enables it)
+outcome_log = (OutcomeLog(os.getenv("OUTCOME_LOG_DIR"), vocabulary=config_vocabulary)
+               if os.getenv("OUTCOME_LOG_DIR") else None)
@@ -3,105 +3,209 @@ Probabilistic Root Cause Analyzer
 Inspired by quantum superposition principle for anomaly analysis
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import math
+import os
 
-def analyze_root_cause(metrics: Dict[str, float]) -> Dict[str, float]:
-    """
-    Analyze root cause probabilities based on metric combinations.
-    Uses rule-based engine to determine potential causes and their probabilities.
-    
-    Args:
-        metrics: Dictionary of metric names and their current values
-        
-    Returns:
-        Dictionary of potential root causes with their probabilities (0.0-1.0)
-    """
-    probabilities = {}
-    
+import numpy as np
+
+from services.analysis_config import ConfigSnapshot, analysis_config
+from services.root_cause_model import root_cause_model
+from services.ttl_cache import TTLCache
+
+# "bayes": posteriors of the learned root cause model; "rules": normalized rule weights
+ROOT_CAUSE_INFERENCE = os.getenv("ROOT_CAUSE_INFERENCE", "bayes").lower()
+
+# Default root cause rule table (the "root_cause_rules" config section overrides it).
+# Each rule adds its cause weights when "<metric> <op> <threshold>"; rules sharing a
+# group (the metric by default) form an if/elif chain where only the first match fires.
+# A missing metric reads as "default" (0 unless given).
+ROOT_CAUSE_RULES: List[Dict] = [
     # CPU Usage Analysis
-    cpu_usage = metrics.get("cpu_usage", 0)
-    if cpu_usage > 90:
-        probabilities["database_load"] = probabilities.get("database_load", 0) + 0.5
-        probabilities["inefficient_query"] = probabilities.get("inefficient_query", 0) + 0.3
-        probabilities["resource_exhaustion"] = probabilities.get("resource_exhaustion", 0) + 0.2
-    elif cpu_usage > 75:
-        probabilities["database_load"] = probabilities.get("database_load", 0) + 0.3
-        probabilities["inefficient_query"] = probabilities.get("inefficient_query", 0) + 0.2
+    {"metric": "cpu_usage", "op": ">", "threshold": 90,
+     "causes": {"database_load": 0.5, "inefficient_query": 0.3, "resource_exhaustion": 0.2}},
+    {"metric": "cpu_usage", "op": ">", "threshold": 75,
+     "causes": {"database_load": 0.3, "inefficient_query": 0.2}},
     
     # Memory Usage Analysis
-    memory_usage = metrics.get("memory_usage", 0)
-    if memory_usage > 85:
-        probabilities["memory_leak"] = probabilities.get("memory_leak", 0) + 0.4
-        probabilities["database_load"] = probabilities.get("database_load", 0) + 0.3
-        probabilities["resource_exhaustion"] = probabilities.get("resource_exhaustion", 0) + 0.3
-    elif memory_usage > 70:
-        probabilities["memory_leak"] = probabilities.get("memory_leak", 0) + 0.2
-        probabilities["database_load"] = probabilities.get("database_load", 0) + 0.2
+    {"metric": "memory_usage", "op": ">", "threshold": 85,
+     "causes": {"memory_leak": 0.4, "database_load": 0.3, "resource_exhaustion": 0.3}},
+    {"metric": "memory_usage", "op": ">", "threshold": 70,
+     "causes": {"memory_leak": 0.2, "database_load": 0.2}},
     
     # API Latency Analysis
-    api_latency = metrics.get("api_latency_p99", 0)
-    if api_latency > 800:
-        probabilities["network_issue"] = probabilities.get("network_issue", 0) + 0.4
-        probabilities["database_load"] = probabilities.get("database_load", 0) + 0.4
-        probabilities["inefficient_query"] = probabilities.get("inefficient_query", 0) + 0.2
-    elif api_latency > 500:
-        probabilities["network_issue"] = probabilities.get("network_issue", 0) + 0.2
-        probabilities["database_load"] = probabilities.get("database_load", 0) + 0.3
+    {"metric": "api_latency_p99", "op": ">", "threshold": 800,
+     "causes": {"network_issue": 0.4, "database_load": 0.4, "inefficient_query": 0.2}},
+    {"metric": "api_latency_p99", "op": ">", "threshold": 500,
+     "causes": {"network_issue": 0.2, "database_load": 0.3}},
     
     # Network I/O Analysis
-    network_io = metrics.get("network_io", 0)
-    if network_io > 1000:
-        probabilities["network_issue"] = probabilities.get("network_issue", 0) + 0.3
-        probabilities["ddos_attack"] = probabilities.get("ddos_attack", 0) + 0.2
-        probabilities["high_traffic"] = probabilities.get("high_traffic", 0) + 0.3
+    {"metric": "network_io", "op": ">", "threshold": 1000,
+     "causes": {"network_issue": 0.3, "ddos_attack": 0.2, "high_traffic": 0.3}},
     
     # Active Users Analysis
-    active_users = metrics.get("active_users", 0)
-    if active_users > 10000:
-        probabilities["high_traffic"] = probabilities.get("high_traffic", 0) + 0.4
-        probabilities["database_load"] = probabilities.get("database_load", 0) + 0.3
-        probabilities["resource_exhaustion"] = probabilities.get("resource_exhaustion", 0) + 0.2
+    {"metric": "active_users", "op": ">", "threshold": 10000,
+     "causes": {"high_traffic": 0.4, "database_load": 0.3, "resource_exhaustion": 0.2}},
     
     # Database Connections Analysis
-    db_connections = metrics.get("database_connections", 0)
-    if db_connections > 80:
-        probabilities["database_load"] = probabilities.get("database_load", 0) + 0.5
-        probabilities["connection_pool_exhaustion"] = probabilities.get("connection_pool_exhaustion", 0) + 0.3
-    
-    # Cache Hit Rate Analysis
-    cache_hit_rate = metrics.get("cache_hit_rate", 100)
-    if cache_hit_rate < 50:
-        probabilities["cache_miss"] = probabilities.get("cache_miss", 0) + 0.4
-        probabilities["database_load"] = probabilities.get("database_load", 0) + 0.3
-    elif cache_hit_rate < 65:
-        probabilities["cache_miss"] = probabilities.get("cache_miss", 0) + 0.2
+    {"metric": "database_connections", "op": ">", "threshold": 80,
+     "causes": {"database_load": 0.5, "connection_pool_exhaustion": 0.3}},
+    
+    # Cache Hit Rate Analysis (a missing hit rate reads as a perfect cache)
+    {"metric": "cache_hit_rate", "op": "<", "threshold": 50, "default": 100,
+     "causes": {"cache_miss": 0.4, "database_load": 0.3}},
+    {"metric": "cache_hit_rate", "op": "<", "threshold": 65, "default": 100,
+     "causes": {"cache_miss": 0.2}},
     
     # Error Rate Analysis
-    error_rate = metrics.get("error_rate", 0)
-    if error_rate > 5.0:
-        probabilities["application_bug"] = probabilities.get("application_bug", 0) + 0.4
-        probabilities["database_load"] = probabilities.get("database_load", 0) + 0.2
-        probabilities["resource_exhaustion"] = probabilities.get("resource_exhaustion", 0) + 0.2
-    elif error_rate > 2.0:
-        probabilities["application_bug"] = probabilities.get("application_bug", 0) + 0.2
+    {"metric": "error_rate", "op": ">", "threshold": 5.0,
+     "causes": {"application_bug": 0.4, "database_load": 0.2, "resource_exhaustion": 0.2}},
+    {"metric": "error_rate", "op": ">", "threshold": 2.0,
+     "causes": {"application_bug": 0.2}},
     
     # Disk Usage Analysis
-    disk_usage = metrics.get("disk_usage", 0)
-    if disk_usage > 90:
-        probabilities["disk_space"] = probabilities.get("disk_space", 0) + 0.4
-        probabilities["log_overflow"] = probabilities.get("log_overflow", 0) + 0.3
-    elif disk_usage > 80:
-        probabilities["disk_space"] = probabilities.get("disk_space", 0) + 0.2
-    
-    # Normalize probabilities to sum to 1.0
-    total = sum(probabilities.values())
-    if total > 0:
-        normalized = {cause: round(p / total, 3) for cause, p in probabilities.items()}
-        # Sort by probability (highest first)
-        return dict(sorted(normalized.items(), key=lambda x: x[1], reverse=True))
-    
-    return {}
+    {"metric": "disk_usage", "op": ">", "threshold": 90,
+     "causes": {"disk_space": 0.4, "log_overflow": 0.3}},
+    {"metric": "disk_usage", "op": ">", "threshold": 80,
+     "causes": {"disk_space": 0.2}},
+
+    # Windowed trend features (services/metric_features.py); absent, so never firing,
+    # until a metric has a window of history
+    # Steady growth that stays high is a leak; a lone jump above the recent baseline is load
+    {"metric": "memory_usage.trend", "op": ">", "threshold": 0.8,
+     "causes": {"memory_leak": 0.5}},
+    {"metric": "memory_usage.time_above", "op": ">", "threshold": 240,
+     "causes": {"memory_leak": 0.3, "resource_exhaustion": 0.1}},
+    {"metric": "memory_usage.zscore", "op": ">", "threshold": 3,
+     "causes": {"high_traffic": 0.3, "resource_exhaustion": 0.2}},
+    {"metric": "active_users.trend", "op": ">", "threshold": 0.8,
+     "causes": {"high_traffic": 0.4}},
+    {"metric": "active_users.zscore", "op": ">", "threshold": 3,
+     "causes": {"high_traffic": 0.4, "ddos_attack": 0.1}},
+    {"metric": "request_rate.zscore", "op": ">", "threshold": 3,
+     "causes": {"high_traffic": 0.3, "ddos_attack": 0.2}},
+]
+
+# Root cause results keyed by the set of fired rules (0 disables caching)
+root_cause_cache = TTLCache(
+    maxsize=int(os.getenv("ROOT_CAUSE_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("ROOT_CAUSE_CACHE_TTL", "300"))
+)
+
+def _cache_key(config: ConfigSnapshot, fired: Tuple[int, ...]) -> Tuple:
+    """
+    Cache key of a snapshot: the rules it fires, plus everything else the result depends on.
+    
+    Rule thresholds cut each metric into buckets, and the results only depend on which
+    rules fire, so snapshots with the same fired rules get identical results: cache hits
+    are exact, not approximate.
+    """
+    model_version = 0 if ROOT_CAUSE_INFERENCE == "rules" else root_cause_model.version
+    return (config.rule_engine.signature, ROOT_CAUSE_INFERENCE, model_version, fired)
+
+def _summarize(probabilities: Dict[str, float]) -> Dict[str, object]:
+    return {
+        "probabilities": probabilities,
+        "confidence": get_superposition_confidence(probabilities),
+        "recommendations": get_quantum_recommendations(probabilities)
+    }
+
+def _copy_summary(summary: Dict[str, object]) -> Dict[str, object]:
+    """Callers get their own containers so cached entries cannot be modified"""
+    return {
+        "probabilities": dict(summary["probabilities"]),
+        "confidence": summary["confidence"],
+        "recommendations": list(summary["recommendations"])
+    }
+
+def analyze_root_cause_summary(metrics: Dict[str, float], config: Optional[ConfigSnapshot] = None) -> Dict[str, object]:
+    """
+    Root cause probabilities with their confidence and recommendations, cached.
+    
+    Args:
+        metrics: Dictionary of metric names and their current values
+        config: Configuration snapshot providing the rule table (defaults to the active one)
+        
+    Returns:
+        {"probabilities", "confidence", "recommendations"}
+    """
+    config = config or analysis_config.snapshot
+    engine = config.rule_engine
+    fired = tuple(engine.fired_rules(metrics))
+    key = _cache_key(config, fired)
+    summary = root_cause_cache.get(key)
+    if summary is None:
+        if ROOT_CAUSE_INFERENCE == "rules":
+            probabilities = engine.analyze(metrics)
+        else:
+            indicators = np.zeros((1, len(engine.rules)), dtype=np.float64)
+            indicators[0, list(fired)] = 1.0
+            probabilities = root_cause_model.infer_fired(indicators, config)[0]
+        summary = _summarize(probabilities)
+        root_cause_cache.set(key, summary)
+    return _copy_summary(summary)
+
+def analyze_root_cause(metrics: Dict[str, float], config: Optional[ConfigSnapshot] = None) -> Dict[str, float]:
+    """
+    Analyze root cause probabilities based on metric combinations.
+    Evaluates the compiled root cause rule table; by default the fired rules are the
+    evidence of a naive Bayes model learned from confirmed causes, otherwise
+    (ROOT_CAUSE_INFERENCE=rules) the fired rule weights are normalized directly.
+    Results are cached per set of fired rules.
+    
+    Args:
+        metrics: Dictionary of metric names and their current values
+        config: Configuration snapshot providing the rule table (defaults to the active one)
+        
+    Returns:
+        Dictionary of potential root causes with their probabilities (0.0-1.0)
+    """
+    return analyze_root_cause_summary(metrics, config)["probabilities"]
+
+def analyze_root_cause_matrix(matrix: np.ndarray, metrics: Sequence[str],
+                              config: Optional[ConfigSnapshot] = None) -> List[Dict[str, float]]:
+    """
+    Batched analyze_root_cause for many entities at once.
+    
+    Entities are grouped by their fired-rule pattern; each distinct pattern is looked
+    up in the cache and only the missing ones are inferred, in one batch.
+    
+    Args:
+        matrix: entities x metrics values (NaN for missing)
+        metrics: Metric names in matrix column order
+        config: Configuration snapshot providing the rule table (defaults to the active one)
+        
+    Returns:
+        One dictionary of root cause probabilities per matrix row
+    """
+    config = config or analysis_config.snapshot
+    engine = config.rule_engine
+    if not len(matrix):
+        return []
+    fired = engine.fired(matrix, metrics)
+    # Group identical rows through their packed bit patterns (much faster than np.unique(axis=0))
+    packed = np.ascontiguousarray(np.packbits(fired.astype(np.uint8), axis=1))
+    codes = packed.view(np.dtype((np.void, packed.shape[1]))).reshape(-1)
+    _, first_rows, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    patterns = fired[first_rows]
+    fired_columns = np.nonzero(patterns)[1].tolist()
+    keys, offset = [], 0
+    for count in patterns.sum(axis=1).astype(np.intp).tolist():
+        keys.append(_cache_key(config, tuple(fired_columns[offset:offset + count])))
+        offset += count
+    summaries = [root_cause_cache.get(key) for key in keys]
+    
+    missing = [index for index, summary in enumerate(summaries) if summary is None]
+    if missing:
+        if ROOT_CAUSE_INFERENCE == "rules":
+            results = engine.analyze_fired(patterns[missing])
+        else:
+            results = root_cause_model.infer_fired(patterns[missing], config)
+        for index, probabilities in zip(missing, results):
+            summaries[index] = _summarize(probabilities)
+            root_cause_cache.set(keys[index], summaries[index])
+    
+    return [dict(summaries[index]["probabilities"]) for index in inverse.reshape(-1).tolist()]
 
 def get_superposition_confidence(probabilities: Dict[str, float]) -> float:
     """
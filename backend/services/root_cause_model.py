@@ -0,0 +1,242 @@
+"""
+Bayesian Root Cause Model
+Naive Bayes inference over root cause rule indicators, learned online from confirmed causes
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from services.analysis_config import ConfigSnapshot, analysis_config
+from services.rule_engine import RuleEngine
+
+logger = logging.getLogger(__name__)
+
+class BayesianRootCauseModel:
+    """
+    Naive Bayes over which root cause rules fired
+
+    Each snapshot is reduced to a binary vector x with one entry per rule of
+    the active rule table. For every cause c the model keeps the number of
+    confirmed observations N_c and, per rule r, how often that rule had
+    fired when c was confirmed (F_cr). With additive smoothing a:
+
+        P(c)        = (N_c + a) / (N + C a)
+        P(r | c)    = (F_cr + a) / (N_c + 2a)
+        P(c | x)    ~ P(c) * prod_{r fired} P(r | c)
+
+    Only rules that fired are evidence. The rule table lists symptoms, most
+    of which are absent at any time; counting every absent symptom against
+    a cause would favour the causes with the fewest rules. Inference is one
+    matrix product of the indicator matrix with the per-cause log
+    likelihoods plus a softmax, for one snapshot or a whole batch of
+    entities.
+
+    Before any outcomes are observed the counts are seeded from the rule
+    table: every cause gets prior_strength pseudo-observations (a uniform
+    prior), in prior_strength * weight of which each of its rules fired.
+    A single fired rule therefore ranks causes by their weight in it,
+    as the rules themselves do. Confirmed (snapshot, cause) pairs from the
+    cognition engine then update the counts online. When the rule table
+    changes the indicators change meaning, so the model is reseeded from
+    the new table.
+    """
+
+    def __init__(self, prior_strength: float = 5.0, smoothing: float = 0.1, min_probability: float = 0.005):
+        """
+        Initialize the model
+
+        Args:
+            prior_strength: Seed pseudo-observations per cause (its rules fired in weight of them)
+            smoothing: Additive smoothing of priors and likelihoods
+            min_probability: Causes with a smaller posterior are left out of results
+        """
+        self.prior_strength = prior_strength
+        self.smoothing = smoothing
+        self.min_probability = min_probability
+        self._lock = threading.RLock()
+        self.signature: Optional[str] = None
+        self.causes: List[str] = []
+        self._cause_index: Dict[str, int] = {}
+        self._class_counts = np.zeros(0, dtype=np.float64)
+        self._feature_counts = np.zeros((0, 0), dtype=np.float64)
+        self._parameters = None
+        self.observations = 0
+        self.version = 0
+
+    def _ensure(self, engine: RuleEngine) -> None:
+        """Seed the counts from the rule table the first time it is seen"""
+        if engine.signature != self.signature:
+            with self._lock:
+                if engine.signature != self.signature:
+                    self.reset(engine)
+
+    def reset(self, engine: RuleEngine) -> None:
+        """
+        Discard learned counts and reseed them from a rule table
+
+        Args:
+            engine: The compiled rule table the indicators come from
+        """
+        with self._lock:
+            if self.signature is not None:
+                logger.info(f"Root cause rules changed ({self.signature} -> {engine.signature}), reseeding model")
+            self.signature = engine.signature
+            self.causes = list(engine.causes)
+            self._cause_index = {cause: index for index, cause in enumerate(self.causes)}
+            self._feature_counts = self.prior_strength * engine.weights.T.copy()
+            self._class_counts = np.full(len(self.causes), self.prior_strength, dtype=np.float64)
+            self.observations = 0
+            self._changed()
+
+    def _changed(self) -> None:
+        self._parameters = None
+        self.version += 1
+
+    def _index_of(self, cause: str) -> int:
+        """Column of a cause, adding an unseeded cause the first time it is confirmed"""
+        index = self._cause_index.get(cause)
+        if index is None:
+            index = len(self.causes)
+            self.causes.append(cause)
+            self._cause_index[cause] = index
+            self._class_counts = np.append(self._class_counts, 0.0)
+            self._feature_counts = np.vstack([self._feature_counts, np.zeros(self._feature_counts.shape[1])])
+        return index
+
+    def observe(self, metrics: Dict[str, float], cause: str, config: Optional[ConfigSnapshot] = None) -> None:
+        """
+        Learn from one confirmed root cause
+
+        Args:
+            metrics: The snapshot the cause was confirmed for
+            cause: The confirmed root cause
+            config: Configuration snapshot providing the rule table (defaults to the active one)
+        """
+        engine = (config or analysis_config.snapshot).rule_engine
+        self._ensure(engine)
+        fired = engine.fired_rules(metrics)
+        with self._lock:
+            index = self._index_of(cause)
+            self._class_counts[index] += 1.0
+            self._feature_counts[index, fired] += 1.0
+            self.observations += 1
+            self._changed()
+
+    def fit(self, matrix: np.ndarray, metrics: Sequence[str], causes: Sequence[str],
+            config: Optional[ConfigSnapshot] = None) -> None:
+        """
+        Reseed the model and learn from a batch of confirmed root causes
+
+        Args:
+            matrix: samples x metrics values (NaN for missing)
+            metrics: Metric names in matrix column order
+            causes: Confirmed cause per sample
+            config: Configuration snapshot providing the rule table (defaults to the active one)
+        """
+        engine = (config or analysis_config.snapshot).rule_engine
+        fired = engine.fired(matrix, metrics) if len(causes) else np.zeros((0, len(engine.rules)))
+        with self._lock:
+            self.reset(engine)
+            rows = np.array([self._index_of(cause) for cause in causes], dtype=np.intp)
+            np.add.at(self._class_counts, rows, 1.0)
+            np.add.at(self._feature_counts, rows, fired)
+            self.observations = len(causes)
+            self._changed()
+
+    def _log_parameters(self):
+        """(log prior per cause, log-likelihood per rule and cause), cached"""
+        parameters = self._parameters
+        if parameters is None:
+            with self._lock:
+                alpha = self.smoothing
+                class_counts = self._class_counts
+                on = (self._feature_counts + alpha) / (class_counts[:, None] + 2 * alpha)
+                log_prior = np.log((class_counts + alpha) / (class_counts.sum() + alpha * len(class_counts)))
+                parameters = (log_prior, np.log(on).T.copy(), list(self.causes))
+                self._parameters = parameters
+        return parameters
+
+    def _results(self, fired: np.ndarray) -> List[Dict[str, float]]:
+        """Posterior cause probabilities for a samples x rules indicator matrix"""
+        base, ratios, causes = self._log_parameters()
+        logits = fired @ ratios + base
+        logits -= logits.max(axis=1, keepdims=True)
+        posteriors = np.exp(logits)
+        posteriors /= posteriors.sum(axis=1, keepdims=True)
+
+        # Rows where nothing fired have nothing to explain
+        kept = (posteriors >= self.min_probability) & fired.any(axis=1, keepdims=True)
+        order = np.argsort(-posteriors, axis=1, kind="stable")
+        counts = kept.sum(axis=1).tolist()
+        ranked_causes = np.array(causes, dtype=object)[order].tolist()
+        ranked_posteriors = np.take_along_axis(np.round(posteriors, 3), order, axis=1).tolist()
+        return [dict(zip(row_causes[:count], row_posteriors[:count]))
+                for row_causes, row_posteriors, count in zip(ranked_causes, ranked_posteriors, counts)]
+
+    def infer(self, metrics: Dict[str, float], config: Optional[ConfigSnapshot] = None) -> Dict[str, float]:
+        """
+        Posterior root cause probabilities for one snapshot
+
+        Args:
+            metrics: metric -> value
+            config: Configuration snapshot providing the rule table (defaults to the active one)
+
+        Returns:
+            {cause: probability}, highest first; empty if no rule fired
+        """
+        engine = (config or analysis_config.snapshot).rule_engine
+        self._ensure(engine)
+        fired = np.zeros((1, len(engine.rules)), dtype=np.float64)
+        fired[0, engine.fired_rules(metrics)] = 1.0
+        return self._results(fired)[0]
+
+    def infer_matrix(self, matrix: np.ndarray, metrics: Sequence[str],
+                     config: Optional[ConfigSnapshot] = None) -> List[Dict[str, float]]:
+        """
+        Posterior root cause probabilities for a batch of samples
+
+        Args:
+            matrix: samples x metrics values (NaN for missing)
+            metrics: Metric names in matrix column order
+            config: Configuration snapshot providing the rule table (defaults to the active one)
+
+        Returns:
+            One {cause: probability} dict per sample, highest first
+        """
+        engine = (config or analysis_config.snapshot).rule_engine
+        if not len(matrix):
+            return []
+        return self.infer_fired(engine.fired(matrix, metrics), config)
+
+    def infer_fired(self, fired: np.ndarray, config: Optional[ConfigSnapshot] = None) -> List[Dict[str, float]]:
+        """
+        Posterior root cause probabilities for a batch of fired-rule indicators
+
+        Args:
+            fired: samples x rules matrix of 0/1 from the config's rule engine
+            config: Configuration snapshot providing the rule table (defaults to the active one)
+
+        Returns:
+            One {cause: probability} dict per sample, highest first
+        """
+        self._ensure((config or analysis_config.snapshot).rule_engine)
+        return self._results(fired)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable summary of the learned counts"""
+        with self._lock:
+            return {
+                "version": self.version,
+                "rules_signature": self.signature,
+                "observations": self.observations,
+                "prior_strength": self.prior_strength,
+                "smoothing": self.smoothing,
+                "class_counts": {cause: round(float(count), 3)
+                                 for cause, count in zip(self.causes, self._class_counts.tolist())}
+            }
+
+# Global root cause model instance
+root_cause_model = BayesianRootCauseModel()
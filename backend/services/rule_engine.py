@@ -0,0 +1,260 @@
+"""
+Root Cause Rule Engine
+Compiles a declarative rule table into a weight matrix for vectorized root cause scoring
+"""
+
+import hashlib
+import json
+import math
+import operator
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Supported rule comparators
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+def _normalize(weights: Dict[str, float]) -> Dict[str, float]:
+    """Scale cause weights to sum to 1, highest first (ties keep insertion order)"""
+    total = sum(weights.values())
+    if total <= 0:
+        return {}
+    normalized = {cause: round(weight / total, 3) for cause, weight in weights.items()}
+    return dict(sorted(normalized.items(), key=lambda item: item[1], reverse=True))
+
+class RuleEngine:
+    """
+    Vectorized evaluation of a root cause rule table
+
+    Each rule reads as "if <metric> <op> <threshold>, add these weights to
+    these causes". Rules that share a group form an if/elif chain: only
+    the first matching rule of a group (in table order) fires. The group
+    defaults to the metric name, so consecutive tiers for one metric are
+    mutually exclusive.
+
+    Compilation turns the table into a rules x causes weight matrix;
+    scoring a batch of samples is a comparison against the threshold
+    vector, an elif mask and one matrix product:
+
+        scores = fired(samples) @ weights
+
+    The product is accumulated rule by rule so every cause sums its
+    weights in table order; results are then bit-identical to evaluating
+    the rules one by one, which is what analyze() does for a single
+    snapshot (NumPy call overhead outweighs a dozen comparisons there).
+
+    Causes are reported in the order the table first introduces them for
+    the fired rules, which keeps ties ordered as the rules are written.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        """
+        Compile a rule table
+
+        Args:
+            rules: [{"metric", "op", "threshold", "causes": {cause: weight},
+                     "group" (optional), "default" (optional value for a missing metric)}]
+
+        Raises:
+            ValueError: If a rule is malformed
+        """
+        self.rules = rules
+        # Identifies the table layout for models trained on its rule indicators
+        self.signature = hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        self.causes: List[str] = []
+        cause_index: Dict[str, int] = {}
+        for index, rule in enumerate(rules):
+            _validate_rule(rule, index)
+            for cause in rule["causes"]:
+                if cause not in cause_index:
+                    cause_index[cause] = len(self.causes)
+                    self.causes.append(cause)
+
+        count = len(rules)
+        self.metrics: List[str] = [rule["metric"] for rule in rules]
+        self.thresholds = np.array([float(rule["threshold"]) for rule in rules], dtype=np.float64)
+        self.defaults = np.array([float(rule.get("default", 0.0)) for rule in rules], dtype=np.float64)
+        operators = [rule["op"] for rule in rules]
+        self._operator_masks = {op: np.array([o == op for o in operators], dtype=bool) for op in OPERATORS}
+
+        # weights[r, c]: weight rule r adds to cause c
+        # order[r, c]: position of (rule r, cause c) in the table, used to order tied causes
+        self.weights = np.zeros((count, len(self.causes)), dtype=np.float64)
+        self.order = np.full((count, len(self.causes)), np.iinfo(np.int64).max, dtype=np.int64)
+        position = 0
+        for row, rule in enumerate(rules):
+            for cause, weight in rule["causes"].items():
+                self.weights[row, cause_index[cause]] = float(weight)
+                self.order[row, cause_index[cause]] = position
+                position += 1
+
+        # Single-snapshot form: (metric, comparator, threshold, default, group, causes)
+        groups = [rule.get("group", rule["metric"]) for rule in rules]
+        self._compiled = [
+            (rule["metric"], OPERATORS[rule["op"]], float(rule["threshold"]), float(rule.get("default", 0.0)),
+             group, [(cause, float(weight)) for cause, weight in rule["causes"].items()])
+            for rule, group in zip(rules, groups)
+        ]
+
+        # earlier[p, r]: rule p precedes rule r in the same elif group
+        self.earlier = np.array([[p < r and groups[p] == groups[r] for r in range(count)]
+                                 for p in range(count)], dtype=np.float64).reshape(count, count)
+        self._columns_cache: Dict[Tuple[str, ...], np.ndarray] = {}
+
+    def _gather(self, matrix: np.ndarray, metrics: Sequence[str]) -> np.ndarray:
+        """Rearrange samples x metrics columns into samples x rules values (defaults where missing)"""
+        key = tuple(metrics)
+        columns = self._columns_cache.get(key)
+        if columns is None:
+            index = {metric: column for column, metric in enumerate(key)}
+            # Rules on metrics absent from the layout read the extra all-NaN column
+            columns = np.array([index.get(metric, len(key)) for metric in self.metrics], dtype=np.intp)
+            self._columns_cache[key] = columns
+        padded = np.hstack([matrix, np.full((len(matrix), 1), np.nan)])
+        values = padded[:, columns]
+        return np.where(np.isnan(values), self.defaults, values)
+
+    def fired(self, matrix: np.ndarray, metrics: Sequence[str]) -> np.ndarray:
+        """
+        Which rules fire for each sample
+
+        Args:
+            matrix: samples x metrics values (NaN for missing)
+            metrics: Metric names in matrix column order
+
+        Returns:
+            samples x rules float matrix of 0/1
+        """
+        values = self._gather(np.asarray(matrix, dtype=np.float64).reshape(-1, len(metrics)), metrics)
+        thresholds = self.thresholds
+        masks = self._operator_masks
+        matched = ((masks[">"] & (values > thresholds)) | (masks[">="] & (values >= thresholds))
+                   | (masks["<"] & (values < thresholds)) | (masks["<="] & (values <= thresholds)))
+        matched = matched.astype(np.float64)
+        # A rule is shadowed when an earlier rule of its group matched
+        return matched * ((matched @ self.earlier) == 0)
+
+    def score(self, fired: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Unnormalized cause weights for a batch of fired-rule indicators
+
+        Args:
+            fired: samples x rules matrix of 0/1 (see fired())
+
+        Returns:
+            (samples x causes weights, samples x causes first-mention order)
+        """
+        scores = np.zeros((len(fired), len(self.causes)), dtype=np.float64)
+        for rule in range(len(self.rules)):
+            scores += fired[:, rule:rule + 1] * self.weights[rule]
+        first = np.where(fired[:, :, None] > 0, self.order[None, :, :], np.iinfo(np.int64).max).min(axis=1)
+        return scores, first
+
+    def analyze_matrix(self, matrix: np.ndarray, metrics: Sequence[str]) -> List[Dict[str, float]]:
+        """
+        Root cause probabilities for a batch of samples
+
+        Args:
+            matrix: samples x metrics values (NaN for missing)
+            metrics: Metric names in matrix column order
+
+        Returns:
+            One {cause: probability} dict per sample, highest probability first
+        """
+        return self.analyze_fired(self.fired(matrix, metrics))
+
+    def analyze_fired(self, fired: np.ndarray) -> List[Dict[str, float]]:
+        """
+        Root cause probabilities for a batch of fired-rule indicators
+
+        Args:
+            fired: samples x rules matrix of 0/1 (see fired())
+
+        Returns:
+            One {cause: probability} dict per sample, highest probability first
+        """
+        scores, first = self.score(fired)
+        if not scores.size:
+            return [{} for _ in range(len(scores))]
+
+        # Totals summed in first-mention order, as the single-snapshot path does
+        mention_order = np.argsort(first, axis=1, kind="stable")
+        ordered = np.take_along_axis(scores, mention_order, axis=1)
+        totals = np.zeros(len(scores), dtype=np.float64)
+        for column in range(ordered.shape[1]):
+            totals += ordered[:, column]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratios = scores / totals[:, None]
+
+        probabilities = np.where(scores > 0, np.round(ratios, 3), 0.0)
+        # np.round scales before rounding, so values within a hair of a rounding boundary
+        # can land on the other side; redo those with Python's correctly rounded round()
+        scaled = ratios * 1000.0
+        for row, column in zip(*np.nonzero((scores > 0) & (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6))):
+            probabilities[row, column] = round(float(ratios[row, column]), 3)
+        ranking = np.lexsort((first, -probabilities), axis=1)
+        counts = (scores > 0).sum(axis=1).tolist()
+        causes = np.array(self.causes, dtype=object)
+        ranked_causes = causes[ranking].tolist()
+        ranked_probabilities = np.take_along_axis(probabilities, ranking, axis=1).tolist()
+        return [dict(zip(row_causes[:count], row_probabilities[:count]))
+                for row_causes, row_probabilities, count in zip(ranked_causes, ranked_probabilities, counts)]
+
+    def analyze(self, metrics: Dict[str, float]) -> Dict[str, float]:
+        """
+        Root cause probabilities for one snapshot
+
+        Args:
+            metrics: metric -> value
+
+        Returns:
+            {cause: probability}, highest probability first
+        """
+        weights: Dict[str, float] = {}
+        compiled = self._compiled
+        for rule in self.fired_rules(metrics):
+            for cause, weight in compiled[rule][5]:
+                weights[cause] = weights.get(cause, 0) + weight
+        return _normalize(weights)
+
+    def fired_rules(self, metrics: Dict[str, float]) -> List[int]:
+        """
+        Indices of the rules that fire for one snapshot, in table order
+
+        Args:
+            metrics: metric -> value
+
+        Returns:
+            Rule indices
+        """
+        fired = []
+        matched_groups = set()
+        for rule, (metric, compare, threshold, default, group, _) in enumerate(self._compiled):
+            if group in matched_groups or not compare(metrics.get(metric, default), threshold):
+                continue
+            matched_groups.add(group)
+            fired.append(rule)
+        return fired
+
+def _validate_rule(rule: Any, index: int) -> None:
+    path = f"root_cause_rules[{index}]"
+    if not isinstance(rule, dict):
+        raise ValueError(f"{path} must be an object")
+    if not isinstance(rule.get("metric"), str):
+        raise ValueError(f"{path}.metric must be a string")
+    if rule.get("op") not in OPERATORS:
+        raise ValueError(f"{path}.op must be one of {list(OPERATORS)}")
+    for field in ("threshold", "default"):
+        if field in rule and (isinstance(rule[field], bool) or not isinstance(rule[field], (int, float))
+                              or not math.isfinite(rule[field])):
+            raise ValueError(f"{path}.{field} must be a finite number")
+    if "threshold" not in rule:
+        raise ValueError(f"{path}.threshold is required")
+    if "group" in rule and not isinstance(rule["group"], str):
+        raise ValueError(f"{path}.group must be a string")
+    causes = rule.get("causes")
+    if not isinstance(causes, dict) or not causes:
+        raise ValueError(f"{path}.causes must be a non-empty object")
+    for cause, weight in causes.items():
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+            raise ValueError(f"{path}.causes.{cause} must be a positive number")
@@ -0,0 +1,199 @@
+"""
+Threshold Engine
+Compiles anomaly thresholds into NumPy arrays and evaluates whole sample matrices at once
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Threshold directions
+DIRECTION_ABOVE = "above"  # Higher is worse (value >= threshold)
+DIRECTION_BELOW = "below"  # Lower is worse (value <= threshold)
+DIRECTION_BAND = "band"    # Outside a [low, high] range is worse
+DIRECTIONS = {DIRECTION_ABOVE, DIRECTION_BELOW, DIRECTION_BAND}
+
+# Level codes returned by evaluate()
+LEVEL_NORMAL = 0
+LEVEL_WARNING = 1
+LEVEL_CRITICAL = 2
+LEVEL_NAMES = {LEVEL_WARNING: "warning", LEVEL_CRITICAL: "critical"}
+
+def _bounds(direction: str, threshold) -> Tuple[float, float]:
+    """
+    Convert one threshold to a (low, high) pair
+
+    A value is past the threshold when value <= low or value >= high, so
+    every direction is evaluated with the same two comparisons.
+    """
+    if direction == DIRECTION_ABOVE:
+        return -math.inf, float(threshold)
+    if direction == DIRECTION_BELOW:
+        return float(threshold), math.inf
+    low, high = threshold
+    return float(low), float(high)
+
+class ThresholdEngine:
+    """
+    Vectorized warning/critical threshold evaluation
+
+    Thresholds are packed into four arrays (warning low/high, critical
+    low/high) with one entry per metric; evaluating a matrix of samples is
+    then four broadcast comparisons regardless of the number of entities.
+    """
+
+    def __init__(self, thresholds: Dict[str, Dict[str, object]],
+                 directions: Optional[Dict[str, str]] = None):
+        """
+        Compile thresholds
+
+        Args:
+            thresholds: metric -> {"warning": t, "critical": t}; for band
+                metrics each t is a [low, high] pair
+            directions: metric -> above, below or band (defaults to above)
+        """
+        directions = directions or {}
+        self.metrics: List[str] = list(thresholds.keys())
+        self.directions: Dict[str, str] = {}
+        self._index: Dict[str, int] = {}
+        bounds = []
+
+        for index, metric in enumerate(self.metrics):
+            direction = directions.get(metric, DIRECTION_ABOVE)
+            if direction not in DIRECTIONS:
+                raise ValueError(f"Unknown threshold direction for {metric}: {direction}")
+            warning_low, warning_high = _bounds(direction, thresholds[metric]["warning"])
+            critical_low, critical_high = _bounds(direction, thresholds[metric]["critical"])
+            self.directions[metric] = direction
+            self._index[metric] = index
+            bounds.append((warning_low, warning_high, critical_low, critical_high))
+
+        # One extra never-firing column for metrics without thresholds
+        bounds.append((-math.inf, math.inf, -math.inf, math.inf))
+        self._bounds = bounds
+        packed = np.array(bounds, dtype=np.float64)
+        self.warning_low, self.warning_high, self.critical_low, self.critical_high = packed.T.copy()
+        self._columns_cache: Dict[Tuple[str, ...], np.ndarray] = {}
+
+    def columns(self, metrics: Sequence[str]) -> np.ndarray:
+        """
+        Map metric names to threshold array indices (cached per column layout)
+
+        Args:
+            metrics: Metric names in matrix column order
+
+        Returns:
+            Index array into the packed threshold arrays
+        """
+        key = tuple(metrics)
+        columns = self._columns_cache.get(key)
+        if columns is None:
+            missing = len(self.metrics)
+            columns = np.array([self._index.get(metric, missing) for metric in key], dtype=np.intp)
+            self._columns_cache[key] = columns
+        return columns
+
+    def evaluate(self, matrix: np.ndarray, metrics: Sequence[str]) -> np.ndarray:
+        """
+        Evaluate a matrix of samples against the thresholds
+
+        Args:
+            matrix: entities x metrics values (NaN for missing)
+            metrics: Metric names in matrix column order
+
+        Returns:
+            int8 matrix of level codes (LEVEL_NORMAL, LEVEL_WARNING, LEVEL_CRITICAL)
+        """
+        columns = self.columns(metrics)
+        with np.errstate(invalid="ignore"):
+            levels = ((matrix <= self.warning_low[columns]) | (matrix >= self.warning_high[columns])).astype(np.int8)
+            levels += (matrix <= self.critical_low[columns]) | (matrix >= self.critical_high[columns])
+        return levels
+
+    def exceedance(self, matrix: np.ndarray, metrics: Sequence[str]) -> np.ndarray:
+        """
+        Relative distance past the warning threshold, in the metric's bad direction
+
+        Args:
+            matrix: entities x metrics values (NaN for missing)
+            metrics: Metric names in matrix column order
+
+        Returns:
+            float64 matrix; 0 where a value is within its warning bounds
+        """
+        columns = self.columns(metrics)
+        low = self.warning_low[columns]
+        high = self.warning_high[columns]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            over = (matrix - high) / np.abs(high)
+            under = (low - matrix) / np.abs(low)
+        return np.nan_to_num(np.maximum(np.fmax(over, under), 0.0), nan=0.0, posinf=0.0, neginf=0.0)
+
+    def level(self, metric: str, value: float) -> int:
+        """
+        Evaluate a single sample without going through NumPy
+
+        Args:
+            metric: The metric name
+            value: The sample value
+
+        Returns:
+            Level code
+        """
+        index = self._index.get(metric)
+        if index is None:
+            return LEVEL_NORMAL
+        warning_low, warning_high, critical_low, critical_high = self._bounds[index]
+        if value <= critical_low or value >= critical_high:
+            return LEVEL_CRITICAL
+        if value <= warning_low or value >= warning_high:
+            return LEVEL_WARNING
+        return LEVEL_NORMAL
+
+    def exceedance_of(self, metric: str, value: float) -> float:
+        """
+        Relative distance of a single sample past its warning threshold
+
+        Args:
+            metric: The metric name
+            value: The sample value
+
+        Returns:
+            (value - threshold) / |threshold| in the bad direction; 0 within bounds
+        """
+        index = self._index.get(metric)
+        if index is None:
+            return 0.0
+        warning_low, warning_high = self._bounds[index][:2]
+        if value >= warning_high and warning_high:
+            return (value - warning_high) / abs(warning_high)
+        if value <= warning_low and warning_low:
+            return (warning_low - value) / abs(warning_low)
+        return 0.0
+
+    def is_clear(self, metric: str, value: float, hysteresis: float = 0.0) -> bool:
+        """
+        Whether a sample is back inside the warning bounds, narrowed by a hysteresis band
+
+        An alert raised at the warning threshold should only clear once the
+        value has moved a margin back towards normal; otherwise a value
+        hovering at the threshold would raise and clear on alternate ticks.
+
+        Args:
+            metric: The metric name
+            value: The sample value
+            hysteresis: Margin as a fraction of each threshold's magnitude
+
+        Returns:
+            True if the value is clear of the narrowed bounds
+        """
+        index = self._index.get(metric)
+        if index is None:
+            return True
+        warning_low, warning_high = self._bounds[index][:2]
+        if math.isfinite(warning_low):
+            warning_low += hysteresis * abs(warning_low)
+        if math.isfinite(warning_high):
+            warning_high -= hysteresis * abs(warning_high)
+        return warning_low < value < warning_high
@@ -0,0 +1,10 @@
+"""
+Test configuration
+Puts the backend directory first on sys.path so the local packages (including
+the websockets package that shadows the pip distribution) are imported
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,72 @@
+"""
+Alert Investigation Tests
+What the alert investigation pipeline learns from a cognition run
+"""
+
+import asyncio
+
+import pytest
+
+from routers import monitoring
+from services import cognition_agents
+from services.analysis_config import analysis_config
+from services.check_runtime import CheckSpec, SingleFlight
+from services.cognition_engine import (STOP_BUDGET, STOP_COMPLETE, STOP_CONFIRMED, CognitionAnalysis,
+                                       CognitionResult)
+from services.ttl_cache import TTLCache
+
+def finished_analysis(stop_reason):
+    analysis = CognitionAnalysis()
+    analysis.add_result(CognitionResult("database_load", True, "slow queries", "high", 0.1))
+    analysis.stop_reason = stop_reason
+    analysis.finalize(elapsed=0.1)
+    return analysis
+
+@pytest.mark.parametrize("stop_reason, learned", [
+    (STOP_COMPLETE, True), (STOP_CONFIRMED, False), (STOP_BUDGET, False)
+])
+def test_model_only_learns_from_complete_investigations(monkeypatch, stop_reason, learned):
+    observed = []
+
+    async def fake_analysis(probabilities, scope=monitoring.DEFAULT_ENTITY):
+        return finished_analysis(stop_reason)
+
+    monkeypatch.setattr(monitoring, "run_parallel_analysis", fake_analysis)
+    monkeypatch.setattr(monitoring, "outcome_log", None)
+    monkeypatch.setattr(monitoring.root_cause_model, "observe",
+                        lambda metrics, cause, config=None: observed.append(cause))
+
+    result = asyncio.run(monitoring.investigate_alerts({"cpu_usage": 95.0}, analysis_config.snapshot))
+    assert result["cognition_summary"]["confirmed_root_cause"] == "database_load"
+    assert observed == (["database_load"] if learned else [])
+
+def test_checks_are_shared_within_an_entity_but_not_across_entities(monkeypatch):
+    runs = []
+
+    async def check_database_load():
+        runs.append(len(runs) + 1)
+        run = len(runs)
+        await asyncio.sleep(0.02)
+        return {"confirmed": True, "details": f"run {run}", "severity": "high"}
+
+    monkeypatch.setitem(cognition_agents.CAUSE_CHECK_MAPPING, "database_load",
+                        CheckSpec(check_database_load, timeout=1.0, cache_ttl=60.0))
+    monkeypatch.setattr(cognition_agents, "check_flight", SingleFlight(TTLCache(maxsize=16)))
+    monkeypatch.setattr(monitoring, "analyze_root_cause_summary", lambda evidence, config: {
+        "probabilities": {"database_load": 0.9}, "confidence": 0.9, "recommendations": []
+    })
+    monkeypatch.setattr(monitoring, "outcome_log", None)
+    monkeypatch.setattr(monitoring.root_cause_model, "observe", lambda metrics, cause, config=None: None)
+
+    async def investigate(entity):
+        result = await monitoring.investigate_alerts({"cpu_usage": 95.0}, analysis_config.snapshot, entity=entity)
+        return result["cognition_summary"]["confirmed_details"]
+
+    async def investigate_fleet():
+        return await asyncio.gather(investigate("-/-/web-1"), investigate("-/-/web-1"), investigate("-/-/web-2"))
+
+    first, coalesced, other = asyncio.run(investigate_fleet())
+    assert first == coalesced
+    assert other != first
+    assert len(runs) == 2
+    assert cognition_agents.check_flight.stats == {"runs": 2, "coalesced": 1}
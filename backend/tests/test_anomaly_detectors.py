@@ -0,0 +1,22 @@
+"""
+Anomaly Detector Tests
+Warm-up behaviour of the streaming detectors
+"""
+
+import pytest
+
+from services.anomaly_detectors import DETECTOR_TYPES, create_detector
+from services.threshold_engine import LEVEL_NORMAL
+
+@pytest.mark.parametrize("kind", sorted(DETECTOR_TYPES))
+def test_zero_warmup_skips_only_the_first_sample(kind):
+    detector = create_detector({"type": kind, "warmup": 0})
+    assert detector.update(10.0) == LEVEL_NORMAL
+    assert detector.score == 0.0
+    detector.update(11.0)
+    assert detector.score > 0.0
+
+@pytest.mark.parametrize("kind", sorted(DETECTOR_TYPES))
+def test_warmup_suppresses_levels(kind):
+    detector = create_detector({"type": kind, "warmup": 3})
+    assert [detector.update(value) for value in (1.0, 100.0, -100.0)] == [LEVEL_NORMAL] * 3
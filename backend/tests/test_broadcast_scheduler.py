@@ -0,0 +1,31 @@
+"""
+Broadcast Scheduler Tests
+Lifecycle of the app-lifetime periodic tick
+"""
+
+import asyncio
+
+from websockets.scheduler import BroadcastScheduler
+
+def test_ticks_from_start_until_stop():
+    ticks = []
+
+    async def tick():
+        ticks.append(len(ticks))
+        return len(ticks)
+
+    async def scenario():
+        scheduler = BroadcastScheduler(tick, interval=0.01)
+        scheduler.start()
+        await asyncio.sleep(0.055)
+        assert scheduler.running
+        await scheduler.stop()
+        assert not scheduler.running
+        stopped_at = len(ticks)
+        await asyncio.sleep(0.03)
+        return scheduler, stopped_at
+
+    scheduler, stopped_at = asyncio.run(scenario())
+    assert stopped_at >= 3
+    assert len(ticks) == stopped_at
+    assert scheduler.latest == stopped_at
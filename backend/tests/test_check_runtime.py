@@ -0,0 +1,146 @@
+"""
+Check Runtime Tests
+Deadlines, hedging and the circuit breaker of cognition checks, with fake checks and a fake clock
+"""
+
+import asyncio
+
+import pytest
+
+from services.check_runtime import (CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, SEVERITY_UNKNOWN,
+                                    CheckSpec, CircuitBreaker)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeCheck:
+    """Async check answering after the next delay in line (or raising), counting its calls"""
+
+    def __init__(self, *delays, error=None):
+        self.delays = list(delays)
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+        self.__name__ = "fake_check"
+
+    async def __call__(self):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)] if self.delays else 0.0
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return {"confirmed": True, "details": f"answer {self.calls}", "severity": "high"}
+
+def make_spec(check, clock=None, failure_threshold=2, reset_timeout=10.0, **options):
+    spec = CheckSpec(check, failure_threshold=failure_threshold, reset_timeout=reset_timeout, **options)
+    if clock is not None:
+        spec.breaker = CircuitBreaker(spec.name, failure_threshold, reset_timeout, clock=clock)
+    return spec
+
+def test_circuit_opens_after_consecutive_failures_and_short_circuits():
+    clock = FakeClock()
+    check = FakeCheck(error=RuntimeError("boom"))
+    spec = make_spec(check, clock)
+
+    for _ in range(2):
+        assert asyncio.run(spec.run())["severity"] == SEVERITY_UNKNOWN
+    assert spec.breaker.state == CIRCUIT_OPEN
+    assert spec.stats["errors"] == 2
+
+    result = asyncio.run(spec.run())
+    assert result["severity"] == SEVERITY_UNKNOWN and "circuit open" in result["details"]
+    assert check.calls == 2
+    assert spec.stats["short_circuited"] == 1
+
+def test_half_open_lets_one_trial_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker("check", failure_threshold=1, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now = 10.0
+    assert breaker.allow()
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    clock.now = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED and breaker.allow()
+
+def test_half_open_check_runs_a_single_trial():
+    clock = FakeClock()
+    check = FakeCheck(0.0, error=RuntimeError("boom"))
+    spec = make_spec(check, clock, failure_threshold=1)
+    asyncio.run(spec.run())
+    assert spec.breaker.state == CIRCUIT_OPEN
+
+    clock.now = 10.0
+    check.error = None
+    check.delays = [0.02]
+
+    async def concurrent_calls():
+        return await asyncio.gather(spec.run(), spec.run())
+
+    trial, refused = asyncio.run(concurrent_calls())
+    assert trial["confirmed"] and refused["severity"] == SEVERITY_UNKNOWN
+    assert check.calls == 2  # the failure, then one trial
+    assert spec.breaker.state == CIRCUIT_CLOSED
+
+def test_cancelled_trial_gives_back_the_slot():
+    clock = FakeClock()
+    check = FakeCheck(0.0, error=RuntimeError("boom"))
+    spec = make_spec(check, clock, failure_threshold=1)
+    asyncio.run(spec.run())
+    clock.now = 10.0
+    check.error = None
+    check.delays = [1.0]
+
+    async def cancel_trial():
+        task = asyncio.create_task(spec.run())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(cancel_trial())
+    assert spec.breaker.state == CIRCUIT_HALF_OPEN
+    assert spec.breaker.allow()
+
+def test_hedge_wins_when_the_first_attempt_is_slow():
+    check = FakeCheck(1.0, 0.0)
+    spec = make_spec(check, timeout=0.5, hedge=True, hedge_min_samples=3)
+    for _ in range(3):
+        spec.latency.observe(0.01)
+    assert spec.hedge_delay() == pytest.approx(0.01, rel=0.3)
+
+    result = asyncio.run(spec.run())
+    assert result == {"confirmed": True, "details": "answer 2", "severity": "high"}
+    assert spec.stats["hedges"] == 1 and spec.stats["hedge_wins"] == 1
+    assert check.cancelled == 1
+    assert spec.breaker.failures == 0
+
+def test_no_hedge_before_calibration():
+    check = FakeCheck(0.02)
+    spec = make_spec(check, timeout=0.5, hedge=True, hedge_min_samples=3)
+    assert asyncio.run(spec.run())["confirmed"]
+    assert spec.stats["hedges"] == 0 and check.calls == 1
+
+def test_timeout_records_a_failure():
+    check = FakeCheck(1.0)
+    spec = make_spec(check, timeout=0.02)
+    result = asyncio.run(spec.run())
+    assert result["severity"] == SEVERITY_UNKNOWN and "timed out" in result["details"]
+    assert spec.stats["timeouts"] == 1
+    assert spec.breaker.failures == 1 and spec.breaker.state == CIRCUIT_CLOSED
+    assert check.cancelled == 1
+    assert spec.latency.count == 1
@@ -0,0 +1,76 @@
+"""
+Connection Manager Tests
+Outbound queue coalescing and eviction of WebSocket connections
+"""
+
+import asyncio
+import gc
+import json
+
+from websockets.manager import TOPIC_SUPERPOSITION, ConnectionManager, OutboundQueue
+
+class FakeWebSocket:
+    """Accepts everything; sends block until released"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.sent = []
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame):
+        await self.release.wait()
+        self.sent.append(json.loads(frame))
+
+    async def send_bytes(self, frame):
+        await self.send_text(frame)
+
+    async def close(self, code=1000, reason=""):
+        await asyncio.sleep(0)
+        self.closed = (code, reason)
+
+def test_queue_only_coalesces_matching_stream_frames():
+    queue = OutboundQueue(maxsize=10)
+    queue.put("reply", None)
+    queue.put("tick-1", (TOPIC_SUPERPOSITION, "system_status"))
+    queue.put("tick-2", (TOPIC_SUPERPOSITION, "system_status"))
+    queue.put("other-stream", ("fleet", "system_status"))
+    assert queue.depth == 3
+    assert queue.coalesced == 1
+
+def test_stream_does_not_replace_status_reply():
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket)
+        await manager.send_personal_message({"type": "system_status", "status": "online"}, websocket)
+        for tick in range(3):
+            await manager.broadcast_stream({"type": "system_status", "tick": tick})
+        websocket.release.set()
+        for _ in range(20):
+            await asyncio.sleep(0)
+        manager.disconnect(websocket)
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+    assert [message.get("status") for message in sent if message["type"] == "system_status"][0] == "online"
+    assert [message.get("tick") for message in sent if "tick" in message] == [2]
+
+def test_evict_keeps_close_task_until_done():
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket)
+        manager._evict(websocket, "test")
+        assert len(manager._close_tasks) == 1
+        gc.collect()
+        await asyncio.gather(*manager._close_tasks)
+        await asyncio.sleep(0)
+        return manager, websocket
+
+    manager, websocket = asyncio.run(scenario())
+    assert websocket.closed == (1013, "test")
+    assert not manager._close_tasks
+    assert not manager.connections
@@ -0,0 +1,27 @@
+"""
+Delta Encoder Tests
+Keyframe scheduling of the delta-encoded broadcast stream
+"""
+
+import pytest
+
+from websockets.delta import DELTA_MESSAGE_TYPE, KEYFRAME_MESSAGE_TYPE, DeltaEncoder
+
+def frame_types(encoder, count):
+    return [encoder.encode({"type": "system_status", "value": float(index)})["type"] for index in range(count)]
+
+def test_periodic_keyframes():
+    assert frame_types(DeltaEncoder(keyframe_interval=3), 6) == [
+        KEYFRAME_MESSAGE_TYPE, DELTA_MESSAGE_TYPE, KEYFRAME_MESSAGE_TYPE,
+        DELTA_MESSAGE_TYPE, DELTA_MESSAGE_TYPE, KEYFRAME_MESSAGE_TYPE
+    ]
+
+def test_zero_interval_disables_periodic_keyframes():
+    encoder = DeltaEncoder(keyframe_interval=0)
+    assert frame_types(encoder, 5) == [KEYFRAME_MESSAGE_TYPE] + [DELTA_MESSAGE_TYPE] * 4
+    encoder.reset()
+    assert frame_types(encoder, 1) == [KEYFRAME_MESSAGE_TYPE]
+
+def test_negative_interval_is_rejected():
+    with pytest.raises(ValueError):
+        DeltaEncoder(keyframe_interval=-1)
@@ -0,0 +1,94 @@
+"""
+Investigation Scheduler Tests
+Probability-ordered cognition checks: concurrency, early stopping and the latency budget
+"""
+
+import asyncio
+
+import pytest
+
+from services import cognition_engine
+from services.cognition_engine import (STOP_BUDGET, STOP_COMPLETE, STOP_CONFIRMED, InvestigationScheduler)
+
+class FakeChecks:
+    """Async checks with fixed delays and verdicts that record starts and cancellations"""
+
+    def __init__(self, checks):
+        self.checks = checks  # cause -> (delay seconds, confirmed)
+        self.started = []
+        self.cancelled = []
+        self.running = 0
+        self.max_running = 0
+
+    def get(self, cause_name, scope):
+        if cause_name not in self.checks:
+            return None
+        delay, confirmed = self.checks[cause_name]
+
+        async def check():
+            self.started.append(cause_name)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.cancelled.append(cause_name)
+                raise
+            finally:
+                self.running -= 1
+            return {"confirmed": confirmed, "details": cause_name, "severity": "high"}
+        return check
+
+@pytest.fixture
+def fake_checks(monkeypatch):
+    def install(checks):
+        fakes = FakeChecks(checks)
+        monkeypatch.setattr(cognition_engine, "get_check_function", fakes.get)
+        return fakes
+    return install
+
+def test_complete_run_checks_every_candidate_in_probability_order(fake_checks):
+    fakes = fake_checks({"a": (0.01, False), "b": (0.01, False), "c": (0.01, False), "d": (0.01, False)})
+    scheduler = InvestigationScheduler(max_concurrency=2, budget=5.0, min_probability=0.1)
+    analysis = asyncio.run(scheduler.run({"c": 0.2, "a": 0.4, "d": 0.05, "b": 0.3}))
+
+    assert analysis.stop_reason == STOP_COMPLETE
+    assert fakes.started == ["a", "b", "c"]  # d is at or below min_probability
+    assert fakes.max_running == 2
+    assert sorted(result.cause for result in analysis.results) == ["a", "b", "c"]
+    assert analysis.cancelled_causes == [] and analysis.skipped_causes == []
+
+def test_confident_confirmation_stops_early(fake_checks):
+    fakes = fake_checks({"a": (0.01, True), "b": (1.0, False), "c": (1.0, False), "d": (1.0, False)})
+    scheduler = InvestigationScheduler(max_concurrency=2, budget=5.0, stop_margin=0.15)
+    analysis = asyncio.run(scheduler.run({"a": 0.6, "b": 0.3, "c": 0.2, "d": 0.15}))
+
+    assert analysis.stop_reason == STOP_CONFIRMED
+    assert [result.cause for result in analysis.confirmed_causes] == ["a"]
+    # b was running when a confirmed; the run stops before a's slot is refilled
+    assert analysis.cancelled_causes == ["b"]
+    assert analysis.skipped_causes == ["c", "d"]
+    assert fakes.started == ["a", "b"]
+    assert fakes.cancelled == ["b"]
+    assert analysis.total_duration < 0.5
+
+def test_close_confirmation_waits_for_the_runner_up(fake_checks):
+    fake_checks({"a": (0.01, True), "b": (0.05, False)})
+    scheduler = InvestigationScheduler(max_concurrency=2, budget=5.0, stop_margin=0.15)
+    analysis = asyncio.run(scheduler.run({"a": 0.5, "b": 0.4}))
+
+    assert analysis.stop_reason == STOP_COMPLETE
+    assert [result.cause for result in analysis.results] == ["a", "b"]
+
+def test_budget_cancels_running_checks(fake_checks):
+    fakes = fake_checks({"a": (1.0, True), "b": (1.0, True), "c": (0.01, False)})
+    scheduler = InvestigationScheduler(max_concurrency=2, budget=0.05)
+    analysis = asyncio.run(scheduler.run({"a": 0.5, "b": 0.3, "c": 0.2}))
+
+    assert analysis.stop_reason == STOP_BUDGET
+    assert analysis.results == []
+    assert analysis.cancelled_causes == ["a", "b"]
+    assert analysis.skipped_causes == ["c"]
+    assert sorted(fakes.cancelled) == ["a", "b"]
+    assert fakes.running == 0
+    assert analysis.total_duration < 0.5
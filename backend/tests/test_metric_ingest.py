@@ -0,0 +1,85 @@
+"""
+Metric Ingest Tests
+Ordering and capacity guarantees of the metric store under batched ingest
+"""
+
+import asyncio
+import json
+import threading
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import ingest
+from services.metric_ingest import ingest_batch
+from services.metric_store import MetricStore
+
+def batch(host, timestamps, **metrics):
+    return {"series": [{"labels": {"host": host}, "timestamps": timestamps, "metrics": metrics}]}
+
+def test_unsorted_batch_is_stored_in_order():
+    store = MetricStore(capacity=8)
+    counts = ingest_batch(store, batch("web-1", [30.0, 10.0, 20.0], cpu_usage=[3.0, 1.0, 2.0]))
+    assert counts["samples"] == 3
+    assert counts["rejected"] == {"out_of_order": 0, "over_limit": 0}
+    timestamps, values = store.window("cpu_usage", entity="-/-/web-1")
+    assert timestamps.tolist() == [10.0, 20.0, 30.0]
+    assert values.tolist() == [1.0, 2.0, 3.0]
+
+def test_samples_older_than_the_series_are_rejected():
+    store = MetricStore(capacity=8)
+    ingest_batch(store, batch("web-1", [10.0, 20.0], cpu_usage=[1.0, 2.0]))
+    counts = ingest_batch(store, batch("web-1", [5.0, 15.0, 20.0, 25.0], cpu_usage=[9.0, 9.0, 3.0, 4.0]))
+    assert counts["samples"] == 2
+    assert counts["rejected"]["out_of_order"] == 2
+    timestamps, _ = store.window("cpu_usage", entity="-/-/web-1")
+    assert (np.diff(timestamps) >= 0).all()
+    assert store.window("cpu_usage", since=18.0, entity="-/-/web-1")[1].tolist() == [2.0, 3.0, 4.0]
+    assert not store.append("cpu_usage", 1.0, timestamp=1.0, entity="-/-/web-1")
+    assert store.rejected["out_of_order"] == 3
+
+@pytest.mark.parametrize("limits", [{"max_series": 3}, {"max_entities": 1}])
+def test_caps_reject_new_series(limits):
+    store = MetricStore(capacity=8, **limits)
+    ingest_batch(store, batch("web-1", [1.0], cpu_usage=[1.0], memory_usage=[2.0]))
+    counts = ingest_batch(store, {"series": [
+        {"labels": {"host": "web-1"}, "timestamps": [2.0], "metrics": {"cpu_usage": [1.0], "disk_usage": [3.0]}},
+        {"labels": {"host": "web-2"}, "timestamps": [2.0, 3.0], "metrics": {"cpu_usage": [1.0, 2.0]}}
+    ]})
+    assert counts["rejected"]["over_limit"] == 2
+    assert store.entities() == ["-/-/web-1"]
+    assert "-/-/web-2" not in store.entity_labels
+    assert store.series_count <= limits.get("max_series", 3)
+
+def test_ingest_response_reports_rejections(monkeypatch):
+    monkeypatch.setattr(ingest, "metric_store", MetricStore(capacity=8))
+    app = FastAPI()
+    app.include_router(ingest.router)
+    client = TestClient(app)
+    client.post("/ingest/batch", json=batch("web-1", [10.0], cpu_usage=[1.0]))
+    body = client.post("/ingest/batch", json=batch("web-1", [5.0, 11.0], cpu_usage=[1.0, 2.0])).json()
+    assert body["samples"] == 1
+    assert body["rejected"] == {"out_of_order": 1, "over_limit": 0}
+    assert client.get("/ingest/status").json()["rejected"]["out_of_order"] == 1
+
+def test_ingest_runs_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def recording_ingest(store, payload):
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        threads.append(threading.current_thread())
+        return ingest_batch(store, payload)
+
+    monkeypatch.setattr(ingest, "metric_store", MetricStore(capacity=8))
+    monkeypatch.setattr(ingest, "ingest_batch", recording_ingest)
+    app = FastAPI()
+    app.include_router(ingest.router)
+    client = TestClient(app)
+    assert client.post("/ingest/batch", json=batch("web-1", [1.0], cpu_usage=[1.0])).json()["samples"] == 1
+    with client.websocket_connect("/ingest/ws") as websocket:
+        websocket.send_text(json.dumps(batch("web-1", [2.0], cpu_usage=[2.0])))
+        assert websocket.receive_json()["samples"] == 1
+    assert len(threads) == 2
@@ -0,0 +1,69 @@
+"""
+Monitoring Router Tests
+Request-level checks of the monitoring HTTP endpoints
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import main
+from routers import monitoring
+from routers.monitoring import router
+from services.entanglement_map import get_causal_graph
+from services.metric_store import MetricStore
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+def test_causal_graph(client):
+    response = client.get("/monitoring/causal-graph")
+    assert response.status_code == 200
+    assert response.json() == get_causal_graph().to_dict()
+
+def test_causal_graph_metric(client):
+    metric = get_causal_graph().nodes[0]
+    response = client.get("/monitoring/causal-graph", params={"metric": metric, "limit": 3})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["metric"] == metric
+    assert len(body["downstream"]) <= 3 and len(body["upstream"]) <= 3
+
+def test_causal_graph_unknown_metric(client):
+    response = client.get("/monitoring/causal-graph", params={"metric": "no_such_metric"})
+    assert response.status_code == 404
+
+def test_lifespan_ticks_without_websocket_clients():
+    with TestClient(main.app) as client:
+        deadline = time.monotonic() + 10.0
+        while monitoring.broadcast_scheduler.latest is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert monitoring.broadcast_scheduler.latest is not None
+        assert monitoring.metric_store.latest()
+        status = client.get("/monitoring/status").json()["broadcast_scheduler"]
+        assert status["running"] and status["subscribers"] == 0
+    assert not monitoring.broadcast_scheduler.running
+
+def test_fleet_investigation_unknown_entity(client):
+    response = client.post("/monitoring/fleet/investigate", params={"entity": "-/-/no-such-host"})
+    assert response.status_code == 404
+
+def test_fleet_investigation_is_scoped_to_the_entity(client, monkeypatch):
+    store = MetricStore(capacity=8)
+    store.append_snapshot({"cpu_usage": 95.0}, 1.0, entity="-/-/web-1")
+    scopes = []
+
+    async def fake_investigation(metrics, config, features=None, entity=monitoring.DEFAULT_ENTITY):
+        scopes.append((metrics, entity))
+        return {}
+
+    monkeypatch.setattr(monitoring, "metric_store", store)
+    monkeypatch.setattr(monitoring, "investigate_alerts", fake_investigation)
+    body = client.post("/monitoring/fleet/investigate", params={"entity": "-/-/web-1"}).json()
+    assert body["entity"] == "-/-/web-1"
+    assert scopes == [({"cpu_usage": 95.0}, "-/-/web-1")]
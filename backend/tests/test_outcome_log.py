@@ -0,0 +1,28 @@
+"""
+Outcome Log Tests
+Segment rollover and record counting of the append-only outcome log
+"""
+
+import numpy as np
+
+from services.outcome_log import OutcomeLog
+
+def append(log, value):
+    log.append({"cpu_usage": value}, {"database_load": 0.9}, ["database_load"], ["database_load"], "database_load")
+
+def test_segments_roll_over_at_the_record_limit(tmp_path):
+    log = OutcomeLog(str(tmp_path), max_segment_records=2)
+    for value in range(5):
+        append(log, float(value))
+    segments = log.segments()
+    assert [segment.record_count() for segment in segments] == [2, 2, 1]
+    assert log.to_dict()["records"] == 5
+    assert np.concatenate([segment.records()["metrics"][:, 0] for segment in segments]).tolist() == [0, 1, 2, 3, 4]
+
+def test_record_count_ignores_a_torn_record(tmp_path):
+    log = OutcomeLog(str(tmp_path))
+    append(log, 1.0)
+    segment = log.segments()[-1]
+    with open(segment.path, "ab") as segment_file:
+        segment_file.write(b"\0" * 3)
+    assert segment.record_count() == len(segment.records()) == 1
@@ -0,0 +1,48 @@
+"""
+Root Cause Model Tests
+The untrained (rule-seeded) Bayesian model against the rule table it is seeded from
+"""
+
+import numpy as np
+import pytest
+
+from services import probabilistic_analyzer
+from services.analysis_config import analysis_config
+from services.cognition_engine import investigation_scheduler
+from services.probabilistic_analyzer import analyze_root_cause_summary
+from services.root_cause_model import BayesianRootCauseModel
+
+@pytest.fixture
+def config():
+    return analysis_config.snapshot
+
+def test_untrained_posterior_ranks_causes_like_a_single_rule(config):
+    engine = config.rule_engine
+    model = BayesianRootCauseModel()
+    for rule in range(len(engine.rules)):
+        fired = np.zeros((1, len(engine.rules)))
+        fired[0, rule] = 1.0
+        rules = engine.analyze_fired(fired)[0]
+        posterior = model.infer_fired(fired, config)[0]
+        others = [p for cause, p in posterior.items() if cause not in rules]
+        for cause, weight in rules.items():
+            assert posterior[cause] > max(others, default=0.0)
+            for other, other_weight in rules.items():
+                if weight > other_weight:
+                    assert posterior[cause] > posterior[other]
+                elif weight == other_weight:
+                    assert posterior[cause] == posterior[other]
+
+def test_untrained_bayes_mode_agrees_with_rules(monkeypatch, config):
+    monkeypatch.setattr(probabilistic_analyzer, "ROOT_CAUSE_INFERENCE", "bayes")
+    monkeypatch.setattr(probabilistic_analyzer, "root_cause_model", BayesianRootCauseModel())
+    probabilistic_analyzer.root_cause_cache.clear()
+    try:
+        probabilities = analyze_root_cause_summary({"cpu_usage": 95.0}, config)["probabilities"]
+    finally:
+        probabilistic_analyzer.root_cause_cache.clear()
+    rules = config.rule_engine.analyze({"cpu_usage": 95.0})
+
+    assert list(probabilities)[:len(rules)] == list(rules)
+    assert min(probabilities[cause] for cause in rules) > investigation_scheduler.min_probability
+    assert all(p < 0.05 for cause, p in probabilities.items() if cause not in rules)
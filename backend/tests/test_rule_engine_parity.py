@@ -0,0 +1,97 @@
+"""
+Rule Engine Parity Tests
+The compiled root cause rule table against the frozen legacy if/elif chain,
+on snapshots fuzzed around every rule threshold
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from services import probabilistic_analyzer
+from services.analysis_config import analysis_config
+from services.metric_features import FEATURE_SEPARATOR
+from services.probabilistic_analyzer import analyze_root_cause, analyze_root_cause_matrix
+from tests.legacy_root_cause import analyze_root_cause as legacy_analyze_root_cause
+
+SAMPLES = 20000
+BATCH = 500
+
+@pytest.fixture
+def engine():
+    return analysis_config.snapshot.rule_engine
+
+@pytest.fixture
+def edges(engine):
+    """Thresholds of every snapshot metric the default table tests (feature rules excluded)"""
+    edges = {}
+    for metric, threshold in zip(engine.metrics, engine.thresholds.tolist()):
+        if FEATURE_SEPARATOR not in metric:
+            edges.setdefault(metric, set()).add(threshold)
+    return {metric: sorted(thresholds) for metric, thresholds in edges.items()}
+
+def fuzz_snapshots(edges, count, seed=17):
+    """Snapshots whose values sit on, just around, or well away from a threshold; some metrics missing"""
+    rng = random.Random(seed)
+    snapshots = []
+    for _ in range(count):
+        snapshot = {}
+        for metric, thresholds in edges.items():
+            if rng.random() < 0.1:
+                continue
+            edge = rng.choice(thresholds)
+            snapshot[metric] = rng.choice((
+                edge, edge + 1e-9, edge - 1e-9, 0.0, 2.0 * edge,
+                edge * rng.uniform(0.8, 1.2)
+            ))
+        snapshots.append(snapshot)
+    return snapshots
+
+def to_matrix(snapshots, metrics):
+    return np.array([[snapshot.get(metric, math.nan) for metric in metrics] for snapshot in snapshots],
+                    dtype=np.float64)
+
+def test_default_table_covers_legacy_metrics(edges):
+    assert edges == {
+        "cpu_usage": [75.0, 90.0],
+        "memory_usage": [70.0, 85.0],
+        "api_latency_p99": [500.0, 800.0],
+        "network_io": [1000.0],
+        "active_users": [10000.0],
+        "database_connections": [80.0],
+        "cache_hit_rate": [50.0, 65.0],
+        "error_rate": [2.0, 5.0],
+        "disk_usage": [80.0, 90.0]
+    }
+
+def test_analyze_matches_legacy(engine, edges):
+    for snapshot in fuzz_snapshots(edges, SAMPLES):
+        expected = legacy_analyze_root_cause(snapshot)
+        assert list(engine.analyze(snapshot).items()) == list(expected.items()), snapshot
+
+def test_analyze_matrix_matches_legacy(engine, edges):
+    snapshots = fuzz_snapshots(edges, SAMPLES, seed=29)
+    metrics = list(edges)
+    for start in range(0, len(snapshots), BATCH):
+        batch = snapshots[start:start + BATCH]
+        results = engine.analyze_matrix(to_matrix(batch, metrics), metrics)
+        for snapshot, result in zip(batch, results):
+            expected = legacy_analyze_root_cause(snapshot)
+            assert list(result.items()) == list(expected.items()), snapshot
+
+def test_cached_rules_mode_matches_legacy(monkeypatch, edges):
+    """The public (cached) entry points in ROOT_CAUSE_INFERENCE=rules mode"""
+    monkeypatch.setattr(probabilistic_analyzer, "ROOT_CAUSE_INFERENCE", "rules")
+    probabilistic_analyzer.root_cause_cache.clear()
+    try:
+        snapshots = fuzz_snapshots(edges, 5000, seed=41)
+        metrics = list(edges)
+        batched = analyze_root_cause_matrix(to_matrix(snapshots, metrics), metrics)
+        for snapshot, result in zip(snapshots, batched):
+            expected = list(legacy_analyze_root_cause(snapshot).items())
+            assert list(analyze_root_cause(snapshot).items()) == expected, snapshot
+            assert list(result.items()) == expected, snapshot
+    finally:
+        probabilistic_analyzer.root_cause_cache.clear()
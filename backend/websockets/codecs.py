@@ -0,0 +1,64 @@
+"""
+WebSocket Codecs
+Frame encodings negotiated per connection (JSON text or compact binary)
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Union
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is listed in requirements.txt
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+Frame = Union[str, bytes]
+
+class Codec:
+    """A named message encoding; binary codecs are sent as binary WebSocket frames"""
+    def __init__(self, name: str, encode: Callable[[Dict[str, Any]], Frame], binary: bool):
+        self.name = name
+        self.encode = encode
+        self.binary = binary
+
+JSON_CODEC = "json"
+MSGPACK_CODEC = "msgpack"
+CBOR_CODEC = "cbor"
+
+# Registry of codecs whose libraries are importable
+CODECS: Dict[str, Codec] = {JSON_CODEC: Codec(JSON_CODEC, json.dumps, binary=False)}
+if msgpack is not None:
+    CODECS[MSGPACK_CODEC] = Codec(MSGPACK_CODEC, lambda message: msgpack.packb(message, use_bin_type=True), binary=True)
+if cbor2 is not None:
+    CODECS[CBOR_CODEC] = Codec(CBOR_CODEC, cbor2.dumps, binary=True)
+
+def get_codec(name: str) -> Codec:
+    """
+    Look up a codec by name
+
+    Args:
+        name: Codec name (json, msgpack or cbor)
+
+    Returns:
+        The codec
+
+    Raises:
+        ValueError: If the codec is unknown or its library is not installed
+    """
+    codec = CODECS.get((name or JSON_CODEC).lower())
+    if codec is None:
+        raise ValueError(f"Unsupported codec: {name}. Available codecs: {', '.join(available_codecs())}")
+    return codec
+
+def available_codecs() -> List[str]:
+    """
+    Get the names of the codecs available in this deployment
+
+    Returns:
+        List of codec names
+    """
+    return list(CODECS.keys())
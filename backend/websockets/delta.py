@@ -0,0 +1,137 @@
+"""
+Delta Encoder
+Keyframe + delta encoding for periodic WebSocket streams
+"""
+
+from typing import Any, Dict, List, Optional
+
+# Message types emitted by the delta stream
+KEYFRAME_MESSAGE_TYPE = "superposition_keyframe"
+DELTA_MESSAGE_TYPE = "superposition_delta"
+
+def flatten(message: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Flatten nested dictionaries into dotted paths (lists are kept as values)
+
+    Args:
+        message: The message to flatten
+        prefix: Path prefix for nested keys
+
+    Returns:
+        Dictionary of dotted paths to leaf values
+    """
+    flat = {}
+    for key, value in message.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(flatten(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+def unflatten(flat: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuild a nested message from dotted paths
+
+    Args:
+        flat: Dictionary of dotted paths to leaf values
+
+    Returns:
+        The nested message
+    """
+    message: Dict[str, Any] = {}
+    for path, value in flat.items():
+        node = message
+        *parents, leaf = path.split(".")
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = value
+    return message
+
+class DeltaEncoder:
+    """
+    Encodes successive snapshots of a stream as a keyframe followed by deltas
+
+    The encoder keeps the state delta clients are known to hold, so float
+    changes below epsilon are withheld without drifting: the reference only
+    moves when a change is actually sent. Every message carries a sequence
+    number; deltas name the sequence they apply on top of (base_seq) so
+    clients can detect gaps and ask for a resync. Clients apply a delta by
+    deleting the dotted "unset" paths first and then deep-merging "set".
+    """
+
+    def __init__(self, epsilon: float = 0.01, keyframe_interval: int = 12):
+        """
+        Initialize the encoder
+
+        Args:
+            epsilon: Minimum absolute change for a float field to be sent
+            keyframe_interval: Send a full keyframe every N messages (0 = only the first
+                keyframe and after a reset; clients resync on demand)
+
+        Raises:
+            ValueError: If keyframe_interval is negative
+        """
+        if keyframe_interval < 0:
+            raise ValueError(f"keyframe_interval must be >= 0, got {keyframe_interval}")
+        self.epsilon = epsilon
+        self.keyframe_interval = keyframe_interval
+        self.seq = 0
+        self._reference: Optional[Dict[str, Any]] = None
+
+    def reset(self) -> None:
+        """Drop the reference state so the next message is a keyframe"""
+        self._reference = None
+
+    def _changed(self, old: Any, new: Any) -> bool:
+        """Whether a field changed enough to be sent"""
+        if isinstance(old, float) and isinstance(new, float):
+            return abs(new - old) > self.epsilon
+        return old != new
+
+    def encode(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encode the next snapshot of the stream
+
+        Args:
+            message: The full message
+
+        Returns:
+            A keyframe or delta message
+        """
+        self.seq += 1
+        flat = flatten(message)
+
+        periodic = self.keyframe_interval and self.seq % self.keyframe_interval == 0
+        if self._reference is None or periodic:
+            self._reference = flat
+            return {"type": KEYFRAME_MESSAGE_TYPE, "seq": self.seq, "data": message}
+
+        changes = {
+            path: value for path, value in flat.items()
+            if path not in self._reference or self._changed(self._reference[path], value)
+        }
+        removed: List[str] = [path for path in self._reference if path not in flat]
+
+        self._reference.update(changes)
+        for path in removed:
+            del self._reference[path]
+
+        return {
+            "type": DELTA_MESSAGE_TYPE,
+            "seq": self.seq,
+            "base_seq": self.seq - 1,
+            "set": unflatten(changes),
+            "unset": removed
+        }
+
+    def keyframe(self) -> Optional[Dict[str, Any]]:
+        """
+        Build a keyframe of the state delta clients currently hold (for resync)
+
+        Returns:
+            Keyframe message, or None if nothing has been encoded yet
+        """
+        if self._reference is None:
+            return None
+        return {"type": KEYFRAME_MESSAGE_TYPE, "seq": self.seq, "data": unflatten(self._reference)}
@@ -3,36 +3,187 @@ WebSocket Connection Manager
 Handles WebSocket connections for real-time communication
 """
 
-import json
+import asyncio
 import logging
-from typing import List, Dict, Any
+import os
+from collections import deque
+from typing import List, Dict, Any, Optional, Deque, Iterable, Set, Tuple
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 
+from websockets.codecs import Codec, Frame, JSON_CODEC, get_codec
+from websockets.delta import DeltaEncoder
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Overflow policies for per-client outbound queues
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE, OVERFLOW_DISCONNECT)
+
+# Periodic stream message types where only the latest pending frame matters; frames are
+# coalesced per (stream topic, message type), so replies and one-off broadcasts that
+# share a type (e.g. system_status) are never replaced
+COALESCE_MESSAGE_TYPES = {"system_status", "superposition_anomaly"}
+
+CoalesceKey = Tuple[str, str]
+
+# Subscription topics; clients that never subscribe receive every topic
+TOPIC_ALL = "all"
+TOPIC_SYSTEM_STATUS = "system_status"
+TOPIC_AGENT_UPDATE = "agent_update"
+TOPIC_TASK_UPDATE = "task_update"
+TOPIC_SUPERPOSITION = "superposition"
+TOPIC_FLEET = "fleet"
+TOPICS = {TOPIC_ALL, TOPIC_SYSTEM_STATUS, TOPIC_AGENT_UPDATE, TOPIC_TASK_UPDATE, TOPIC_SUPERPOSITION, TOPIC_FLEET}
+
+class OutboundQueue:
+    """
+    Bounded queue of encoded frames waiting to be written to one client
+    """
+    
+    def __init__(self, maxsize: int = 100, policy: str = OVERFLOW_COALESCE):
+        """
+        Initialize the outbound queue
+        
+        Args:
+            maxsize: Maximum number of pending frames
+            policy: Overflow policy (drop_oldest, coalesce or disconnect)
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self._entries: Deque[List[Any]] = deque()
+        self._pending_by_key: Dict[CoalesceKey, List[Any]] = {}
+        self._not_empty = asyncio.Event()
+    
+    @property
+    def depth(self) -> int:
+        """Number of frames waiting to be sent"""
+        return len(self._entries)
+    
+    def put(self, frame: Frame, coalesce_key: Optional[CoalesceKey] = None) -> bool:
+        """
+        Enqueue a frame, applying the overflow policy
+        
+        Args:
+            frame: The encoded message
+            coalesce_key: (stream topic, message type) of a periodic stream frame, which
+                replaces a pending frame with the same key; None never coalesces
+            
+        Returns:
+            False if the queue is full under the disconnect policy, otherwise True
+        """
+        coalesce = self.policy == OVERFLOW_COALESCE and coalesce_key is not None
+        
+        # Replace a pending frame of the same stream and type in place (keeps its position)
+        if coalesce and coalesce_key in self._pending_by_key:
+            self._pending_by_key[coalesce_key][1] = frame
+            self.coalesced += 1
+            return True
+        
+        if len(self._entries) >= self.maxsize:
+            if self.policy == OVERFLOW_DISCONNECT:
+                return False
+            oldest = self._entries.popleft()
+            if self._pending_by_key.get(oldest[0]) is oldest:
+                del self._pending_by_key[oldest[0]]
+            self.dropped += 1
+        
+        entry = [coalesce_key, frame]
+        self._entries.append(entry)
+        if coalesce:
+            self._pending_by_key[coalesce_key] = entry
+        self._not_empty.set()
+        return True
+    
+    async def get(self) -> Frame:
+        """
+        Wait for and remove the next frame
+        
+        Returns:
+            The encoded message
+        """
+        while not self._entries:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        
+        entry = self._entries.popleft()
+        if self._pending_by_key.get(entry[0]) is entry:
+            del self._pending_by_key[entry[0]]
+        return entry[1]
+
+class ClientConnection:
+    """A connected client with its outbound queue, writer task, codec and topic subscriptions"""
+    def __init__(self, websocket: WebSocket, metadata: Dict[str, Any], queue: OutboundQueue, codec: Codec):
+        self.websocket = websocket
+        self.metadata = metadata
+        self.connection_id: int = metadata["connection_id"]
+        self.queue = queue
+        self.codec = codec
+        self.sent = 0
+        self.writer_task: Optional[asyncio.Task] = None
+        self.topics: Set[str] = {TOPIC_ALL}
+        self.explicit_subscription = False
+        self.delta_stream = False
+
 class ConnectionManager:
     """
     Manages WebSocket connections for real-time communication
+    
+    Every connection owns a bounded outbound queue drained by its own writer
+    task, so a slow client only ever delays itself. Connections are indexed
+    by connection id and by subscribed topic, so registration, removal and
+    topic fan-out never scan the full connection list.
     """
     
-    def __init__(self):
-        """Initialize the connection manager"""
-        self.active_connections: List[WebSocket] = []
-        self.connection_metadata: Dict[WebSocket, Dict[str, Any]] = {}
+    def __init__(self, max_concurrent_sends: int = 64, send_timeout: float = 2.0,
+                 queue_size: int = 100, overflow_policy: str = OVERFLOW_COALESCE,
+                 delta_encoder: Optional[DeltaEncoder] = None):
+        """
+        Initialize the connection manager
+        
+        Args:
+            max_concurrent_sends: Maximum number of sends in flight across all writers
+            send_timeout: Seconds a single send may take before the client is evicted
+            queue_size: Maximum number of pending frames per connection
+            overflow_policy: Default overflow policy for connection queues
+            delta_encoder: Encoder for clients that opt into the delta stream
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.connections: Dict[int, ClientConnection] = {}
+        self.topic_subscribers: Dict[str, Set[int]] = {topic: set() for topic in TOPICS}
+        self.max_concurrent_sends = max_concurrent_sends
+        self.send_timeout = send_timeout
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.delta_encoder = delta_encoder or DeltaEncoder()
+        self._send_semaphore = asyncio.Semaphore(max_concurrent_sends)
+        self._close_tasks: Set[asyncio.Task] = set()
     
-    async def connect(self, websocket: WebSocket, client_info: Dict[str, Any] = None) -> None:
+    async def connect(self, websocket: WebSocket, client_info: Dict[str, Any] = None,
+                      overflow_policy: Optional[str] = None, codec: str = JSON_CODEC) -> None:
         """
         Accept a new WebSocket connection
         
         Args:
             websocket: The WebSocket connection
             client_info: Optional client information
+            overflow_policy: Optional overflow policy overriding the manager default
+            codec: Frame encoding for this connection (json, msgpack or cbor)
+            
+        Raises:
+            ValueError: If the codec is not available (raised before accepting)
         """
+        frame_codec = get_codec(codec)
         await websocket.accept()
-        self.active_connections.append(websocket)
         
         # Store client metadata
         metadata = {
@@ -40,9 +191,16 @@ class ConnectionManager:
             "client_info": client_info or {},
             "connection_id": id(websocket)
         }
-        self.connection_metadata[websocket] = metadata
         
-        logger.info(f"New WebSocket connection established. Total connections: {len(self.active_connections)}")
+        # Register and start the writer draining this connection's outbound queue
+        client = ClientConnection(
+            websocket, metadata, OutboundQueue(self.queue_size, overflow_policy or self.overflow_policy), frame_codec
+        )
+        self.connections[client.connection_id] = client
+        self.topic_subscribers[TOPIC_ALL].add(client.connection_id)
+        client.writer_task = asyncio.create_task(self._writer(client))
+        
+        logger.info(f"New WebSocket connection established. Total connections: {len(self.connections)}")
         
         # Send welcome message
         await self.send_personal_message({
@@ -59,12 +217,185 @@ class ConnectionManager:
         Args:
             websocket: The WebSocket connection to remove
         """
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        client = self.connections.pop(id(websocket), None)
+        if not client:
+            return
+        
+        for topic in client.topics:
+            self.topic_subscribers[topic].discard(client.connection_id)
+        
+        if client.writer_task and client.writer_task is not asyncio.current_task():
+            client.writer_task.cancel()
+        
+        logger.info(f"WebSocket connection {client.connection_id} disconnected. Total connections: {len(self.connections)}")
+    
+    def subscribe(self, websocket: WebSocket, topics: Iterable[str]) -> Set[str]:
+        """
+        Subscribe a connection to one or more topics
+        
+        The first explicit subscription replaces the implicit "all" topic, so
+        the client only receives what it asked for from then on.
+        
+        Args:
+            websocket: The WebSocket connection
+            topics: Topic names to subscribe to
+            
+        Returns:
+            The connection's subscribed topics
+        """
+        client = self.connections.get(id(websocket))
+        if not client:
+            return set()
+        
+        topics = set(topics)
+        unknown = topics - TOPICS
+        if unknown:
+            raise ValueError(f"Unknown subscription topic(s): {', '.join(sorted(unknown))}")
+        
+        if not client.explicit_subscription:
+            client.explicit_subscription = True
+            client.topics.discard(TOPIC_ALL)
+            self.topic_subscribers[TOPIC_ALL].discard(client.connection_id)
+        
+        for topic in topics:
+            client.topics.add(topic)
+            self.topic_subscribers[topic].add(client.connection_id)
+        return set(client.topics)
+    
+    def unsubscribe(self, websocket: WebSocket, topics: Iterable[str]) -> Set[str]:
+        """
+        Unsubscribe a connection from one or more topics
+        
+        Args:
+            websocket: The WebSocket connection
+            topics: Topic names to unsubscribe from
+            
+        Returns:
+            The connection's remaining subscribed topics
+        """
+        client = self.connections.get(id(websocket))
+        if not client:
+            return set()
+        
+        client.explicit_subscription = True
+        for topic in topics:
+            client.topics.discard(topic)
+            if topic in self.topic_subscribers:
+                self.topic_subscribers[topic].discard(client.connection_id)
+        return set(client.topics)
+    
+    def set_codec(self, websocket: WebSocket, codec: str) -> str:
+        """
+        Switch the frame encoding of a connection
+        
+        Frames already queued keep their previous encoding.
+        
+        Args:
+            websocket: The WebSocket connection
+            codec: Codec name (json, msgpack or cbor)
+            
+        Returns:
+            The codec name now in use
             
-        if websocket in self.connection_metadata:
-            metadata = self.connection_metadata.pop(websocket)
-            logger.info(f"WebSocket connection {metadata['connection_id']} disconnected. Total connections: {len(self.active_connections)}")
+        Raises:
+            ValueError: If the codec is not available
+        """
+        frame_codec = get_codec(codec)
+        client = self.connections.get(id(websocket))
+        if client:
+            client.codec = frame_codec
+        return frame_codec.name
+    
+    async def set_delta_stream(self, websocket: WebSocket, enabled: bool) -> None:
+        """
+        Opt a connection in or out of the delta-encoded stream
+        
+        Clients opting in receive the current keyframe straight away (if the
+        stream has started) and deltas from then on.
+        
+        Args:
+            websocket: The WebSocket connection
+            enabled: Whether to receive keyframes and deltas instead of full messages
+        """
+        client = self.connections.get(id(websocket))
+        if not client or client.delta_stream == enabled:
+            return
+        
+        client.delta_stream = enabled
+        if enabled:
+            await self.send_keyframe(websocket)
+    
+    async def send_keyframe(self, websocket: WebSocket) -> None:
+        """
+        Send the current delta stream keyframe to one connection (used for resync)
+        
+        Args:
+            websocket: The WebSocket connection
+        """
+        keyframe = self.delta_encoder.keyframe()
+        if keyframe is not None:
+            await self.send_personal_message(keyframe, websocket)
+    
+    def _evict(self, websocket: WebSocket, reason: str) -> None:
+        """
+        Disconnect a lagging or failed client and close its socket
+        
+        Args:
+            websocket: The WebSocket connection to evict
+            reason: Reason logged and sent with the close frame
+        """
+        logger.warning(f"Evicting connection {id(websocket)}: {reason}")
+        self.disconnect(websocket)
+        # Keep a reference until the close completes so the task is not garbage collected
+        close_task = asyncio.create_task(self._close(websocket, reason))
+        self._close_tasks.add(close_task)
+        close_task.add_done_callback(self._close_tasks.discard)
+    
+    async def _close(self, websocket: WebSocket, reason: str) -> None:
+        """Close a WebSocket, ignoring errors from already-closed sockets"""
+        try:
+            await websocket.close(code=1013, reason=reason)
+        except Exception:
+            pass
+    
+    async def _writer(self, client: ClientConnection) -> None:
+        """
+        Drain a connection's outbound queue, one send at a time
+        
+        Args:
+            client: The connection to write to
+        """
+        # Checked each iteration: wait_for can swallow a cancellation that
+        # arrives as a send completes, so cancel() alone is not enough
+        while self.connections.get(client.connection_id) is client:
+            frame = await client.queue.get()
+            async with self._send_semaphore:
+                try:
+                    if isinstance(frame, bytes):
+                        send = client.websocket.send_bytes(frame)
+                    else:
+                        send = client.websocket.send_text(frame)
+                    await asyncio.wait_for(send, timeout=self.send_timeout)
+                    client.sent += 1
+                except asyncio.TimeoutError:
+                    self._evict(client.websocket, f"send exceeded {self.send_timeout}s")
+                    return
+                except Exception as e:
+                    logger.error(f"Error sending to connection: {e}")
+                    self.disconnect(client.websocket)
+                    return
+    
+    def _enqueue(self, client: ClientConnection, frame: Frame, coalesce_key: Optional[CoalesceKey] = None) -> None:
+        """
+        Queue a frame for a connection, evicting it on overflow under the disconnect policy
+        
+        Args:
+            client: The target connection
+            frame: The encoded message
+            coalesce_key: (stream topic, message type) for periodic stream frames, else None
+        """
+        if not client.queue.put(frame, coalesce_key):
+            self._evict(client.websocket, "outbound queue overflow")
     
     async def send_personal_message(self, message: Dict[str, Any], websocket: WebSocket) -> None:
         """
@@ -74,43 +405,107 @@ class ConnectionManager:
             message: The message to send
             websocket: The target WebSocket connection
         """
+        client = self.connections.get(id(websocket))
+        if not client:
+            logger.warning("Attempted to send a personal message to an unknown connection")
+            return
+        
         try:
-            await websocket.send_text(json.dumps(message))
+            self._enqueue(client, client.codec.encode(message))
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
             self.disconnect(websocket)
     
-    async def broadcast(self, message: Dict[str, Any], exclude: WebSocket = None) -> None:
+    def _recipients(self, topic: Optional[str]) -> Iterable[ClientConnection]:
+        """
+        Resolve the connections that should receive a message on a topic
+        
+        Args:
+            topic: The message topic, or None for every connection
+            
+        Returns:
+            The recipient connections
+        """
+        if topic is None:
+            return list(self.connections.values())
+        
+        connection_ids = self.topic_subscribers.get(topic, set()) | self.topic_subscribers[TOPIC_ALL]
+        return [self.connections[connection_id] for connection_id in connection_ids]
+    
+    def _fan_out(self, clients: Iterable[ClientConnection], message: Dict[str, Any],
+                 exclude: WebSocket = None, stream: Optional[str] = None) -> None:
         """
-        Broadcast a message to all active connections
+        Queue a message on each client, encoding it once per distinct codec
+        
+        Args:
+            clients: The recipient connections
+            message: The message to send
+            exclude: Optional WebSocket connection to skip
+            stream: Topic of the periodic stream the message belongs to (enables coalescing)
+        """
+        message_type = message.get("type", "unknown")
+        coalesce_key = (stream, message_type) if stream and message_type in COALESCE_MESSAGE_TYPES else None
+        frames: Dict[str, Frame] = {}
+        
+        for client in clients:
+            if client.websocket == exclude:
+                continue
+            frame = frames.get(client.codec.name)
+            if frame is None:
+                frame = frames[client.codec.name] = client.codec.encode(message)
+            self._enqueue(client, frame, coalesce_key)
+    
+    async def broadcast(self, message: Dict[str, Any], exclude: WebSocket = None,
+                        topic: Optional[str] = None) -> None:
+        """
+        Broadcast a message to all active connections, or to a topic's subscribers
+        
+        The message is serialized once per codec in use and the shared frames
+        are queued on every recipient; the per-connection writers send them
+        concurrently, bounded by max_concurrent_sends.
         
         Args:
             message: The message to broadcast
             exclude: Optional WebSocket connection to exclude from broadcast
+            topic: Optional topic; only its subscribers (and "all" subscribers) receive the message
         """
-        if not self.active_connections:
-            logger.warning("No active connections to broadcast to")
+        recipients = self._recipients(topic)
+        if not recipients:
+            logger.debug(f"No subscribers to broadcast to (topic: {topic or TOPIC_ALL})")
             return
         
         # Add timestamp if not present
         if "timestamp" not in message:
             message["timestamp"] = datetime.now().isoformat()
         
-        disconnected_connections = []
+        self._fan_out(recipients, message, exclude)
+    
+    async def broadcast_stream(self, message: Dict[str, Any], topic: str = TOPIC_SUPERPOSITION) -> None:
+        """
+        Broadcast a periodic stream message, delta-encoding it for opted-in clients
         
-        for connection in self.active_connections:
-            if connection == exclude:
-                continue
-                
-            try:
-                await connection.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error broadcasting to connection: {e}")
-                disconnected_connections.append(connection)
+        Full-message and delta clients each get one shared frame per codec,
+        so serialization cost does not grow with audience size.
+        
+        Args:
+            message: The full stream message
+            topic: The stream topic
+        """
+        recipients = self._recipients(topic)
+        full_clients = [client for client in recipients if not client.delta_stream]
+        delta_clients = [client for client in recipients if client.delta_stream]
+        
+        if "timestamp" not in message:
+            message["timestamp"] = datetime.now().isoformat()
         
-        # Clean up disconnected connections
-        for connection in disconnected_connections:
-            self.disconnect(connection)
+        if full_clients:
+            self._fan_out(full_clients, message, stream=topic)
+        
+        if delta_clients:
+            self._fan_out(delta_clients, self.delta_encoder.encode(message))
+        else:
+            # Nobody holds the reference state; start the next delta client on a keyframe
+            self.delta_encoder.reset()
     
     async def broadcast_system_status(self, status: str, details: Dict[str, Any] = None) -> None:
         """
@@ -127,7 +522,7 @@ class ConnectionManager:
             "timestamp": datetime.now().isoformat()
         }
         
-        await self.broadcast(message)
+        await self.broadcast(message, topic=TOPIC_SYSTEM_STATUS)
         logger.info(f"System status broadcasted: {status}")
     
     async def broadcast_agent_update(self, agent_id: str, agent_data: Dict[str, Any]) -> None:
@@ -145,7 +540,7 @@ class ConnectionManager:
             "timestamp": datetime.now().isoformat()
         }
         
-        await self.broadcast(message)
+        await self.broadcast(message, topic=TOPIC_AGENT_UPDATE)
         logger.info(f"Agent update broadcasted for agent: {agent_id}")
     
     async def broadcast_task_update(self, task_id: str, task_data: Dict[str, Any]) -> None:
@@ -163,7 +558,7 @@ class ConnectionManager:
             "timestamp": datetime.now().isoformat()
         }
         
-        await self.broadcast(message)
+        await self.broadcast(message, topic=TOPIC_TASK_UPDATE)
         logger.info(f"Task update broadcasted for task: {task_id}")
     
     def get_connection_count(self) -> int:
@@ -173,7 +568,19 @@ class ConnectionManager:
         Returns:
             Number of active WebSocket connections
         """
-        return len(self.active_connections)
+        return len(self.connections)
+    
+    def get_subscriber_count(self, topic: str) -> int:
+        """
+        Get the number of connections receiving a topic
+        
+        Args:
+            topic: The topic
+            
+        Returns:
+            Number of connections subscribed to the topic (directly or through "all")
+        """
+        return len(self._recipients(topic))
     
     def get_connection_info(self) -> List[Dict[str, Any]]:
         """
@@ -184,12 +591,29 @@ class ConnectionManager:
         """
         return [
             {
-                "connection_id": metadata["connection_id"],
-                "connected_at": metadata["connected_at"],
-                "client_info": metadata["client_info"]
+                "connection_id": client.metadata["connection_id"],
+                "connected_at": client.metadata["connected_at"],
+                "client_info": client.metadata["client_info"],
+                "topics": sorted(client.topics),
+                "delta_stream": client.delta_stream,
+                "codec": client.codec.name,
+                "overflow_policy": client.queue.policy,
+                "queue_depth": client.queue.depth,
+                "sent_messages": client.sent,
+                "dropped_messages": client.queue.dropped,
+                "coalesced_messages": client.queue.coalesced
             }
-            for metadata in self.connection_metadata.values()
+            for client in self.connections.values()
         ]
 
 # Global connection manager instance
-connection_manager = ConnectionManager()
+connection_manager = ConnectionManager(
+    max_concurrent_sends=int(os.getenv("WS_MAX_CONCURRENT_SENDS", "64")),
+    send_timeout=float(os.getenv("WS_SEND_TIMEOUT", "2.0")),
+    queue_size=int(os.getenv("WS_QUEUE_SIZE", "100")),
+    overflow_policy=os.getenv("WS_OVERFLOW_POLICY", OVERFLOW_COALESCE),
+    delta_encoder=DeltaEncoder(
+        epsilon=float(os.getenv("WS_DELTA_EPSILON", "0.01")),
+        keyframe_interval=int(os.getenv("WS_DELTA_KEYFRAME_INTERVAL", "12"))
+    )
+)
@@ -0,0 +1,71 @@
+"""
+Broadcast Scheduler
+Single app-lifetime loop that runs a periodic tick and keeps its latest result
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class BroadcastScheduler:
+    """
+    Runs one periodic tick for the whole application.
+
+    The application lifespan starts and stops it; while running it ticks
+    once per interval whether or not any client is connected. Connections
+    never spawn their own loops: the tick decides whom to broadcast to, and
+    clients that connect in between read `latest`.
+    """
+
+    def __init__(self, tick: Callable[[], Awaitable[Any]], interval: float = 5.0):
+        """
+        Initialize the scheduler
+
+        Args:
+            tick: Coroutine function run once per interval; its return value is kept as the latest result
+            interval: Seconds between ticks
+        """
+        self.tick = tick
+        self.interval = interval
+        self.latest: Any = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the scheduler loop is running"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the scheduler loop (called from the application lifespan)"""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Broadcast scheduler started (interval: {self.interval}s)")
+
+    async def stop(self) -> None:
+        """Stop the scheduler loop and wait for it to exit"""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Broadcast scheduler stopped")
+
+    async def _run(self) -> None:
+        """Scheduler loop: tick immediately on start, then once per interval"""
+        while True:
+            try:
+                self.latest = await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in broadcast scheduler tick: {e}")
+                await asyncio.sleep(1)  # Wait before retrying
+                continue
+
+            await asyncio.sleep(self.interval)